@@ -0,0 +1,35 @@
+"""File unique id.
+
+Revision ID: 5c2e9a71d4b0
+Revises: 0381723fc3bb
+Create Date: 2026-10-19 12:10:43.518204
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e9a71d4b0'
+down_revision: Union[str, None] = '0381723fc3bb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    file_unique_id cannot be derived from tg_id in SQL, so existing rows stay NULL here
+    and are backfilled through getFile by app.helpers.backfill_file_unique_ids on startup.
+    """
+    op.add_column('files', sa.Column('file_unique_id', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_files_file_unique_id'), 'files', ['file_unique_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_files_file_unique_id'), table_name='files')
+    op.drop_column('files', 'file_unique_id')
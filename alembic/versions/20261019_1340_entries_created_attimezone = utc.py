@@ -0,0 +1,32 @@
+"""Entries created_at.
+
+Revision ID: 9b41f07e3a6d
+Revises: 5c2e9a71d4b0
+Create Date: 2026-10-19 13:40:12.904617
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b41f07e3a6d'
+down_revision: Union[str, None] = '5c2e9a71d4b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('files', 'constant_messages', 'temporary_messages'):
+        op.add_column(table, sa.Column('created_at', sa.DateTime(timezone=True),
+                                       server_default=sa.text('now()'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('temporary_messages', 'constant_messages', 'files'):
+        op.drop_column(table, 'created_at')
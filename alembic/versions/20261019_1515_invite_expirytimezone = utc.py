@@ -0,0 +1,41 @@
+"""Invite expiry.
+
+Revision ID: e3f8c62a1d57
+Revises: 9b41f07e3a6d
+Create Date: 2026-10-19 15:15:37.220184
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f8c62a1d57'
+down_revision: Union[str, None] = '9b41f07e3a6d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('admin_invites', 'code', type_=sa.String(length=32), existing_nullable=False)
+    op.add_column('admin_invites', sa.Column('created_at', sa.DateTime(timezone=True),
+                                             server_default=sa.text('now()'), nullable=False))
+    op.add_column('admin_invites', sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE admin_invites SET expires_at = now() + interval '7 days'")
+    op.alter_column('admin_invites', 'expires_at', nullable=False)
+    op.drop_index('unq_active_invite_code', table_name='admin_invites', postgresql_where=False)
+    op.create_index('ix_admin_invites_active', 'admin_invites', ['code', 'expires_at'], unique=False,
+                    postgresql_where=sa.text('NOT was_used'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_admin_invites_active', table_name='admin_invites', postgresql_where=sa.text('NOT was_used'))
+    op.create_index('unq_active_invite_code', 'admin_invites', ['code'], unique=True, postgresql_where=False)
+    op.drop_column('admin_invites', 'expires_at')
+    op.drop_column('admin_invites', 'created_at')
+    op.alter_column('admin_invites', 'code', type_=sa.String(length=16), existing_nullable=False)
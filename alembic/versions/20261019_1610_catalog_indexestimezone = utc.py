@@ -0,0 +1,32 @@
+"""Catalog indexes.
+
+Revision ID: 4c7a2e91b0f3
+Revises: e3f8c62a1d57
+Create Date: 2026-10-19 16:10:04.518362
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c7a2e91b0f3'
+down_revision: Union[str, None] = 'e3f8c62a1d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_files_catalog', 'files', ['category', 'status', 'id'], unique=False)
+    op.create_index('ix_temporary_messages_catalog', 'temporary_messages', ['category', 'status', 'id'], unique=False)
+    op.create_index('ix_constant_messages_catalog', 'constant_messages', ['category', 'status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_constant_messages_catalog', table_name='constant_messages')
+    op.drop_index('ix_temporary_messages_catalog', table_name='temporary_messages')
+    op.drop_index('ix_files_catalog', table_name='files')
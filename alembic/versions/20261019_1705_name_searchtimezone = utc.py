@@ -0,0 +1,38 @@
+"""Name search.
+
+Revision ID: b85d3f16c2e4
+Revises: 4c7a2e91b0f3
+Create Date: 2026-10-19 17:05:41.903215
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b85d3f16c2e4'
+down_revision: Union[str, None] = '4c7a2e91b0f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('files', 'constant_messages', 'temporary_messages')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table in TABLES:
+        op.create_index(f'ix_{table}_name_trgm', table, ['name'], unique=False, postgresql_using='gin',
+                        postgresql_ops={'name': 'gin_trgm_ops'})
+        op.create_index(f'ix_{table}_name_tsv', table, [sa.text("to_tsvector('simple', name)")], unique=False,
+                        postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.drop_index(f'ix_{table}_name_tsv', table_name=table, postgresql_using='gin')
+        op.drop_index(f'ix_{table}_name_trgm', table_name=table, postgresql_using='gin')
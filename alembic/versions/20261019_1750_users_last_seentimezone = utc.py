@@ -0,0 +1,29 @@
+"""Users last seen.
+
+Revision ID: 7e2b90d4a5c1
+Revises: b85d3f16c2e4
+Create Date: 2026-10-19 17:50:12.684027
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2b90d4a5c1'
+down_revision: Union[str, None] = 'b85d3f16c2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'last_seen_at')
@@ -0,0 +1,38 @@
+"""Category subscriptions.
+
+Revision ID: 9d41f6b3c8e2
+Revises: 7e2b90d4a5c1
+Create Date: 2026-10-19 18:35:41.209516
+
+"""
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d41f6b3c8e2'
+down_revision: Union[str, None] = '7e2b90d4a5c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'category_subscriptions',
+        sa.Column('category', sa.String(length=40), nullable=False),
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('category', 'user_id'),
+    )
+    op.create_index(op.f('ix_category_subscriptions_user_id'), 'category_subscriptions', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_category_subscriptions_user_id'), table_name='category_subscriptions')
+    op.drop_table('category_subscriptions')
@@ -0,0 +1,107 @@
+import hashlib
+import math
+import time
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Optional
+
+import app.constants as cnst
+
+
+_SECONDS_PER_DAY = 86400
+
+
+class HyperLogLog:
+    """HyperLogLog sketch estimating number of distinct user ids in fixed memory."""
+
+    __slots__ = ('precision', 'registers')
+
+    def __init__(self, precision: int = cnst.HLL_PRECISION) -> None:
+        """Create empty sketch with 2**precision registers."""
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: int) -> None:
+        """Add value to the sketch."""
+        digest = hashlib.blake2b(value.to_bytes(8, 'big', signed=True), digest_size=8).digest()
+        hashed = int.from_bytes(digest, 'big')
+        width = 64 - self.precision
+        rank = width - (hashed & ((1 << width) - 1)).bit_length() + 1
+        index = hashed >> width
+        self.registers[index] = max(self.registers[index], rank)
+
+    def count(self) -> int:
+        """Return estimated number of distinct values."""
+        return self._estimate(self.registers)
+
+    @classmethod
+    def union_count(cls, sketches: Iterable['HyperLogLog']) -> int:
+        """Return estimated number of distinct values added to any of the sketches."""
+        union = bytearray(1 << cnst.HLL_PRECISION)
+        for sketch in sketches:
+            union = bytearray(map(max, union, sketch.registers))
+        return cls._estimate(union)
+
+    @staticmethod
+    def _estimate(registers: bytearray) -> int:
+        size = len(registers)
+        estimate = 0.7213 / (1 + 1.079 / size) * size * size / sum(2.0 ** -register for register in registers)
+        if estimate <= 2.5 * size and (zeros := registers.count(0)):
+            estimate = size * math.log(size / zeros)
+        return round(estimate)
+
+
+class ActivityTracker:
+    """Collect last seen times in memory for batched writes and count active users with daily sketches."""
+
+    _instance: Optional['ActivityTracker'] = None
+
+    def __init__(self) -> None:
+        """Tracker initialization."""
+        self._pending: dict[int, float] = {}
+        # sketches are not persisted, after a restart MAU reads low until a full window is collected again
+        self._days: dict[int, HyperLogLog] = {}
+
+    @classmethod
+    def get(cls) -> 'ActivityTracker':
+        """Get singleton tracker instance."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def seen(self, user_id: int) -> None:
+        """Record activity of user, users seen earlier the same day since the last flush are not hashed again."""
+        now = time.time()
+        day = int(now // _SECONDS_PER_DAY)
+        previous = self._pending.get(user_id)
+        self._pending[user_id] = now
+        if previous is not None and int(previous // _SECONDS_PER_DAY) == day:
+            return
+        sketch = self._days.get(day)
+        if sketch is None:
+            sketch = self._days[day] = HyperLogLog()
+            for old_day in [old_day for old_day in self._days if old_day <= day - cnst.ACTIVITY_MAU_DAYS]:
+                del self._days[old_day]
+        sketch.add(user_id)
+
+    def drain(self) -> list[tuple[int, datetime]]:
+        """Take last seen times collected since the previous drain."""
+        pending, self._pending = self._pending, {}
+        return [(user_id, datetime.fromtimestamp(seen_at, timezone.utc)) for user_id, seen_at in pending.items()]
+
+    def restore(self, seen: list[tuple[int, datetime]]) -> None:
+        """Put back times which failed to be written unless the user was seen again since."""
+        for user_id, seen_at in seen:
+            self._pending.setdefault(user_id, seen_at.timestamp())
+
+    def estimates(self) -> tuple[int, int]:
+        """Return estimated daily and monthly active users."""
+        today = int(time.time() // _SECONDS_PER_DAY)
+        sketch = self._days.get(today)
+        daily = sketch.count() if sketch else 0
+        monthly = HyperLogLog.union_count(sketch for day, sketch in self._days.items()
+                                          if day > today - cnst.ACTIVITY_MAU_DAYS)
+        return daily, monthly
+
+
+activity_tracker = ActivityTracker.get()
@@ -0,0 +1,114 @@
+import asyncio
+from bisect import bisect_left
+from typing import NamedTuple, Optional
+
+import app.const_texts as txts
+from app.callback_data import CallbackAction, to_base36
+from app.database.models.enums import UploadState
+from app.database.uow import UnitOfWork
+
+
+class CatalogEntry(NamedTuple):
+    """Uploaded catalog entry as shown in inline results."""
+
+    action: CallbackAction
+    entity_id: int
+    name: str
+    description: str
+    file_id: str | None = None
+    chat_id: int | None = None
+    message_id: int | None = None
+
+
+def deep_link_token(action: CallbackAction, entity_id: int) -> str:
+    """Return /start payload of an entry, payloads allow only letters, digits, '_' and '-'."""
+    return f'{action.value}_{to_base36(entity_id)}'
+
+
+class CatalogIndex:
+    """Word prefix and deep link token index of uploaded entries, rebuilt with one load after the catalog changes."""
+
+    _instance: Optional['CatalogIndex'] = None
+
+    def __init__(self) -> None:
+        """Index initialization, entries are loaded on first lookup."""
+        self._entries: list[CatalogEntry] = []
+        self._words: list[str] = []
+        self._positions: list[int] = []
+        self._by_token: dict[str, CatalogEntry] = {}
+        self._stale = True
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def get(cls) -> 'CatalogIndex':
+        """Get singleton index instance."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def invalidate(self) -> None:
+        """Mark index outdated, it is reloaded on the next lookup."""
+        self._stale = True
+
+    async def lookup(self, query: str) -> list[CatalogEntry]:
+        """Return entries having a name word starting with every query word, ordered by name."""
+        if self._stale:
+            await self._rebuild()
+        words = query.lower().split()
+        if not words:
+            return self._entries
+        matched: set[int] | None = None
+        for word in words:
+            found = set()
+            index = bisect_left(self._words, word)
+            while index < len(self._words) and self._words[index].startswith(word):
+                found.add(self._positions[index])
+                index += 1
+            matched = found if matched is None else matched & found
+            if not matched:
+                return []
+        return [self._entries[position] for position in sorted(matched or ())]
+
+    async def resolve(self, token: str) -> CatalogEntry | None:
+        """Return entry of a deep link token, None for unknown or removed entries."""
+        if self._stale:
+            await self._rebuild()
+        return self._by_token.get(token)
+
+    async def _rebuild(self) -> None:
+        async with self._lock:
+            if not self._stale:
+                return
+            self._stale = False
+            try:
+                entries = await self._load()
+            except Exception:
+                self._stale = True
+                raise
+            entries.sort(key=lambda entry: entry.name.lower())
+            words = sorted((word, position) for position, entry in enumerate(entries)
+                           for word in set(entry.name.lower().split()))
+            self._entries = entries
+            self._words = [word for word, _ in words]
+            self._positions = [position for _, position in words]
+            self._by_token = {deep_link_token(entry.action, entry.entity_id): entry for entry in entries}
+
+    @staticmethod
+    async def _load() -> list[CatalogEntry]:
+        filters: dict[str, int | str | None] = {'status': UploadState.UPLOADED}
+        async with UnitOfWork(auto_commit=False) as uow:
+            files = await uow.files.find(filters=filters)
+            const = await uow.const.find(filters=filters)
+            temp = await uow.temp.find(filters=filters)
+        entries = [
+            CatalogEntry(CallbackAction.FILE, file.id, file.name, file.category, file.tg_id)
+            for file in files if file.name and file.category != txts.FILE_BOT_PICS
+        ]
+        entries += [CatalogEntry(CallbackAction.CONST, mes.id, mes.name, mes.category,
+                                 chat_id=mes.chat_id, message_id=mes.message_id) for mes in const if mes.name]
+        entries += [CatalogEntry(CallbackAction.TEMP, mes.id, mes.name, f'{mes.category} {mes.date}',
+                                 chat_id=mes.chat_id, message_id=mes.message_id) for mes in temp if mes.name]
+        return entries
+
+
+catalog_index = CatalogIndex.get()
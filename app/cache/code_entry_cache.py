@@ -1,20 +1,18 @@
-from datetime import datetime, timedelta
 from typing import Optional
 
 import app.constants as cnst
-import pytz
-from cachetools import TTLCache
+from app.cache.rate_limiter import RateLimiter
 
 
 class CodeEntryCache:
-    """Tracks and manages code attempt limits with TTL caching."""
+    """Limit invite code attempts with a token bucket which refills completely within the block time."""
 
     _instance: Optional['CodeEntryCache'] = None
-    _attempts: TTLCache[int, tuple[int, datetime]]
 
     def __init__(self) -> None:
         """Cache initialization."""
-        self._attempts = TTLCache(maxsize=cnst.MAX_CACHE_SIZE, ttl=cnst.ATTEMPTS_TTL)
+        self._limiter = RateLimiter(rate=cnst.MAX_ATTEMPTS / cnst.BLOCK_TIME, capacity=cnst.MAX_ATTEMPTS,
+                                    maxsize=cnst.THROTTLE_CACHE_SIZE)
 
     @classmethod
     def get(cls) -> 'CodeEntryCache':
@@ -23,26 +21,24 @@ class CodeEntryCache:
             cls._instance = cls()
         return cls._instance
 
-    def record_attempt(self, user_id: int) -> tuple[int, datetime]:
-        """Record new attempt and return current attempt count."""
-        now = datetime.now(pytz.timezone('Europe/Moscow'))
-        current_attempts, last_attempt = self._attempts.get(user_id, (0, now))
+    def record_attempt(self, user_id: int) -> None:
+        """Spend one attempt of user."""
+        self._limiter.consume(user_id)
 
-        if now - last_attempt > timedelta(seconds=cnst.ATTEMPTS_RESET_TIME):
-            current_attempts = 0
+    def attempts_left(self, user_id: int) -> int:
+        """Return number of attempts user has left."""
+        return self._limiter.remaining(user_id)
 
-        current_attempts += 1
-        self._attempts[user_id] = (current_attempts, now)
-        return current_attempts, last_attempt
-
-    def get_attempts(self, user_id: int) -> tuple[int, datetime]:
-        """Get current attempt count and last attempt time."""
-        now = datetime.now(pytz.timezone('Europe/Moscow'))
-        return self._attempts.get(user_id, (0, now))
+    def is_blocked(self, user_id: int) -> bool:
+        """Check if user has no attempts left."""
+        return self.attempts_left(user_id) == 0
 
     def reset_attempts(self, user_id: int) -> None:
-        """Clear attempt counter for user."""
-        self._attempts.pop(user_id, None)
+        """Give user all attempts back."""
+        self._limiter.reset(user_id)
+
+    def __len__(self) -> int:
+        return len(self._limiter)
 
 
 code_entry_cache = CodeEntryCache.get()
@@ -0,0 +1,44 @@
+import secrets
+from typing import Optional
+
+import app.const_texts as txts
+from app.database.models.enums import UploadState
+from app.database.uow import UnitOfWork
+
+
+class GreetingPictures:
+    """File ids of uploaded greeting pictures, loaded once and dropped when pictures change."""
+
+    _instance: Optional['GreetingPictures'] = None
+
+    def __init__(self) -> None:
+        """Pool initialization, pictures are loaded on first use."""
+        self._file_ids: tuple[str, ...] | None = None
+        self._version = 0
+
+    @classmethod
+    def get(cls) -> 'GreetingPictures':
+        """Get singleton pool instance."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    async def choice(self) -> str | None:
+        """Return file id of a random greeting picture, None if there are no pictures."""
+        file_ids = self._file_ids
+        if file_ids is None:
+            version = self._version
+            async with UnitOfWork(auto_commit=False) as uow:
+                files = await uow.files.find(filters={'category': txts.FILE_BOT_PICS, 'status': UploadState.UPLOADED})
+            file_ids = tuple(file.tg_id for file in files if file.tg_id)
+            if version == self._version:
+                self._file_ids = file_ids
+        return secrets.choice(file_ids) if file_ids else None
+
+    def invalidate(self) -> None:
+        """Drop loaded pictures, a load which is still running is not kept either."""
+        self._file_ids = None
+        self._version += 1
+
+
+greeting_pictures = GreetingPictures.get()
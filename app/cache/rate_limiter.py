@@ -0,0 +1,52 @@
+import time
+from typing import Optional
+
+import app.constants as cnst
+from cachetools import TTLCache
+
+
+class RateLimiter:
+    """Per-user token bucket limiter on a monotonic clock."""
+
+    _instance: Optional['RateLimiter'] = None
+    _buckets: TTLCache[int, tuple[float, float]]
+
+    def __init__(self, rate: float = cnst.THROTTLE_RATE, capacity: int = cnst.THROTTLE_BURST,
+                 maxsize: int = cnst.THROTTLE_CACHE_SIZE) -> None:
+        """Limiter initialization, idle buckets expire once they would be full again."""
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets = TTLCache(maxsize=maxsize, ttl=capacity / rate, timer=time.monotonic)
+
+    @classmethod
+    def get(cls) -> 'RateLimiter':
+        """Get singleton limiter instance."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def consume(self, user_id: int) -> bool:
+        """Take one token from user bucket, return False if the bucket is empty."""
+        now = time.monotonic()
+        tokens = self._tokens(user_id, now)
+        allowed = tokens >= 1
+        self._buckets[user_id] = (tokens - 1 if allowed else tokens, now)
+        return allowed
+
+    def remaining(self, user_id: int) -> int:
+        """Return number of whole tokens left in user bucket without taking one."""
+        return int(self._tokens(user_id, time.monotonic()))
+
+    def reset(self, user_id: int) -> None:
+        """Refill user bucket."""
+        self._buckets.pop(user_id, None)
+
+    def _tokens(self, user_id: int, now: float) -> float:
+        tokens, updated_at = self._buckets.get(user_id, (self.capacity, now))
+        return min(self.capacity, tokens + (now - updated_at) * self.rate)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+rate_limiter = RateLimiter.get()
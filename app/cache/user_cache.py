@@ -25,6 +25,8 @@ class UserCache:
     def __init__(self) -> None:
         """Initialize cache with constants."""
         self._user_cache = TTLCache(maxsize=cnst.MAX_CACHE_SIZE, ttl=cnst.TIME_TO_LIVE)
+        self.hits = 0
+        self.misses = 0
 
     @classmethod
     def instance(cls) -> 'UserCache':
@@ -35,7 +37,12 @@ class UserCache:
 
     def get_user(self, user_id: int) -> UserData | None:
         """Retrieve cached user data."""
-        return self._user_cache.get(user_id)
+        user_data = self._user_cache.get(user_id)
+        if user_data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return user_data
 
     def set_user(self, user_data: UserData) -> None:
         """Cache user data."""
@@ -58,5 +65,8 @@ class UserCache:
             )
             self._user_cache[user_id] = updated_user
 
+    def __len__(self) -> int:
+        return len(self._user_cache)
+
 
 user_cache = UserCache.instance()
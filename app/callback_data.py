@@ -0,0 +1,101 @@
+import string
+from enum import Enum
+from typing import NamedTuple
+
+
+SEPARATOR = ':'
+_BASE36_DIGITS = string.digits + string.ascii_lowercase
+
+
+class CallbackAction(str, Enum):
+    """Short codes of inline button actions."""
+
+    CANCEL = 'x'
+    NO_ACTION = 'n'
+    CHOOSE_ROLE = 'r'
+    FILE_MENU = 'fm'
+
+    FILE_CATEGORY = 'fc'
+    FILE = 'f'
+    TEMP = 't'
+    CONST = 'c'
+
+    ADD_FILE = 'af'
+    ADD_TEMP = 'at'
+    ADD_CONST = 'ac'
+
+    DELETE_FILE_CATEGORY = 'dfc'
+    DELETE_FILE = 'df'
+    DELETE_TEMP_CATEGORY = 'dtc'
+    DELETE_TEMP = 'dt'
+    DELETE_CONST_CATEGORY = 'dcc'
+    DELETE_CONST = 'dc'
+
+    PAGE_FILES = 'pf'
+    PAGE_TEMP = 'pt'
+    PAGE_DELETE_FILES = 'pdf'
+    PAGE_DELETE_TEMP = 'pdt'
+    PAGE_DELETE_CONST = 'pdc'
+    SEARCH_PAGE = 'sp'
+    SUBSCRIBE = 'sb'
+
+
+# Actions whose payload ends with an entity id, the rest carry a short string value only
+ID_ACTIONS = frozenset({
+    CallbackAction.FILE, CallbackAction.TEMP, CallbackAction.CONST,
+    CallbackAction.DELETE_FILE, CallbackAction.DELETE_TEMP, CallbackAction.DELETE_CONST,
+    CallbackAction.PAGE_FILES, CallbackAction.PAGE_TEMP,
+    CallbackAction.PAGE_DELETE_FILES, CallbackAction.PAGE_DELETE_TEMP, CallbackAction.PAGE_DELETE_CONST,
+    CallbackAction.SEARCH_PAGE,
+})
+
+_ACTIONS_BY_CODE = {action.value: action for action in CallbackAction}
+
+
+class CallbackData(NamedTuple):
+    """Decoded inline button payload."""
+
+    action: CallbackAction
+    entity_id: int = 0
+    value: str = ''
+
+    def pack(self) -> str:
+        """Encode as 'code:payload' or 'code:value:id', ids in base 36."""
+        if self.action in ID_ACTIONS:
+            if self.value:
+                return f'{self.action.value}{SEPARATOR}{self.value}{SEPARATOR}{to_base36(self.entity_id)}'
+            return f'{self.action.value}{SEPARATOR}{to_base36(self.entity_id)}'
+        if self.value:
+            return f'{self.action.value}{SEPARATOR}{self.value}'
+        return self.action.value
+
+
+def to_base36(number: int) -> str:
+    """Encode non-negative integer in base 36."""
+    if number < 0:
+        raise ValueError(f'Negative id: {number}')
+    digits = []
+    while True:
+        number, remainder = divmod(number, 36)
+        digits.append(_BASE36_DIGITS[remainder])
+        if not number:
+            return ''.join(reversed(digits))
+
+
+def unpack(data: str) -> CallbackData | None:
+    """Decode callback data, return None for unknown or malformed payloads."""
+    code, _, payload = data.partition(SEPARATOR)
+    action = _ACTIONS_BY_CODE.get(code)
+    if action is None:
+        return None
+    if action not in ID_ACTIONS:
+        return CallbackData(action, value=payload)
+    value, _, payload = payload.rpartition(SEPARATOR)
+    if not (payload.isascii() and payload.isalnum()):
+        return None
+    return CallbackData(action, entity_id=int(payload, 36), value=value)
+
+
+def pack(action: CallbackAction, *, entity_id: int = 0, value: str = '') -> str:
+    """Encode button payload."""
+    return CallbackData(action, entity_id, value).pack()
@@ -14,6 +14,10 @@ def _get_text(category: str, key: str) -> str:
 CMD_FILE_CATEGORIES = _get_data('PUBLIC_COMMANDS', 'FILE_CATEGORIES')
 CMD_HELP = _get_data('PUBLIC_COMMANDS', 'HELP')
 CMD_OTHER_ITEMS = _get_data('PUBLIC_COMMANDS', 'OTHER_ITEMS')
+CMD_SEARCH_EMPTY = _get_data('PUBLIC_COMMANDS', 'SEARCH_EMPTY')
+CMD_SEARCH_EXPIRED = _get_data('PUBLIC_COMMANDS', 'SEARCH_EXPIRED')
+CMD_SEARCH_USAGE = _get_data('PUBLIC_COMMANDS', 'SEARCH_USAGE')
+CMD_SUBSCRIPTIONS = _get_data('PUBLIC_COMMANDS', 'SUBSCRIPTIONS')
 CMD_UPCOMING_EVENTS = _get_data('PUBLIC_COMMANDS', 'UPCOMING_EVENTS')
 CMD_UPCOMING_SESSIONS = _get_data('PUBLIC_COMMANDS', 'UPCOMING_SESSIONS')
 CMD_UPCOMING_SPEAKERS = _get_data('PUBLIC_COMMANDS', 'UPCOMING_SPEAKERS')
@@ -44,8 +48,13 @@ ADMIN_HELP = _get_data('ADMIN', 'ADMIN_HELP')
 CALLBACK_INVITE_ALREADY_ADMIN = _get_data('ADMIN', 'CALLBACK_INVITE_ALREADY_ADMIN')
 CALLBACK_INVITE_ALREADY_SUPERADMIN = _get_data('ADMIN', 'CALLBACK_INVITE_ALREADY_SUPERADMIN')
 CALLBACK_INVITE_ALREADY_USED = _get_data('ADMIN', 'CALLBACK_INVITE_ALREADY_USED')
+CALLBACK_INVITE_EXPIRED = _get_data('ADMIN', 'CALLBACK_INVITE_EXPIRED')
 CANCEL = _get_data('ADMIN', 'CANCEL')
 CHOOSE_ROLE = _get_data('ADMIN', 'CHOOSE_ROLE')
+HEAP_STARTED = _get_data('ADMIN', 'HEAP_STARTED')
+HEAP_STOPPED = _get_data('ADMIN', 'HEAP_STOPPED')
+NO_TRACES = _get_data('ADMIN', 'NO_TRACES')
+PROFILE_BUSY = _get_data('ADMIN', 'PROFILE_BUSY')
 ROLE_ADMIN = _get_data('ADMIN', 'ROLE_ADMIN')
 ROLE_SUPERADMIN = _get_data('ADMIN', 'ROLE_SUPERADMIN')
 SUPERADMIN_HELP = _get_data('ADMIN', 'SUPERADMIN_HELP')
@@ -91,13 +100,45 @@ TEMP_SESSIONS = _get_text('TEMP', 'SESSIONS')
 TEMP_EVENTS = _get_text('TEMP', 'EVENTS')
 TEMP_MISC = _get_text('TEMP', 'MISC')
 
+# Category keys used in callback data
+CONST_CATEGORIES = {
+    'links': CONST_LINKS,
+    'newcomer': CONST_NEWCOMER,
+    'contacts': CONST_CONTACTS,
+}
+FILE_CATEGORIES = {
+    'booklets': FILE_BOOKLETS,
+    'books': FILE_BOOKS,
+    'formats': FILE_FORMATS,
+    'extras': FILE_EXTRAS,
+    'schedule': FILE_SCHEDULE,
+    'pics': FILE_BOT_PICS,
+}
+TEMP_CATEGORIES = {
+    'speakers': TEMP_SPEAKERS,
+    'sessions': TEMP_SESSIONS,
+    'events': TEMP_EVENTS,
+    'misc': TEMP_MISC,
+}
+# Categories users can subscribe to, keyed by file or temp prefix and category key
+SUBSCRIPTION_CATEGORIES = {
+    **{f'f.{key}': category for key, category in FILE_CATEGORIES.items() if key != 'pics'},
+    **{f't.{key}': category for key, category in TEMP_CATEGORIES.items()},
+}
+
 KB_ROLE_ADMIN = _get_text('ROLES', 'ADMIN')
 KB_ROLE_SUPERADMIN = _get_text('ROLES', 'SUPERADMIN')
 
 # Keyboard
+KB_BACK_TO_CATEGORIES = _get_text('KEYBOARD', 'BACK_TO_CATEGORIES')
 KB_CANCEL = _get_text('KEYBOARD', 'CANCEL')
+KB_NOT_SUBSCRIBED = _get_text('KEYBOARD', 'NOT_SUBSCRIBED')
 KB_NO_CONST = _get_text('KEYBOARD', 'NO_CONST')
 KB_NO_FILES = _get_text('KEYBOARD', 'NO_FILES')
 KB_NO_INFO = _get_text('KEYBOARD', 'NO_INFO')
 KB_NO_TEMP = _get_text('KEYBOARD', 'NO_TEMP')
+KB_OPEN_BOT = _get_text('KEYBOARD', 'OPEN_BOT')
+KB_PAGE_NEXT = _get_text('KEYBOARD', 'PAGE_NEXT')
+KB_PAGE_PREV = _get_text('KEYBOARD', 'PAGE_PREV')
 KB_PLACEHOLDER = _get_text('KEYBOARD', 'PLACEHOLDER')
+KB_SUBSCRIBED = _get_text('KEYBOARD', 'SUBSCRIBED')
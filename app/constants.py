@@ -2,26 +2,83 @@ from app.database.models.enums import UserRole
 
 
 # CONSTANTS
-ATTEMPTS_RESET_TIME = 300
-ATTEMPTS_TTL = 3600
+ACTIVITY_FLUSH_BATCH = 5000
+ACTIVITY_FLUSH_SECONDS = 60
+ACTIVITY_MAU_DAYS = 30
+BACKFILL_BATCH_SIZE = 100
+BACKFILL_DELAY = 0.05
 BLOCK_TIME = 3600
+BOT_API_MAX_RETRIES = 2
+CALLBACK_DEDUP_WINDOW = 1.0
+CATALOG_PAGE_SIZE = 10
 CODE_LENGTH = 16
 DELETE_HOUR = 8
 DELETE_MINUTE = 30
+DRAFT_TTL = 60 * 60 * 24
 DUMMY_TOKEN = 'dummy_token'  # noqa: S105
+GC_BATCH_SIZE = 500
+GC_INTERVAL_MINUTES = 60
+GC_VAULT_DELAY = 0.5
+HEAP_REPORT_INTERVAL_MINUTES = 30
+HEAP_TOP_SITES = 25
+HEAP_TRACE_FRAMES = 1
+HLL_PRECISION = 12
+INLINE_CACHE_TIME = 300
+INLINE_PAGE_SIZE = 50
+INVITE_TTL = 60 * 60 * 24 * 7
 MAX_ATTEMPTS = 5
+MAX_BATCH_INVITES = 50
+MARKUP_CACHE_SIZE = 256
+MARKUP_CACHE_TTL = 600
 MAX_CACHE_SIZE = 512
+MESSAGE_MAX_LENGTH = 4096
 MISFIRE_GRACE_TIME = 60 * 60 * 3
+NOTIFY_BATCH_SIZE = 500
+NOTIFY_QUEUE_SIZE = 1000
+NOTIFY_RATE = 25.0
+PERF_TOP_HANDLERS = 25
+PERF_WINDOW_SIZE = 1000
 POLLING_RELAX = 0.1
 POLLING_TIMEOUT = 60
+PROFILE_DEFAULT_SECONDS = 10
+PROFILE_MAX_SECONDS = 60
+PROFILE_SAMPLE_INTERVAL = 0.005
+PROFILE_TOP_FUNCTIONS = 40
+RUNTIME_METRICS_INTERVAL = 1.0
+SEARCH_CACHE_SIZE = 256
+SEARCH_MAX_QUERY_LENGTH = 64
+SEARCH_MAX_RESULTS = 50
+SEARCH_TOKEN_CACHE_SIZE = 4096
+SLOW_QUERY_THRESHOLD = 0.2
+THROTTLE_BURST = 10
+THROTTLE_CACHE_SIZE = 100_000
+THROTTLE_RATE = 2.0
 TIME_TO_LIVE = 600
+TRACE_BUFFER_SIZE = 1000
+TRACE_EXPORT_PATH = 'app/logs/traces.jsonl'
+TRACE_FLUSH_SECONDS = 10
+TRACE_SAMPLE_RATE = 0.01
+TRACE_SLOWEST_SIZE = 20
+TRACE_SLOW_THRESHOLD = 1.0
+
+# COMMANDS TRACKED IN METRICS
+KNOWN_COMMANDS = frozenset({
+    'addadmin', 'addconst', 'addfile', 'addtemp', 'adminhelp', 'adminlist', 'contacts', 'delconst', 'delfile',
+    'deltemp', 'events', 'files', 'geninvites', 'heap', 'help', 'links', 'metrics', 'misc', 'newcomer', 'perf',
+    'profile', 'search', 'sessions', 'speakers', 'start', 'subscribe', 'traces',
+})
+
+# ROLE RANKS
+ROLE_RANKS = {
+    UserRole.DEFAULT: 0,
+    UserRole.ADMIN: 1,
+    UserRole.SUPERADMIN: 2,
+    UserRole.OWNER: 3,
+}
 
 # TEXTS_PATH
 TEXTS_PATH = 'app/texts.json'
 
-# CALLBACK_LENGTH
-CHOOSE_ROLE = 3
-
 # INITIAL ADMINS
 '''ADMIN_IDS = {
     0000000000: {
@@ -0,0 +1,91 @@
+import hashlib
+import logging
+import re
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+import app.constants as cnst
+from app.metrics import STATEMENT_LATENCY
+from app.tracing import record_span
+
+
+logger = logging.getLogger(__name__)
+
+_CASTS = re.compile(r'::\w+(?: WITH(?:OUT)? TIME ZONE)?(?:\(\d+(?:, ?\d+)?\))?(?:\[\])?', re.IGNORECASE)
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|\$\d+|%\(\w+\)s|:\w+")
+_IN_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_ROW_RUNS = re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+')
+_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE)\s+"?(\w+)"?', re.IGNORECASE)
+
+
+class QueryStats:
+    """Number of statements issued in the current update."""
+
+    __slots__ = ('count',)
+
+    def __init__(self) -> None:
+        """Start counting from zero."""
+        self.count = 0
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar('query_stats', default=None)
+
+
+@lru_cache(maxsize=512)
+def fingerprint(statement: str) -> str:
+    """Return short low-cardinality label for a SQL statement: verb, main table and hash of its shape.
+
+    Bind casts such as $1::INTEGER are stripped first, so IN lists and VALUES rows of any length collapse to one shape.
+    """
+    normalized = _CASTS.sub('', ' '.join(statement.split()))
+    normalized = _ROW_RUNS.sub('(...)', _IN_LISTS.sub('(...)', _LITERALS.sub('?', normalized)))
+    verb = normalized.split(' ', 1)[0].upper()
+    table = _TABLE.search(normalized)
+    digest = hashlib.sha1(normalized.encode(), usedforsecurity=False).hexdigest()[:8]
+    return f"{verb} {table.group(1) if table else '-'} {digest}"
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Count statements executed inside the block."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail if the block issues more than limit statements, e.g. around a handler call in tests."""
+    with count_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        raise AssertionError(f'Expected at most {limit} queries, got {stats.count}')
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach latency, query counting and slow query logging to engine events."""
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute, named=True)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute, named=True)
+
+
+def _before_cursor_execute(conn: Connection, **_event: object) -> None:
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Connection, statement: str, **_event: object) -> None:
+    latency = time.perf_counter() - conn.info['query_start_time'].pop()
+    STATEMENT_LATENCY.labels(statement=fingerprint(statement)).observe(latency)
+    record_span('db', latency)
+    if stats := _current_stats.get():
+        stats.count += 1
+    if latency >= cnst.SLOW_QUERY_THRESHOLD:
+        logger.warning('Slow query (%.3fs): %s', latency, ' '.join(statement.split()))
@@ -1,5 +1,6 @@
 from .admin_invite import AdminInvite
-from .base import Base
+from .base import Base, CatalogBase
+from .category_subscription import CategorySubscription
 from .const_message import ConstantMessage
 from .file import File
 from .temp_message import TemporaryMessage
@@ -9,6 +10,8 @@ from .user import User
 __all__ = [
     'AdminInvite',
     'Base',
+    'CatalogBase',
+    'CategorySubscription',
     'ConstantMessage',
     'File',
     'TemporaryMessage',
@@ -1,4 +1,6 @@
-from sqlalchemy import BigInteger, Boolean, Enum, Index, String
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, DateTime, Enum, Index, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database.models.base import Base
@@ -7,12 +9,14 @@ from app.database.models.enums import UserRole
 
 class AdminInvite(Base):
     __tablename__ = 'admin_invites'
-    code: Mapped[str] = mapped_column(String(16), primary_key=True)
+    code: Mapped[str] = mapped_column(String(32), primary_key=True)
     was_used: Mapped[bool] = mapped_column(Boolean, default=True)
     role: Mapped[UserRole] = mapped_column(Enum(UserRole, name='user_role', create_type=False))
     made_by_id: Mapped[int] = mapped_column(BigInteger)
     made_by_name: Mapped[str] = mapped_column(String(256))
     used_by_id: Mapped[int] = mapped_column(BigInteger, nullable=True)
     used_by_name: Mapped[str] = mapped_column(String(256), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
 
-    __table_args__ = (Index('unq_active_invite_code', 'code', unique=True, postgresql_where=(was_used is False)),)
+    __table_args__ = (Index('ix_admin_invites_active', 'code', 'expires_at', postgresql_where=text('NOT was_used')),)
@@ -1,5 +1,13 @@
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
 class Base(DeclarativeBase):
     """Base class for all models using SQLAlchemy."""
+
+
+class CatalogBase(Base):
+    """Base class for catalog entries listed page by page in id order."""
+
+    __abstract__ = True
+
+    id: Mapped[int] = mapped_column(primary_key=True)
@@ -1,17 +1,26 @@
-from sqlalchemy import BigInteger, Enum, ForeignKey, String
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Enum, ForeignKey, Index, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database.models.base import Base
+from app.database.models.base import CatalogBase
 from app.database.models.enums import UploadState
 
 
-class ConstantMessage(Base):
+class ConstantMessage(CatalogBase):
     __tablename__ = 'constant_messages'
 
-    id: Mapped[int] = mapped_column(primary_key=True)
     admin_id = mapped_column(BigInteger, ForeignKey('users.user_id'))
     chat_id = mapped_column(BigInteger)
     message_id = mapped_column(BigInteger, nullable=True)
     name: Mapped[str] = mapped_column(String(64), nullable=True)
     category: Mapped[str] = mapped_column(String(40))
     status: Mapped[UploadState] = mapped_column(Enum(UploadState, name='upload_state'), index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_constant_messages_catalog', 'category', 'status', 'id'),
+        Index('ix_constant_messages_name_trgm', 'name', postgresql_using='gin',
+              postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_constant_messages_name_tsv', text("to_tsvector('simple', name)"), postgresql_using='gin'),
+    )
@@ -1,15 +1,25 @@
-from sqlalchemy import Enum, String
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, Index, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database.models.base import Base
+from app.database.models.base import CatalogBase
 from app.database.models.enums import UploadState
 
 
-class File(Base):
+class File(CatalogBase):
     __tablename__ = 'files'
 
-    id: Mapped[int] = mapped_column(primary_key=True)
     tg_id = mapped_column(String(128), nullable=True)
+    file_unique_id = mapped_column(String(64), nullable=True, unique=True, index=True)
     name: Mapped[str] = mapped_column(String(64), nullable=True)
     category: Mapped[str] = mapped_column(String(40))
     status: Mapped[UploadState] = mapped_column(Enum(UploadState, name='upload_state'), index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_files_catalog', 'category', 'status', 'id'),
+        Index('ix_files_name_trgm', 'name', postgresql_using='gin',
+              postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_files_name_tsv', text("to_tsvector('simple', name)"), postgresql_using='gin'),
+    )
@@ -1,14 +1,15 @@
-from sqlalchemy import BigInteger, Enum, ForeignKey, String
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Enum, ForeignKey, Index, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.database.models.base import Base
+from app.database.models.base import CatalogBase
 from app.database.models.enums import UploadState
 
 
-class TemporaryMessage(Base):
+class TemporaryMessage(CatalogBase):
     __tablename__ = 'temporary_messages'
 
-    id: Mapped[int] = mapped_column(primary_key=True)
     admin_id = mapped_column(BigInteger, ForeignKey('users.user_id'))
     chat_id = mapped_column(BigInteger, nullable=True)
     message_id = mapped_column(BigInteger, nullable=True)
@@ -16,3 +17,11 @@ class TemporaryMessage(Base):
     name: Mapped[str] = mapped_column(String(64), nullable=True)
     category: Mapped[str] = mapped_column(String(40))
     status: Mapped[UploadState] = mapped_column(Enum(UploadState, name='upload_state'), nullable=True, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_temporary_messages_catalog', 'category', 'status', 'id'),
+        Index('ix_temporary_messages_name_trgm', 'name', postgresql_using='gin',
+              postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_temporary_messages_name_tsv', text("to_tsvector('simple', name)"), postgresql_using='gin'),
+    )
@@ -1,4 +1,6 @@
-from sqlalchemy import BigInteger, Enum, String
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Enum, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database.models.base import Base
@@ -13,3 +15,4 @@ class User(Base):
     username: Mapped[str | None] = mapped_column(String(32), nullable=True)
     state: Mapped[str] = mapped_column(String(64), index=True)
     role: Mapped[UserRole] = mapped_column(Enum(UserRole, name='user_role'), index=True)
+    last_seen_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -2,16 +2,18 @@ from collections.abc import Sequence
 from datetime import datetime
 from typing import Generic, TypeVar
 
-from sqlalchemy import and_, select, update
+from sqlalchemy import Row, and_, delete, func, insert, literal_column, or_, select, update
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.postgresql.dml import Insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.models.base import Base
+from app.database.models.base import Base, CatalogBase
 from app.exceptions import NotFoundError
 
 
 ModelType = TypeVar('ModelType', bound=Base)
+CatalogModelType = TypeVar('CatalogModelType', bound=CatalogBase)
 
 
 class GenericSqlRepository(Generic[ModelType]):
@@ -36,21 +38,84 @@ class GenericSqlRepository(Generic[ModelType]):
         result = await self.session.execute(stmt)
         return result.scalar()
 
-    async def find(self, filters: dict[str, int | str | None]) -> Sequence[ModelType]:
+    async def find(self, filters: dict[str, int | str | None], *, limit: int | None = None) -> Sequence[ModelType]:
         """Find all entities matching filter criteria."""
         stmt = select(self.model)
         if filters:
             where_clauses = [getattr(self.model, k) == v for k, v in filters.items()]
             stmt = stmt.where(and_(*where_clauses))
+        if limit is not None:
+            stmt = stmt.limit(limit)
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def find_page(self, filters: dict[str, int | str | None], *,
+                        after_id: int = 0, limit: int) -> Sequence[ModelType]:
+        """Find entities matching filter criteria with ids after the cursor, in id order."""
+        columns = self.model.__table__.c
+        stmt = (
+            select(self.model)
+            .where(columns.id > after_id, *[getattr(self.model, key) == value for key, value in filters.items()])
+            .order_by(columns.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def previous_page_cursor(self, filters: dict[str, int | str | None], *,
+                                   before_id: int, limit: int) -> int | None:
+        """Return cursor of the page ending right before the given id, None if there is no such page."""
+        columns = self.model.__table__.c
+        stmt = (
+            select(columns.id)
+            .where(columns.id < before_id, *[getattr(self.model, key) == value for key, value in filters.items()])
+            .order_by(columns.id.desc())
+            .limit(limit + 1)
+        )
+        result = await self.session.execute(stmt)
+        ids = result.scalars().all()
+        if not ids:
+            return None
+        return ids[limit] if len(ids) > limit else 0
+
+    async def search_by_name(self, query: str, filters: dict[str, int | str | None], *, limit: int,
+                             exclude_categories: tuple[str, ...] = ()) -> Sequence[Row[tuple[int, str, float]]]:
+        """Find (id, name, rank) of entities whose name matches the query by substring, trigrams or words."""
+        columns = self.model.__table__.c
+        # a bound 'simple' parameter would not match the to_tsvector('simple', name) expression index
+        config = literal_column("'simple'::regconfig", REGCONFIG)
+        document = func.to_tsvector(config, columns.name)
+        words = func.plainto_tsquery(config, query)
+        pattern = '%' + query.replace('/', '//').replace('%', '/%').replace('_', '/_') + '%'
+        rank = func.greatest(func.similarity(columns.name, query), func.ts_rank(document, words))
+        stmt = (
+            select(columns.id, columns.name, rank.label('rank'))
+            .where(
+                or_(
+                    columns.name.ilike(pattern, escape='/'),
+                    columns.name.bool_op('%')(query),
+                    document.bool_op('@@')(words),
+                ),
+                *[getattr(self.model, key) == value for key, value in filters.items()],
+                *([columns.category.not_in(exclude_categories)] if exclude_categories else []),
+            )
+            .order_by(rank.desc(), columns.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
     async def add(self, entity: ModelType) -> ModelType:
         """Add new entity to database."""
         self.session.add(entity)
         await self.session.flush()
         return entity
 
+    async def add_many(self, values: list[dict[str, int | str | bool | datetime | None]]) -> None:
+        """Insert many entities with a single multi-row statement."""
+        if values:
+            await self.session.execute(insert(self.model).values(values))
+
     async def update(self, entity: ModelType) -> ModelType:
         """Update existing entity."""
         merged = await self.session.merge(entity)
@@ -113,3 +178,35 @@ class GenericSqlRepository(Generic[ModelType]):
         """Remove entity from database."""
         await self.session.delete(entity)
         await self.session.flush()
+
+    async def delete_by_ids(self, entity_ids: list[int]) -> int:
+        """Remove entities by primary keys in one statement."""
+        columns = self.model.__table__.c
+        stmt = (
+            delete(self.model)
+            .where(columns.id.in_(entity_ids))
+            .returning(columns.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return len(result.scalars().all())
+
+    async def delete_stale(self, filters: dict[str, int | str | None], *, before: datetime, limit: int) -> int:
+        """Remove a batch of entities matching filters and created before the given moment."""
+        columns = self.model.__table__.c
+        batch = (
+            select(columns.id)
+            .where(
+                columns.created_at < before,
+                *[getattr(self.model, key) == value for key, value in filters.items()],
+            )
+            .limit(limit)
+        )
+        stmt = (
+            delete(self.model)
+            .where(columns.id.in_(batch))
+            .returning(columns.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return len(result.scalars().all())
@@ -1,4 +1,11 @@
+from sqlalchemy import BigInteger, String, and_, delete, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.postgresql.dml import Insert
+
 from app.database.models.admin_invite import AdminInvite
+from app.database.models.enums import UserRole
+from app.database.models.user import User
+from app.database.models.user_states import UserState
 
 from .base import GenericSqlRepository
 
@@ -7,3 +14,60 @@ class InviteRepository(GenericSqlRepository[AdminInvite]):
     """"Repository for Invite."""
 
     model = AdminInvite
+
+    async def redeem(self, code: str, user_id: int, *, user_name: str,
+                     user: dict[str, int | str | None]) -> UserRole | None:
+        """Mark an unused invite as used and grant its role in one statement, return None if not redeemable."""
+        role_conflict = (
+            select(User.user_id)
+            .where(
+                User.user_id == user_id,
+                or_(
+                    User.role.in_((UserRole.SUPERADMIN, UserRole.OWNER)),
+                    and_(User.role == UserRole.ADMIN, AdminInvite.role == UserRole.ADMIN),
+                ),
+            )
+            .correlate(AdminInvite)
+            .exists()
+        )
+        redeemed = (
+            update(AdminInvite)
+            .where(
+                AdminInvite.code == code,
+                AdminInvite.was_used.is_(False),
+                AdminInvite.expires_at > func.now(),
+                ~role_conflict,
+            )
+            .values(was_used=True, used_by_id=user_id, used_by_name=user_name)
+            .returning(AdminInvite.role)
+            .cte('redeemed')
+        )
+        grant: Insert = pg_insert(User).from_select(  # type: ignore[no-untyped-call]
+            ['user_id', 'first_name', 'last_name', 'username', 'state', 'role'],
+            select(
+                literal(user_id, BigInteger),
+                literal(user['first_name'], String),
+                literal(user.get('last_name'), String),
+                literal(user.get('username'), String),
+                literal(UserState.DEFAULT, String),
+                redeemed.c.role,
+            ),
+        )
+        stmt = (
+            grant.on_conflict_do_update(index_elements=['user_id'], set_={'role': grant.excluded.role})
+            .returning(User.role)
+            .add_cte(redeemed)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def purge_expired(self) -> int:
+        """Remove all unused invites whose expiry time has passed."""
+        stmt = (
+            delete(AdminInvite)
+            .where(AdminInvite.was_used.is_(False), AdminInvite.expires_at <= func.now())
+            .returning(AdminInvite.code)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return len(result.scalars().all())
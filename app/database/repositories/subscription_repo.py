@@ -0,0 +1,57 @@
+from collections.abc import Sequence
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.database.models.category_subscription import CategorySubscription
+
+from .base import GenericSqlRepository
+
+
+class SubscriptionRepository(GenericSqlRepository[CategorySubscription]):
+    """"Repository for CategorySubscription."""
+
+    model = CategorySubscription
+
+    async def categories_of(self, user_id: int) -> set[str]:
+        """Return categories the user is subscribed to."""
+        stmt = select(CategorySubscription.category).where(CategorySubscription.user_id == user_id)
+        result = await self.session.execute(stmt)
+        return set(result.scalars().all())
+
+    async def toggle(self, user_id: int, category: str) -> bool:
+        """Subscribe user to category or drop the existing subscription, return whether user is subscribed now."""
+        removed = await self.session.execute(
+            delete(CategorySubscription)
+            .where(CategorySubscription.category == category, CategorySubscription.user_id == user_id)
+            .returning(CategorySubscription.user_id)
+            .execution_options(synchronize_session=False),
+        )
+        if removed.scalar_one_or_none() is not None:
+            return False
+        await self.session.execute(
+            pg_insert(CategorySubscription)  # type: ignore[no-untyped-call]
+            .values(category=category, user_id=user_id)
+            .on_conflict_do_nothing(index_elements=['category', 'user_id']),
+        )
+        return True
+
+    async def subscriber_batch(self, category: str, *, after_user_id: int, limit: int) -> Sequence[int]:
+        """Return ids of category subscribers after the cursor in id order, walks the primary key index."""
+        stmt = (
+            select(CategorySubscription.user_id)
+            .where(CategorySubscription.category == category, CategorySubscription.user_id > after_user_id)
+            .order_by(CategorySubscription.user_id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def unsubscribe_all(self, user_id: int) -> None:
+        """Drop all subscriptions of the user."""
+        stmt = (
+            delete(CategorySubscription)
+            .where(CategorySubscription.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
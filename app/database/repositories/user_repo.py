@@ -1,3 +1,7 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, column, update, values
+
 from app.database.models.user import User
 
 from .base import GenericSqlRepository
@@ -7,3 +11,18 @@ class UserRepository(GenericSqlRepository[User]):
     """"Repository for User."""
 
     model = User
+
+    async def touch_last_seen(self, seen: list[tuple[int, datetime]]) -> None:
+        """Set last seen time of many users with one UPDATE ... FROM (VALUES ...) statement."""
+        batch = values(
+            column('user_id', BigInteger),
+            column('last_seen_at', DateTime(timezone=True)),
+            name='seen',
+        ).data(seen)
+        stmt = (
+            update(User)
+            .where(User.user_id == batch.c.user_id)
+            .values(last_seen_at=batch.c.last_seen_at)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
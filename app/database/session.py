@@ -1,6 +1,10 @@
+from weakref import WeakSet
+
 from config import config
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.database.instrumentation import instrument_engine
+
 
 class AsyncSessionFactory:
     """Factory for creating async database sessions for UoW."""
@@ -8,16 +12,24 @@ class AsyncSessionFactory:
     def __init__(self) -> None:
         """Initialize with database configuration."""
         self.engine = create_async_engine(url=config['database']['url'])
+        instrument_engine(self.engine.sync_engine)
         self.session_factory = async_sessionmaker(
             self.engine,
             expire_on_commit=False,
             class_=AsyncSession,
             autoflush=False,
         )
+        self.open_sessions: WeakSet[AsyncSession] = WeakSet()
 
     def __call__(self) -> AsyncSession:
         """Create and return new async session."""
-        return self.session_factory()
+        session = self.session_factory()
+        self.open_sessions.add(session)
+        return session
+
+    def identity_map_sizes(self) -> list[int]:
+        """Return number of objects held by identity map of each live session."""
+        return [len(session.sync_session.identity_map) for session in list(self.open_sessions)]
 
 
 session_factory = AsyncSessionFactory()
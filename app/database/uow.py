@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.repositories.const_repo import ConstantMessageRepository
 from app.database.repositories.file_repo import FileRepository
 from app.database.repositories.invite_repo import InviteRepository
+from app.database.repositories.subscription_repo import SubscriptionRepository
 from app.database.repositories.temp_repo import TemporaryMessageRepository
 from app.database.repositories.user_repo import UserRepository
 from app.database.session import session_factory
@@ -21,6 +22,7 @@ class UnitOfWork:
         self.invites: InviteRepository = InviteRepository(self.session)
         self.users: UserRepository = UserRepository(self.session)
         self.files: FileRepository = FileRepository(self.session)
+        self.subscriptions: SubscriptionRepository = SubscriptionRepository(self.session)
         self.auto_commit = auto_commit
 
     async def __aenter__(self) -> 'UnitOfWork':
@@ -1,137 +1,91 @@
 import logging
 
 from aiogram.filters import Filter
-from aiogram.types import CallbackQuery, ContentType, Message
+from aiogram.types import ContentType, Message, TelegramObject
 
 import app.const_texts as txts
-from app.cache.user_cache import UserCache
+import app.constants as cnst
+from app.cache.user_cache import UserData
+from app.callback_data import CallbackAction
 from app.database.models.enums import UserRole
 from app.database.models.user_states import UserState
 
 
 logger = logging.getLogger(__name__)
 
+# Keyboard buttons never count as user input in states that wait for text
+KEYBOARD_TEXTS = frozenset({
+    txts.CMD_HELP[0], txts.CMD_FILES[0], txts.CMD_SPEAKERS[0], txts.CMD_SESSIONS[0], txts.CMD_NEWCOMER[0],
+    txts.CMD_LINKS[0],
+})
 
-class MessageFilter(Filter):
-    """Filter that checks both user role and state for Message updates."""
 
-    def __init__(self, role: UserRole | None = None, state: str | None = None) -> None:
-        """Initiliaze MessageFilter."""
-        self.required_role = role
-        self.required_state = state
+class Route(Filter):
+    """Handler route, the update is matched once by DispatchIndex and the filter only compares the result."""
 
-    async def __call__(self, message: Message) -> bool:
+    def __init__(self, *, role: UserRole | None = None, state: str | None = None) -> None:
+        """Initialize route with minimal role and required state."""
+        self.min_rank = cnst.ROLE_RANKS[role] if role else None
+        self.state = state
+        self.order = -1
+
+    async def __call__(self, event: TelegramObject, route: 'Route | None' = None) -> bool:
+        """Check if this route was resolved for the update."""
+        return route is self
+
+    def allows(self, user_data: UserData | None) -> bool:
         """Check if user meets role and state requirements."""
-        if not message.from_user:
+        if self.min_rank is None and self.state is None:
+            return True
+        if user_data is None:
             return False
+        if self.min_rank is not None and cnst.ROLE_RANKS[user_data.role] < self.min_rank:
+            return False
+        return self.state is None or user_data.state.startswith(self.state)
 
-        user_cache = UserCache.instance()
-        user_data = user_cache.get_user(message.from_user.id)
 
-        if not user_data:
-            return False
+class MessageRoute(Route):
+    """Message route by commands, exact keyboard texts or user state."""
 
-        if self.required_role and not self._check_role_permission(user_data.role, self.required_role):
-            return False
+    def __init__(self, *, commands: tuple[str, ...] = (), texts: tuple[str, ...] = (),
+                 role: UserRole | None = None, state: str | None = None) -> None:
+        """Initialize message route."""
+        super().__init__(role=role, state=state)
+        self.commands = commands
+        self.texts = tuple(text.lower() for text in texts)
+        self.text_prefix: str | None = None
 
-        if self.required_state and not user_data.state.startswith(self.required_state):
+    def accepts(self, message: Message, user_data: UserData | None) -> bool:
+        """Check user requirements and, for state routes, content type of the message."""
+        if not self.allows(user_data):
             return False
-
-        if self.required_state:
-            return self._check_content_type(message, user_data.state)
-
-        return True
-
-    @staticmethod
-    def _check_role_permission(user_role: UserRole, required: UserRole) -> bool:
-        """Check if user role meets or exceeds required level."""
-        match required:
-            case UserRole.OWNER:
-                return user_role == UserRole.OWNER
-            case UserRole.SUPERADMIN:
-                return user_role in (UserRole.OWNER, UserRole.SUPERADMIN)
-            case UserRole.ADMIN:
-                return user_role in (UserRole.OWNER, UserRole.SUPERADMIN, UserRole.ADMIN)
-            case _:
-                return False
-
-    @staticmethod
-    def _check_content_type(message: Message, user_state: str) -> bool:
-        """Check content type based on user state."""
-        values_set = {
-            txts.CMD_HELP[0], txts.CMD_FILES[0], txts.CMD_SPEAKERS[0], txts.CMD_SESSIONS[0], txts.CMD_NEWCOMER[0],
-            txts.CMD_LINKS[0],
-        }
-
-        if user_state.startswith(UserState.FILE_UPLOAD) and message.content_type == ContentType.DOCUMENT:
+        if self.state is None:
             return True
-        if user_state.startswith(UserState.PICS_UPLOAD) and message.content_type == ContentType.PHOTO:
-            return True
-
+        if self.state == UserState.FILE_UPLOAD:
+            return message.content_type == ContentType.DOCUMENT
+        if self.state == UserState.PICS_UPLOAD:
+            return message.content_type == ContentType.PHOTO
         return bool(
             message.text
             and message.content_type == ContentType.TEXT
-            and message.text not in values_set
+            and message.text not in KEYBOARD_TEXTS
             and not message.text.startswith('/'),
         )
 
 
-class CallbackFilter(Filter):
-    """Filter that checks both user role and state for CallbackQuery updates."""
+class PrefixRoute(MessageRoute):
+    """Message route by text prefix, e.g. of invite codes."""
 
-    def __init__(self, role: UserRole | None = None, state: str | None = None) -> None:
-        """Initiliaze CallbackFilter."""
-        self.required_role = role
-        self.required_state = state
+    def __init__(self, text_prefix: str, *, role: UserRole | None = None, state: str | None = None) -> None:
+        """Initialize prefix route."""
+        super().__init__(role=role, state=state)
+        self.text_prefix = text_prefix
 
-    async def __call__(self, callback: CallbackQuery) -> bool:
-        """Check if user meets role and state requirements."""
-        if not callback.data or not callback.from_user:
-            return False
-
-        user_cache = UserCache.instance()
-        user_data = user_cache.get_user(callback.from_user.id)
-
-        if not user_data:
-            return False
-
-        if self.required_role and not self._check_role_permission(user_data.role, self.required_role):
-            return False
 
-        if self.required_state and not user_data.state.startswith(self.required_state):
-            return False
+class CallbackRoute(Route):
+    """Callback query route by decoded callback action and optional user state."""
 
-        if self.required_state and callback.data:
-            return self._check_callback_data(callback.data, user_data.state)
-
-        return True
-
-    @staticmethod
-    def _check_role_permission(user_role: UserRole, required: UserRole) -> bool:
-        """Check if user role meets or exceeds required level."""
-        match required:
-            case UserRole.OWNER:
-                return user_role == UserRole.OWNER
-            case UserRole.SUPERADMIN:
-                return user_role in (UserRole.OWNER, UserRole.SUPERADMIN)
-            case UserRole.ADMIN:
-                return user_role in (UserRole.OWNER, UserRole.SUPERADMIN, UserRole.ADMIN)
-            case _:
-                return False
-
-    @staticmethod
-    def _check_callback_data(callback_data: str, state: str) -> bool:
-        """Check if callback data matches the user state."""
-        prefix_checks = {
-            UserState.DELETE_CONST_CAT: 'del_const_cat_',
-            UserState.DELETE_CONST_MES: 'del_const_entry_',
-            UserState.DELETE_FILE_CAT: 'del_file_cat_',
-            UserState.DELETE_FILE_MES: 'del_file_entry_',
-            UserState.DELETE_TEMP_CAT: 'del_temp_cat_',
-            UserState.DELETE_TEMP_MES: 'del_temp_entry_',
-        }
-
-        for state_prefix, callback_prefix in prefix_checks.items():
-            if state.startswith(state_prefix):
-                return callback_data.startswith(callback_prefix)
-        return False
+    def __init__(self, action: CallbackAction, *, role: UserRole | None = None, state: str | None = None) -> None:
+        """Initialize callback route."""
+        super().__init__(role=role, state=state)
+        self.action = action
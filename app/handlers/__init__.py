@@ -2,6 +2,7 @@ from .admin_router import router as admin_router
 from .callback_router import router as callback_router
 from .const_router import router as const_router
 from .file_router import router as file_router
+from .inline_router import router as inline_router
 from .public_commands import router as public_commands_router
 from .temp_router import router as temp_router
 
@@ -11,6 +12,7 @@ __all__ = [
     'callback_router',
     'const_router',
     'file_router',
+    'inline_router',
     'public_commands_router',
     'temp_router',
 ]
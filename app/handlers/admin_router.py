@@ -1,25 +1,25 @@
-import locale
 import logging
-from pathlib import Path
-from tempfile import NamedTemporaryFile
 
 from aiogram import F, Router
-from aiogram.filters import Command
-from aiogram.types import CallbackQuery, FSInputFile, Message
+from aiogram.filters import CommandObject
+from aiogram.types import BufferedInputFile, CallbackQuery, Message
 
 import app.const_texts as txts
 import app.constants as cnst
 import app.keyboards as kb
 from app.cache.code_entry_cache import code_entry_cache
 from app.cache.user_cache import UserData
+from app.callback_data import CallbackAction, CallbackData
 from app.database.models.enums import UserRole
 from app.database.uow import UnitOfWork
 from app.exceptions import NotFoundError, NotUsableCodeError
-from app.filters import CallbackFilter, MessageFilter
+from app.filters import CallbackRoute, MessageRoute, PrefixRoute
 from app.helpers import handle_errors
 from app.metrics import get_metrics
+from app.profiling import heap_tracker, is_profiling, perf_report, profile_event_loop
 from app.services.invite_manager import InviteManager
 from app.services.text_manager import text_manager
+from app.tracing import trace_store
 
 
 logger = logging.getLogger(__name__)
@@ -28,7 +28,7 @@ router = Router()
 router.message.filter(F.chat.type.in_({'private'}))
 
 
-@router.message(Command('adminhelp'), MessageFilter(role=UserRole.ADMIN))
+@router.message(MessageRoute(commands=('adminhelp',), role=UserRole.ADMIN))
 @handle_errors
 async def admin_help(message: Message, user_data: UserData) -> None:
     """Send a list of admin commands for different roles."""
@@ -38,7 +38,7 @@ async def admin_help(message: Message, user_data: UserData) -> None:
         await message.answer(txts.ADMIN_HELP[0], parse_mode=txts.ADMIN_HELP[1])
 
 
-@router.message(Command('adminlist'), MessageFilter(role=UserRole.ADMIN))
+@router.message(MessageRoute(commands=('adminlist',), role=UserRole.ADMIN))
 @handle_errors
 async def admin_list(message: Message, user_data: UserData) -> None:
     """Send a list of current admins."""
@@ -53,7 +53,7 @@ async def admin_list(message: Message, user_data: UserData) -> None:
             await message.answer(text, parse_mode=parse_mode)
 
 
-@router.message(Command('addadmin'), MessageFilter(role=UserRole.SUPERADMIN))
+@router.message(MessageRoute(commands=('addadmin',), role=UserRole.SUPERADMIN))
 @handle_errors
 async def cmd_addadmin(message: Message, user_data: UserData) -> None:
     """Send two choices for adding: admin or superadmin."""
@@ -67,17 +67,17 @@ async def cmd_addadmin(message: Message, user_data: UserData) -> None:
                             parse_mode=txts.CHOOSE_ROLE[1])
 
 
-@router.callback_query(F.data.startswith('choose_role_'), CallbackFilter(role=UserRole.SUPERADMIN))
+@router.callback_query(CallbackRoute(CallbackAction.CHOOSE_ROLE, role=UserRole.SUPERADMIN))
 @handle_errors
-async def create_new_invite(callback: CallbackQuery, user_data: UserData) -> None:
+async def create_new_invite(callback: CallbackQuery, callback_data: CallbackData, user_data: UserData) -> None:
     """Send a new admin/superadmin invitation code."""
-    if not callback.message or not callback.data or not callback.from_user:
+    if not callback.message or not callback.from_user:
         logger.warning('Callback missing required attributes in new_invite')
         return
-    if len(callback.data.split('_')) < cnst.CHOOSE_ROLE:
-        logger.error('Invalid callback data format in new_invite: %s', callback.data)
+    role_type = callback_data.value
+    if role_type not in ('admin', 'superadmin'):
+        logger.error('Invalid role in new_invite callback data: %s', role_type)
         return
-    role_type = callback.data.split('_')[2]
     match role_type:
         case 'admin':
             role = UserRole.ADMIN
@@ -95,10 +95,9 @@ async def create_new_invite(callback: CallbackQuery, user_data: UserData) -> Non
     invite_code = await invite_manager.generate_invite(creator=creator_data, role=role)
     text, parse_mode = text_manager.get('ADMIN', 'CALLBACK_INVITE', role=role_str, code=invite_code)
     await callback.message.answer(text=text, parse_mode=parse_mode)
-    await callback.answer()
 
 
-@router.message(F.text.startswith('AD_'))
+@router.message(PrefixRoute('AD_'))
 @handle_errors
 async def enter_invite(message: Message, user_data: UserData) -> None:
     """Use code and add admin."""
@@ -121,11 +120,10 @@ async def enter_invite(message: Message, user_data: UserData) -> None:
         text, parse_mode = text_manager.get('ADMIN', 'SUCCESS_ADMIN_ADDED', role=role_str)
         await message.answer(text=text, reply_markup=kb.main, parse_mode=parse_mode)
     except NotFoundError:
-        attempts, _ = code_entry_cache.get_attempts(message.from_user.id)
-        text, parse_mode = text_manager.get('ADMIN', 'CALLBACK_CODE_INVALID',
-                                        number=cnst.MAX_ATTEMPTS - attempts)
+        attempts_left = code_entry_cache.attempts_left(message.from_user.id)
+        text, parse_mode = text_manager.get('ADMIN', 'CALLBACK_CODE_INVALID', number=attempts_left)
         await message.answer(text, parse_mode)
-        if cnst.MAX_ATTEMPTS - attempts == 0:
+        if attempts_left == 0:
             text, parse_mode = text_manager.get('ADMIN', 'TOO_MANY_ATTEMPTS', block_time=cnst.BLOCK_TIME)
             await message.answer(text, parse_mode)
         return
@@ -148,21 +146,120 @@ async def _admin_invite_error_parser(err: str, message: Message) -> None:
         case 'already_admin':
             await message.answer(txts.CALLBACK_INVITE_ALREADY_ADMIN[0],
                 parse_mode=txts.CALLBACK_INVITE_ALREADY_ADMIN[1])
+        case 'expired':
+            await message.answer(txts.CALLBACK_INVITE_EXPIRED[0], parse_mode=txts.CALLBACK_INVITE_EXPIRED[1])
 
 
-@router.message(Command('metrics'), MessageFilter(role=UserRole.OWNER))
+@router.message(MessageRoute(commands=('geninvites',), role=UserRole.OWNER))
+@handle_errors
+async def generate_invites(message: Message, command: CommandObject, user_data: UserData) -> None:
+    """Send a batch of invitation codes created with one insert."""
+    if not message.from_user:
+        logger.warning('Message missing required attributes in generate_invites')
+        return
+    args = (command.args or '').split()
+    count = int(args[0]) if args and args[0].isdigit() else 0
+    role_type = args[1] if len(args) > 1 else 'admin'
+    roles = {
+        'admin': (UserRole.ADMIN, txts.ROLE_ADMIN[0]),
+        'superadmin': (UserRole.SUPERADMIN, txts.ROLE_SUPERADMIN[0]),
+    }
+    if not 0 < count <= cnst.MAX_BATCH_INVITES or role_type not in roles:
+        text, parse_mode = text_manager.get('ADMIN', 'BATCH_INVITES_USAGE', max_count=cnst.MAX_BATCH_INVITES)
+        await message.answer(text, parse_mode=parse_mode)
+        return
+    role, role_str = roles[role_type]
+    creator_data: dict[str, int | str | None] = {
+        'user_id': message.from_user.id,
+        'first_name': message.from_user.first_name,
+        'last_name': message.from_user.last_name or None,
+        'username': message.from_user.username or None,
+    }
+    codes = await InviteManager().generate_invites(creator=creator_data, role=role, count=count)
+    text, parse_mode = text_manager.get('ADMIN', 'BATCH_INVITES', role=role_str, hours=cnst.INVITE_TTL // 3600,
+                                        codes='\n'.join(f'<code>{code}</code>' for code in codes))
+    await message.answer(text, parse_mode=parse_mode)
+
+
+@router.message(MessageRoute(commands=('traces',), role=UserRole.OWNER))
+@handle_errors
+async def slowest_updates(message: Message, user_data: UserData) -> None:
+    """Send the slowest recent updates with their span breakdown, split to fit the message length limit."""
+    traces = trace_store.slowest()
+    if not traces:
+        await message.answer(txts.NO_TRACES[0], parse_mode=txts.NO_TRACES[1])
+        return
+    blocks = []
+    for trace in traces:
+        spans = '\n'.join(f'  {name}: {total * 1000:.1f} ms x{int(count)}'
+                          for name, (count, total) in sorted(trace.spans.items(), key=lambda item: -item[1][1]))
+        blocks.append(f'<pre>#{trace.update_id} {trace.event_type} {trace.duration * 1000:.1f} ms '
+                      f'{trace.started_at:%H:%M:%S}\n{spans}</pre>')
+    header, parse_mode = text_manager.get('ADMIN', 'SLOWEST_UPDATES', traces='')
+    pages: list[list[str]] = [[]]
+    size = len(header)
+    for block in blocks:
+        if pages[-1] and size + len(block) + 1 > cnst.MESSAGE_MAX_LENGTH:
+            pages.append([])
+            size = 0
+        pages[-1].append(block)
+        size += len(block) + 1
+    text, parse_mode = text_manager.get('ADMIN', 'SLOWEST_UPDATES', traces='\n'.join(pages[0]))
+    await message.answer(text, parse_mode=parse_mode)
+    for page in pages[1:]:
+        await message.answer('\n'.join(page), parse_mode=parse_mode)
+
+
+@router.message(MessageRoute(commands=('profile',), role=UserRole.OWNER))
+@handle_errors
+async def profile_bot(message: Message, command: CommandObject, user_data: UserData) -> None:
+    """Profile the running event loop and send collapsed stacks and top functions."""
+    args = (command.args or '').strip()
+    seconds = int(args) if args.isdigit() and int(args) > 0 else cnst.PROFILE_DEFAULT_SECONDS
+    seconds = min(seconds, cnst.PROFILE_MAX_SECONDS)
+    if is_profiling():
+        await message.answer(txts.PROFILE_BUSY[0], parse_mode=txts.PROFILE_BUSY[1])
+        return
+    text, parse_mode = text_manager.get('ADMIN', 'PROFILE_STARTED', seconds=seconds)
+    await message.answer(text, parse_mode=parse_mode)
+    stacks, summary = await profile_event_loop(seconds)
+    await message.reply_document(document=BufferedInputFile(stacks.encode(), filename='profile.collapsed'),
+                                 caption='Collapsed stacks (flamegraph.pl, speedscope)')
+    await message.reply_document(document=BufferedInputFile(summary.encode(), filename='profile_top.txt'),
+                                 caption='Top functions by cumulative time')
+
+
+@router.message(MessageRoute(commands=('heap',), role=UserRole.OWNER))
+@handle_errors
+async def heap_growth(message: Message, command: CommandObject, user_data: UserData) -> None:
+    """Start heap tracking or send allocation growth since the previous report."""
+    if (command.args or '').strip() == 'stop':
+        heap_tracker.stop()
+        await message.answer(txts.HEAP_STOPPED[0], parse_mode=txts.HEAP_STOPPED[1])
+        return
+    if not heap_tracker.active:
+        heap_tracker.start()
+        await message.answer(txts.HEAP_STARTED[0], parse_mode=txts.HEAP_STARTED[1])
+        return
+    report = await heap_tracker.report('command')
+    await message.reply_document(document=BufferedInputFile(report.encode(), filename='heap_growth.txt'),
+                                 caption='Allocation growth since previous /heap')
+
+
+@router.message(MessageRoute(commands=('perf',), role=UserRole.OWNER))
+@handle_errors
+async def perf_dashboard(message: Message, user_data: UserData) -> None:
+    """Send handler latency percentiles, cache hit ratios and DB pool usage."""
+    text, parse_mode = text_manager.get('ADMIN', 'PERF_REPORT', window=cnst.PERF_WINDOW_SIZE, report=perf_report())
+    await message.answer(text, parse_mode=parse_mode)
+
+
+@router.message(MessageRoute(commands=('metrics',), role=UserRole.OWNER))
 @handle_errors
 async def handle_metrics_command(message: Message, user_data: UserData) -> None:
     """Send metrics in a txt format via telegram."""
     try:
-        metrics_text = get_metrics()
-        with NamedTemporaryFile(mode='w', encoding=locale.getpreferredencoding(do_setlocale=False), suffix='.txt',
-                                delete=False) as temp_file:
-            temp_file.write(metrics_text)
-            temp_file_path = temp_file.name
-        await message.reply_document(document=FSInputFile(temp_file_path), caption='Current metrics')
-        Path(temp_file_path).unlink()
-    except OSError:
-        logger.exception('Error while deleting metrics tempfile')
+        document = BufferedInputFile(get_metrics().encode(), filename='metrics.txt')
+        await message.reply_document(document=document, caption='Current metrics')
     except Exception as e:
         await message.answer(f'Error getting metrics: {e!s}')
@@ -5,10 +5,11 @@ from aiogram.types import CallbackQuery
 
 import app.const_texts as txts
 from app.cache.user_cache import UserData
+from app.callback_data import CallbackAction
 from app.database.models.enums import UserRole
 from app.database.models.user_states import UserState
-from app.filters import CallbackFilter
-from app.helpers import handle_errors
+from app.filters import CallbackRoute
+from app.helpers import edit_menu, handle_errors
 from app.services.user_manager import update_user_state
 
 
@@ -17,15 +18,13 @@ router = Router()
 router.message.filter(F.chat.type.in_({'private'}))
 
 
-@router.callback_query(F.data.startswith('cancel'), CallbackFilter(role=UserRole.ADMIN))
+@router.callback_query(CallbackRoute(CallbackAction.CANCEL, role=UserRole.ADMIN))
 @handle_errors
 async def cancel(callback: CallbackQuery, user_data: UserData) -> None:
     """Cancel any database related procedures."""
-    if not callback.message or not callback.bot or not callback.from_user:
+    if not callback.message or not callback.from_user:
         logger.warning('Callback missing required attributes in cancel')
         return
 
     await update_user_state(callback.from_user.id, UserState.DEFAULT)
-    await callback.message.answer(txts.CANCEL[0], txts.CANCEL[1])
-    await callback.bot.delete_message(callback.from_user.id, callback.message.message_id)
-    await callback.answer()
+    await edit_menu(callback, None, text=txts.CANCEL[0], parse_mode=txts.CANCEL[1])
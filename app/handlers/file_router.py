@@ -3,18 +3,20 @@ import secrets
 import string
 
 from aiogram import F, Router
-from aiogram.filters import Command
 from aiogram.types import CallbackQuery, Message
+from sqlalchemy.exc import IntegrityError
 
 import app.const_texts as txts
 import app.keyboards as kb
 from app.cache.user_cache import UserData
+from app.callback_data import CallbackAction, CallbackData
 from app.database.models import File
 from app.database.models.enums import UploadState, UserRole
 from app.database.models.user_states import UserState
 from app.database.uow import UnitOfWork
-from app.filters import CallbackFilter, MessageFilter
-from app.helpers import handle_errors
+from app.filters import CallbackRoute, MessageRoute
+from app.helpers import answer_entry_link, edit_menu, handle_errors
+from app.services.notifier import notifier
 from app.services.user_manager import update_user_state
 
 
@@ -23,45 +25,52 @@ logger = logging.getLogger(__name__)
 router = Router()
 router.message.filter(F.chat.type.in_({'private'}))
 
-category_map = {
-    'booklets': txts.FILE_BOOKLETS,
-    'books': txts.FILE_BOOKS,
-    'formats': txts.FILE_FORMATS,
-    'extras': txts.FILE_EXTRAS,
-    'schedule': txts.FILE_SCHEDULE,
-    'pics': txts.FILE_BOT_PICS,
-}
 
-
-@router.callback_query(F.data.startswith('public_file_'))
+@router.callback_query(CallbackRoute(CallbackAction.FILE_CATEGORY))
 @handle_errors
-async def view_file_cat(callback: CallbackQuery, user_data: UserData) -> None:
+async def view_file_cat(callback: CallbackQuery, callback_data: CallbackData, user_data: UserData) -> None:
     """Send a list of entries of chosen file category."""
-    if not callback.data or not callback.message or not callback.from_user:
+    if not callback.message or not callback.from_user:
         logger.warning('Callback missing required attributes in view_file_cat')
         return
-    sure_name = callback.data.split('_')[2]
-    category = category_map.get(sure_name, '')
-    await callback.message.answer(f'{category}:', reply_markup=await kb.files_by_cat(category))
-    await callback.answer()
+    sure_name = callback_data.value
+    category = txts.FILE_CATEGORIES.get(sure_name, '')
+    await edit_menu(callback, await kb.files_by_cat(sure_name), text=f'{category}:')
 
 
-@router.callback_query(F.data.startswith('file_'))
+@router.callback_query(CallbackRoute(CallbackAction.FILE_MENU))
 @handle_errors
-async def view_file(callback: CallbackQuery, user_data: UserData) -> None:
+async def view_file_categories(callback: CallbackQuery, user_data: UserData) -> None:
+    """Return to the list of file categories in the same message."""
+    await edit_menu(callback, kb.public_file_categories, text=txts.CMD_FILE_CATEGORIES[0],
+                    parse_mode=txts.CMD_FILE_CATEGORIES[1])
+
+
+@router.callback_query(CallbackRoute(CallbackAction.PAGE_FILES))
+@handle_errors
+async def page_file_cat(callback: CallbackQuery, callback_data: CallbackData, user_data: UserData) -> None:
+    """Show another page of files of a category in the same message."""
+    if not callback.message:
+        logger.warning('Callback missing required attributes in page_file_cat')
+        return
+    await edit_menu(callback, await kb.files_by_cat(callback_data.value, callback_data.entity_id))
+
+
+@router.callback_query(CallbackRoute(CallbackAction.FILE))
+@handle_errors
+async def view_file(callback: CallbackQuery, callback_data: CallbackData, user_data: UserData) -> None:
     """Send a chosen file."""
-    if not callback.data or not callback.message or not callback.from_user:
+    if not callback.message or not callback.from_user:
         logger.warning('Callback missing required attributes in view_file')
         return
-    file_id = int(callback.data.split('_')[1])
+    file_id = callback_data.entity_id
     async with UnitOfWork(auto_commit=False) as uow:
-        file = await uow.files.get_by_id(file_id)
+        file = await uow.files.get_by_filter(filters={'id': file_id, 'status': UploadState.UPLOADED})
     if file:
         await callback.message.answer_document(file.tg_id)
-    await callback.answer()
 
 
-@router.message(Command('delfile'), MessageFilter(role=UserRole.SUPERADMIN))
+@router.message(MessageRoute(commands=('delfile',), role=UserRole.SUPERADMIN))
 @handle_errors
 async def del_file(message: Message, user_data: UserData) -> None:
     """Send a list of categories for deleting files."""
@@ -73,39 +82,50 @@ async def del_file(message: Message, user_data: UserData) -> None:
                         reply_markup=kb.del_file_categories_value)
 
 
-@router.callback_query(CallbackFilter(role=UserRole.SUPERADMIN, state=UserState.DELETE_FILE_CAT))
+@router.callback_query(CallbackRoute(CallbackAction.DELETE_FILE_CATEGORY,
+                                     role=UserRole.SUPERADMIN, state=UserState.DELETE_FILE_CAT))
 @handle_errors
-async def del_file_cat(callback: CallbackQuery, user_data: UserData) -> None:
+async def del_file_cat(callback: CallbackQuery, callback_data: CallbackData, user_data: UserData) -> None:
     """Send a list of files of chosen category to delete one."""
-    if not callback.data or not callback.from_user or not callback.message:
+    if not callback.from_user or not callback.message:
         logger.warning('Callback missing required attributes in del_file_cat')
         return
-    sure_name = callback.data.split('_')[3]
-    category = category_map.get(sure_name, '')
+    sure_name = callback_data.value
     await update_user_state(callback.from_user.id, UserState.DELETE_FILE_MES)
-    await callback.message.answer(txts.CHOOSE_MESSAGE[0], txts.CHOOSE_MESSAGE[1],
-        reply_markup=await kb.delete_file_entry_value(category))
-    await callback.answer()
+    await edit_menu(callback, await kb.delete_file_entry_value(sure_name), text=txts.CHOOSE_MESSAGE[0],
+                    parse_mode=txts.CHOOSE_MESSAGE[1])
+
+
+@router.callback_query(CallbackRoute(CallbackAction.PAGE_DELETE_FILES,
+                                     role=UserRole.SUPERADMIN, state=UserState.DELETE_FILE_MES))
+@handle_errors
+async def page_del_file_cat(callback: CallbackQuery, callback_data: CallbackData, user_data: UserData) -> None:
+    """Show another page of files to delete in the same message."""
+    if not callback.message:
+        logger.warning('Callback missing required attributes in page_del_file_cat')
+        return
+    await edit_menu(callback, await kb.delete_file_entry_value(callback_data.value, callback_data.entity_id))
 
 
-@router.callback_query(CallbackFilter(role=UserRole.SUPERADMIN, state=UserState.DELETE_FILE_MES))
+@router.callback_query(CallbackRoute(CallbackAction.DELETE_FILE,
+                                     role=UserRole.SUPERADMIN, state=UserState.DELETE_FILE_MES))
 @handle_errors
-async def delete_file_mes(callback: CallbackQuery, user_data: UserData) -> None:
+async def delete_file_mes(callback: CallbackQuery, callback_data: CallbackData, user_data: UserData) -> None:
     """Delete a chosen a file."""
-    if not callback.data or not callback.from_user or not callback.message:
+    if not callback.from_user or not callback.message:
         logger.warning('Callback missing required attributes in delete_file_mes')
         return
-    mes_id = int(callback.data.split('_')[3])
+    mes_id = callback_data.entity_id
     async with UnitOfWork(auto_commit=True) as uow:
-        mes = await uow.files.get_by_id(mes_id)
-        if mes:
-            await uow.files.delete(mes)
+        # releasing file_unique_id lets the same file be uploaded again before garbage collection runs
+        await uow.files.update_fields(filters={'id': mes_id},
+                                      update_values={'status': UploadState.DELETED, 'file_unique_id': None})
+    kb.invalidate_catalog()
     await update_user_state(callback.from_user.id, UserState.DEFAULT)
-    await callback.message.answer(txts.ENTRY_DELETED[0], txts.ENTRY_DELETED[1])
-    await callback.answer()
+    await edit_menu(callback, None, text=txts.ENTRY_DELETED[0], parse_mode=txts.ENTRY_DELETED[1])
 
 
-@router.message(Command('addfile'), MessageFilter(role=UserRole.SUPERADMIN))
+@router.message(MessageRoute(commands=('addfile',), role=UserRole.SUPERADMIN))
 @handle_errors
 async def cmd_add_file(message: Message, user_data: UserData) -> None:
     """Send a list of categories for adding files."""
@@ -116,16 +136,16 @@ async def cmd_add_file(message: Message, user_data: UserData) -> None:
                             reply_markup=kb.add_file_categories)
 
 
-@router.callback_query(F.data.startswith('add_file_'), CallbackFilter(role=UserRole.SUPERADMIN))
+@router.callback_query(CallbackRoute(CallbackAction.ADD_FILE, role=UserRole.SUPERADMIN))
 @handle_errors
-async def addfile_cat(callback: CallbackQuery, user_data: UserData) -> None:
+async def addfile_cat(callback: CallbackQuery, callback_data: CallbackData, user_data: UserData) -> None:
     """Ask user to send a file or a picture after selecting category."""
-    if not callback.data or not callback.from_user or not callback.message:
+    if not callback.from_user or not callback.message:
         logger.warning('Callback missing required attributes in addfile_cat')
         return
-    sure_name = callback.data.split('_')[2]
+    sure_name = callback_data.value
     async with UnitOfWork(auto_commit=True) as uow:
-        file = await uow.files.add(File(category=category_map.get(sure_name), status=UploadState.UNFINISHED))
+        file = await uow.files.add(File(category=txts.FILE_CATEGORIES.get(sure_name), status=UploadState.UNFINISHED))
 
     if sure_name == 'pics':
         await update_user_state(callback.from_user.id, f'{UserState.PICS_UPLOAD}:{file.id}')
@@ -133,10 +153,9 @@ async def addfile_cat(callback: CallbackQuery, user_data: UserData) -> None:
     else:
         await update_user_state(callback.from_user.id, f'{UserState.FILE_UPLOAD}:{file.id}')
         await callback.message.answer(txts.ADD_FILE[0], txts.ADD_FILE[1])
-    await callback.answer()
 
 
-@router.message(MessageFilter(role=UserRole.SUPERADMIN, state=UserState.FILE_UPLOAD))
+@router.message(MessageRoute(role=UserRole.SUPERADMIN, state=UserState.FILE_UPLOAD))
 @handle_errors
 async def upload_document(message: Message, user_data: UserData) -> None:
     """Parse file upload and save an entry for File."""
@@ -146,41 +165,54 @@ async def upload_document(message: Message, user_data: UserData) -> None:
 
     file_id = int(user_data.state.split(':')[1])
 
-    async with UnitOfWork(auto_commit=True) as uow:
-        await uow.files.update_fields(
-            filters={'id': file_id},
-            update_values={
-                'tg_id': message.document.file_id,
-                'name': message.document.file_name,
-                'status': UploadState.UPLOADED,
-            },
-        )
+    file = await _save_upload(file_id, tg_id=message.document.file_id,
+                              file_unique_id=message.document.file_unique_id, name=message.document.file_name)
+    if file is None:
+        await message.answer(txts.ERR_FILE_EXISTS[0], txts.ERR_FILE_EXISTS[1], reply_markup=kb.cancel)
+        return
 
     await update_user_state(message.from_user.id, UserState.DEFAULT)
     await message.answer(txts.FILE_ADDED[0], txts.FILE_ADDED[1])
+    await answer_entry_link(message, CallbackAction.FILE, file_id)
+    notifier.publish(file.category, CallbackAction.FILE, file_id, file.name)
 
 
-@router.message(MessageFilter(role=UserRole.SUPERADMIN, state=UserState.PICS_UPLOAD))
+@router.message(MessageRoute(role=UserRole.SUPERADMIN, state=UserState.PICS_UPLOAD))
 @handle_errors
 async def upload_picture(message: Message, user_data: UserData) -> None:
     """Parse picture upload and save an entry for File."""
     if not message.from_user or not message.photo:
         logger.warning('Message missing required attributes in upload_picture')
         return
-    tg_id = message.photo[-1].file_id
+    photo = message.photo[-1]
     name = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(8))
 
     file_id = int(user_data.state.split(':')[1])
 
-    async with UnitOfWork(auto_commit=True) as uow:
-        await uow.files.update_fields(
-            filters={'id': file_id},
-            update_values={
-                'tg_id': tg_id,
-                'name': name,
-                'status': UploadState.UPLOADED,
-            },
-        )
+    picture = await _save_upload(file_id, tg_id=photo.file_id, file_unique_id=photo.file_unique_id, name=name)
+    if picture is None:
+        await message.answer(txts.ERR_FILE_EXISTS[0], txts.ERR_FILE_EXISTS[1], reply_markup=kb.cancel)
+        return
 
     await update_user_state(message.from_user.id, UserState.DEFAULT)
     await message.answer(txts.PIC_ADDED[0], txts.PIC_ADDED[1])
+
+
+async def _save_upload(file_id: int, *, tg_id: str, file_unique_id: str, name: str | None) -> File | None:
+    """Finish a File draft, return None if the same file is already stored."""
+    try:
+        async with UnitOfWork(auto_commit=True) as uow:
+            file = await uow.files.update_fields(
+                filters={'id': file_id},
+                update_values={
+                    'tg_id': tg_id,
+                    'file_unique_id': file_unique_id,
+                    'name': name,
+                    'status': UploadState.UPLOADED,
+                },
+            )
+    except IntegrityError:
+        logger.info('Duplicate upload rejected for file draft %s', file_id)
+        return None
+    kb.invalidate_catalog()
+    return file
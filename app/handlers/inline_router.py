@@ -0,0 +1,60 @@
+import logging
+
+from aiogram import Router
+from aiogram.types import (
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    InlineQuery,
+    InlineQueryResultArticle,
+    InlineQueryResultCachedDocument,
+    InlineQueryResultsButton,
+    InputTextMessageContent,
+)
+
+import app.const_texts as txts
+import app.constants as cnst
+from app.cache.catalog_index import CatalogEntry, catalog_index, deep_link_token
+from app.callback_data import CallbackAction
+from app.helpers import handle_errors
+
+
+logger = logging.getLogger(__name__)
+
+router = Router()
+
+
+@router.inline_query()
+@handle_errors
+async def inline_catalog(inline_query: InlineQuery) -> None:
+    """Answer inline query with matching files and vault messages from the in-memory index."""
+    if not inline_query.bot:
+        logger.warning('Inline query missing required attributes in inline_catalog')
+        return
+    entries = await catalog_index.lookup(inline_query.query)
+    offset = int(inline_query.offset) if inline_query.offset.isdigit() else 0
+    end = offset + cnst.INLINE_PAGE_SIZE
+    bot_user = await inline_query.bot.me()
+    bot_url = f'https://t.me/{bot_user.username}'
+    await inline_query.answer(
+        [_inline_result(entry, bot_url) for entry in entries[offset:end]],
+        cache_time=cnst.INLINE_CACHE_TIME,
+        is_personal=False,
+        next_offset=str(end) if len(entries) > end else '',
+        button=InlineQueryResultsButton(text=txts.KB_OPEN_BOT, start_parameter='inline'),
+    )
+
+
+def _inline_result(entry: CatalogEntry, bot_url: str) -> InlineQueryResultArticle | InlineQueryResultCachedDocument:
+    """Build inline result, files are sent by file id and vault messages as a deep link into the bot."""
+    result_id = f'{entry.action.value}{entry.entity_id}'
+    if entry.action == CallbackAction.FILE and entry.file_id:
+        return InlineQueryResultCachedDocument(id=result_id, title=entry.name, document_file_id=entry.file_id,
+                                               description=entry.description)
+    return InlineQueryResultArticle(
+        id=result_id,
+        title=entry.name,
+        description=entry.description,
+        input_message_content=InputTextMessageContent(message_text=entry.name),
+        reply_markup=InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(
+            text=txts.KB_OPEN_BOT, url=f'{bot_url}?start={deep_link_token(entry.action, entry.entity_id)}')]]),
+    )
@@ -1,19 +1,24 @@
+import html
 import logging
-import secrets
 
 from aiogram import F, Router
-from aiogram.filters import Command, CommandStart
-from aiogram.types import Message
+from aiogram.filters import CommandObject
+from aiogram.types import CallbackQuery, Message
 
 import app.const_texts as txts
 import app.constants as cnst
 import app.keyboards as kb
+from app.cache.catalog_index import CatalogEntry, catalog_index
+from app.cache.greeting_pictures import greeting_pictures
 from app.cache.user_cache import UserData
-from app.database.models.enums import UploadState, UserRole
-from app.database.models.user_states import UserState
+from app.callback_data import CallbackAction, CallbackData
+from app.database.models.enums import UploadState
 from app.database.uow import UnitOfWork
-from app.helpers import handle_errors
+from app.filters import CallbackRoute, MessageRoute
+from app.helpers import edit_menu, handle_errors
+from app.services.search import catalog_search
 from app.services.text_manager import text_manager
+from app.services.user_manager import refresh_profile
 
 
 logger = logging.getLogger(__name__)
@@ -22,52 +27,41 @@ router = Router()
 router.message.filter(F.chat.type.in_({'private'}))
 
 
-@router.message(F.text.lower() == txts.HELLO[0])
-@router.message(CommandStart())
+@router.message(MessageRoute(commands=('start',), texts=(txts.HELLO[0],)))
 @handle_errors
-async def cmd_start(message: Message, user_data: UserData) -> None:
-    """Handle the /start command, Send a greeting and a random image."""
+async def cmd_start(message: Message, user_data: UserData, command: CommandObject | None = None) -> None:
+    """Handle the /start command, Send a greeting and a random image or the entry of a deep link."""
     if not message.from_user:
         logger.warning('Message missing required attributes in cmd_start')
         return
-    async with UnitOfWork(auto_commit=True) as uow:
-        files = await uow.files.find(filters={'category': txts.FILE_BOT_PICS, 'status': UploadState.UPLOADED})
-        await uow.users.upsert(
-            conflict_columns=['user_id'],
-            insert_values={
-                'user_id': message.from_user.id,
-                'first_name': message.from_user.first_name,
-                'last_name': message.from_user.last_name or None,
-                'username': message.from_user.username or None,
-                'state': UserState.DEFAULT,
-                'role': UserRole.DEFAULT,
-            },
-            update_values={
-                'user_id': message.from_user.id,
-                'first_name': message.from_user.first_name,
-                'last_name': message.from_user.last_name or None,
-                'username': message.from_user.username or None,
-                'state': UserState.DEFAULT,
-            },
-        )
-    if files:
-        file = secrets.choice(files)
-        await message.answer_photo(file.tg_id)
+    if command and command.args and (entry := await catalog_index.resolve(command.args)):
+        await _send_entry(message, entry)
+        return
+    await refresh_profile(user_data, message.from_user.id, message.from_user.first_name,
+                          message.from_user.last_name, message.from_user.username)
+    if picture := await greeting_pictures.choice():
+        await message.answer_photo(picture)
 
     text, parse_mode = text_manager.get('PUBLIC_COMMANDS', 'START', first_name=message.from_user.first_name)
     await message.answer(text, reply_markup=kb.main, parse_mode=parse_mode)
 
 
-@router.message(F.text.lower() == txts.CMD_HELP_KB[0].lower())
-@router.message(Command('help'))
+async def _send_entry(message: Message, entry: CatalogEntry) -> None:
+    """Send a file by its file id or copy a vault message."""
+    if entry.file_id:
+        await message.answer_document(entry.file_id)
+    elif message.bot and entry.chat_id and entry.message_id:
+        await message.bot.copy_message(message.chat.id, entry.chat_id, entry.message_id)
+
+
+@router.message(MessageRoute(commands=('help',), texts=(txts.CMD_HELP_KB[0],)))
 @handle_errors
 async def cmd_help(message: Message, user_data: UserData) -> None:
     """Send a list of available bot commands."""
     await message.answer(txts.CMD_HELP[0], txts.CMD_HELP[1])
 
 
-@router.message(F.text.lower() == txts.CMD_FILES[0].lower())
-@router.message(Command('files'))
+@router.message(MessageRoute(commands=('files',), texts=(txts.CMD_FILES[0],)))
 @handle_errors
 async def cmd_files(message: Message, user_data: UserData) -> None:
     """Send a list of categories of available files."""
@@ -75,43 +69,39 @@ async def cmd_files(message: Message, user_data: UserData) -> None:
                         reply_markup=kb.public_file_categories)
 
 
-@router.message(F.text.lower() == txts.CMD_SPEAKERS[0].lower())
-@router.message(Command('speakers'))
+@router.message(MessageRoute(commands=('speakers',), texts=(txts.CMD_SPEAKERS[0],)))
 @handle_errors
 async def cmd_speakers(message: Message, user_data: UserData) -> None:
     """Send a list of upcoming speaker meetings."""
     await message.answer(txts.CMD_UPCOMING_SPEAKERS[0], txts.CMD_UPCOMING_SPEAKERS[1],
-                        reply_markup=await kb.temp_by_cat(txts.TEMP_SPEAKERS))
+                        reply_markup=await kb.temp_by_cat('speakers'))
 
 
-@router.message(F.text.lower() == txts.CMD_SESSIONS[0].lower())
-@router.message(Command('sessions'))
+@router.message(MessageRoute(commands=('sessions',), texts=(txts.CMD_SESSIONS[0],)))
 @handle_errors
 async def cmd_sessions(message: Message, user_data: UserData) -> None:
     """Send a list of upcoming sessions."""
     await message.answer(txts.CMD_UPCOMING_SESSIONS[0], txts.CMD_UPCOMING_SESSIONS[1],
-                        reply_markup=await kb.temp_by_cat(txts.TEMP_SESSIONS))
+                        reply_markup=await kb.temp_by_cat('sessions'))
 
 
-@router.message(F.text.lower() == txts.CMD_UPCOMING_EVENTS[0].lower())
-@router.message(Command('events'))
+@router.message(MessageRoute(commands=('events',), texts=(txts.CMD_UPCOMING_EVENTS[0],)))
 @handle_errors
 async def cmd_events(message: Message, user_data: UserData) -> None:
     """Send a list of upcoming events which differ from previous categories."""
     await message.answer(txts.CMD_UPCOMING_EVENTS[0], txts.CMD_UPCOMING_EVENTS[1],
-                        reply_markup=await kb.temp_by_cat(txts.TEMP_EVENTS))
+                        reply_markup=await kb.temp_by_cat('events'))
 
 
-@router.message(F.text.lower() == txts.CMD_OTHER_ITEMS[0].lower())
-@router.message(Command('misc'))
+@router.message(MessageRoute(commands=('misc',), texts=(txts.CMD_OTHER_ITEMS[0],)))
 @handle_errors
 async def cmd_misc(message: Message, user_data: UserData) -> None:
     """Send a list of other materials which differ from previous categories."""
     await message.answer(txts.CMD_OTHER_ITEMS[0], txts.CMD_OTHER_ITEMS[1],
-                        reply_markup=await kb.temp_by_cat(txts.TEMP_MISC))
+                        reply_markup=await kb.temp_by_cat('misc'))
 
 
-@router.message(Command('contacts'))
+@router.message(MessageRoute(commands=('contacts',)))
 @handle_errors
 async def cmd_contacts(message: Message, user_data: UserData) -> None:
     """Send contact information."""
@@ -124,8 +114,7 @@ async def cmd_contacts(message: Message, user_data: UserData) -> None:
         await message.bot.copy_message(message.chat.id, cnst.MSG_VAULT, mes.message_id)
 
 
-@router.message(F.text.lower() == txts.CMD_LINKS[0].lower())
-@router.message(Command('links'))
+@router.message(MessageRoute(commands=('links',), texts=(txts.CMD_LINKS[0],)))
 @handle_errors
 async def cmd_links(message: Message, user_data: UserData) -> None:
     """Send useful links."""
@@ -138,8 +127,7 @@ async def cmd_links(message: Message, user_data: UserData) -> None:
             await message.bot.copy_message(message.chat.id, cnst.MSG_VAULT, mes.message_id)
 
 
-@router.message(F.text.lower() == txts.CMD_NEWCOMER[0].lower())
-@router.message(Command('newcomer'))
+@router.message(MessageRoute(commands=('newcomer',), texts=(txts.CMD_NEWCOMER[0],)))
 @handle_errors
 async def cmd_newcomer(message: Message, user_data: UserData) -> None:
     """Send information for newcomers."""
@@ -150,3 +138,59 @@ async def cmd_newcomer(message: Message, user_data: UserData) -> None:
         all_messages = await uow.const.find(filters={'category': txts.CONST_NEWCOMER, 'status': UploadState.UPLOADED})
     for mes in all_messages:
         await message.bot.copy_message(message.chat.id, cnst.MSG_VAULT, mes.message_id)
+
+
+@router.message(MessageRoute(commands=('search',)))
+@handle_errors
+async def cmd_search(message: Message, command: CommandObject, user_data: UserData) -> None:
+    """Send catalog entries with names matching the query, best matches first."""
+    query = catalog_search.normalize(command.args or '')
+    if not query:
+        await message.answer(txts.CMD_SEARCH_USAGE[0], txts.CMD_SEARCH_USAGE[1])
+        return
+    hits = await catalog_search.search(query)
+    if not hits:
+        await message.answer(txts.CMD_SEARCH_EMPTY[0], txts.CMD_SEARCH_EMPTY[1])
+        return
+    text, parse_mode = text_manager.get('PUBLIC_COMMANDS', 'SEARCH_RESULTS', query=html.escape(query))
+    await message.answer(text, parse_mode=parse_mode,
+                         reply_markup=kb.search_results(catalog_search.token(query), hits))
+
+
+@router.callback_query(CallbackRoute(CallbackAction.SEARCH_PAGE))
+@handle_errors
+async def page_search(callback: CallbackQuery, callback_data: CallbackData, user_data: UserData) -> None:
+    """Show another page of search results in the same message."""
+    query = catalog_search.query_by_token(callback_data.value)
+    if query is None:
+        await edit_menu(callback, None, text=txts.CMD_SEARCH_EXPIRED[0], parse_mode=txts.CMD_SEARCH_EXPIRED[1])
+        return
+    hits = await catalog_search.search(query)
+    await edit_menu(callback, kb.search_results(callback_data.value, hits, callback_data.entity_id))
+
+
+@router.message(MessageRoute(commands=('subscribe',)))
+@handle_errors
+async def cmd_subscribe(message: Message, user_data: UserData) -> None:
+    """Send category toggles for notifications about new entries."""
+    if not message.from_user:
+        logger.warning('Message missing required attributes in cmd_subscribe')
+        return
+    async with UnitOfWork(auto_commit=False) as uow:
+        subscribed = await uow.subscriptions.categories_of(message.from_user.id)
+    await message.answer(txts.CMD_SUBSCRIPTIONS[0], txts.CMD_SUBSCRIPTIONS[1],
+                         reply_markup=kb.subscriptions(subscribed))
+
+
+@router.callback_query(CallbackRoute(CallbackAction.SUBSCRIBE))
+@handle_errors
+async def toggle_subscription(callback: CallbackQuery, callback_data: CallbackData, user_data: UserData) -> None:
+    """Subscribe to the chosen category or unsubscribe from it and refresh the toggles."""
+    category = txts.SUBSCRIPTION_CATEGORIES.get(callback_data.value)
+    if not category:
+        logger.warning('Unknown subscription category %s', callback_data.value)
+        return
+    async with UnitOfWork(auto_commit=True) as uow:
+        await uow.subscriptions.toggle(callback.from_user.id, category)
+        subscribed = await uow.subscriptions.categories_of(callback.from_user.id)
+    await edit_menu(callback, kb.subscriptions(subscribed))
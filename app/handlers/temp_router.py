@@ -1,19 +1,20 @@
 import logging
 
 from aiogram import F, Router
-from aiogram.filters import Command
 from aiogram.types import CallbackQuery, Message
 
 import app.const_texts as txts
 import app.constants as cnst
 import app.keyboards as kb
 from app.cache.user_cache import UserData
+from app.callback_data import CallbackAction, CallbackData
 from app.database.models import TemporaryMessage
 from app.database.models.enums import UploadState, UserRole
 from app.database.models.user_states import UserState
 from app.database.uow import UnitOfWork
-from app.filters import CallbackFilter, MessageFilter
-from app.helpers import handle_errors
+from app.filters import CallbackRoute, MessageRoute
+from app.helpers import answer_entry_link, edit_menu, handle_errors
+from app.services.notifier import notifier
 from app.services.user_manager import update_user_state
 
 
@@ -22,27 +23,31 @@ logger = logging.getLogger(__name__)
 router = Router()
 router.message.filter(F.chat.type.in_({'private'}))
 
-category_map = {
-    'speakers': txts.TEMP_SPEAKERS,
-    'sessions': txts.TEMP_SESSIONS,
-}
 
-
-@router.callback_query(F.data.startswith('temp_mes_'))
-async def view_temp(callback: CallbackQuery) -> None:
+@router.callback_query(CallbackRoute(CallbackAction.TEMP))
+async def view_temp(callback: CallbackQuery, callback_data: CallbackData) -> None:
     """Send the chosen temp message."""
-    if not callback.data or not callback.bot or not callback.message:
+    if not callback.bot or not callback.message:
         logger.warning('Callback missing required attributes in view_temp')
         return
-    mes_id = int(callback.data.split('_')[2])
+    mes_id = callback_data.entity_id
     async with UnitOfWork(auto_commit=False) as uow:
-        mes = await uow.temp.get_by_id(mes_id)
+        mes = await uow.temp.get_by_filter(filters={'id': mes_id, 'status': UploadState.UPLOADED})
     if mes:
         await callback.bot.copy_message(callback.message.chat.id, mes.chat_id, mes.message_id)
-    await callback.answer()
 
 
-@router.message(Command('deltemp'), MessageFilter(role=UserRole.ADMIN))
+@router.callback_query(CallbackRoute(CallbackAction.PAGE_TEMP))
+@handle_errors
+async def page_temp_cat(callback: CallbackQuery, callback_data: CallbackData) -> None:
+    """Show another page of temp messages of a category in the same message."""
+    if not callback.message:
+        logger.warning('Callback missing required attributes in page_temp_cat')
+        return
+    await edit_menu(callback, await kb.temp_by_cat(callback_data.value, callback_data.entity_id))
+
+
+@router.message(MessageRoute(commands=('deltemp',), role=UserRole.ADMIN))
 @handle_errors
 async def del_temp(message: Message, user_data: UserData) -> None:
     """Send a list of categories for deleting temporary messages."""
@@ -54,39 +59,48 @@ async def del_temp(message: Message, user_data: UserData) -> None:
                         reply_markup=kb.del_temp_categories_value)
 
 
-@router.callback_query(CallbackFilter(role=UserRole.ADMIN, state=UserState.DELETE_TEMP_CAT))
+@router.callback_query(CallbackRoute(CallbackAction.DELETE_TEMP_CATEGORY,
+                                     role=UserRole.ADMIN, state=UserState.DELETE_TEMP_CAT))
 @handle_errors
-async def del_temp_cat(callback: CallbackQuery, user_data: UserData) -> None:
+async def del_temp_cat(callback: CallbackQuery, callback_data: CallbackData, user_data: UserData) -> None:
     """Send a list of temp messages of chosen category for deleting."""
-    if not callback.data or not callback.message:
+    if not callback.message:
         logger.warning('Callback missing required attributes in del_temp_cat')
         return
-    sure_name = callback.data.split('_')[3]
-    category = category_map.get(sure_name, '')
+    sure_name = callback_data.value
     await update_user_state(callback.from_user.id, UserState.DELETE_TEMP_MES)
-    await callback.message.answer(txts.CHOOSE_MESSAGE[0], txts.CHOOSE_MESSAGE[1],
-        reply_markup=await kb.delete_temp_entry_value(callback.from_user.id, category))
-    await callback.answer()
+    await edit_menu(callback, await kb.delete_temp_entry_value(callback.from_user.id, sure_name),
+                    text=txts.CHOOSE_MESSAGE[0], parse_mode=txts.CHOOSE_MESSAGE[1])
+
+
+@router.callback_query(CallbackRoute(CallbackAction.PAGE_DELETE_TEMP,
+                                     role=UserRole.ADMIN, state=UserState.DELETE_TEMP_MES))
+@handle_errors
+async def page_del_temp_cat(callback: CallbackQuery, callback_data: CallbackData, user_data: UserData) -> None:
+    """Show another page of temp messages to delete in the same message."""
+    if not callback.message:
+        logger.warning('Callback missing required attributes in page_del_temp_cat')
+        return
+    await edit_menu(callback, await kb.delete_temp_entry_value(callback.from_user.id, callback_data.value,
+                                                               callback_data.entity_id))
 
 
-@router.callback_query(CallbackFilter(role=UserRole.ADMIN, state=UserState.DELETE_TEMP_MES))
+@router.callback_query(CallbackRoute(CallbackAction.DELETE_TEMP, role=UserRole.ADMIN, state=UserState.DELETE_TEMP_MES))
 @handle_errors
-async def delete_temp_mes(callback: CallbackQuery, user_data: UserData) -> None:
+async def delete_temp_mes(callback: CallbackQuery, callback_data: CallbackData, user_data: UserData) -> None:
     """Delete the chosen temp message."""
-    if not callback.data or not callback.message:
+    if not callback.message:
         logger.warning('Callback missing required attributes in delete_temp_mes')
         return
-    mes_id = int(callback.data.split('_')[3])
+    mes_id = callback_data.entity_id
     async with UnitOfWork(auto_commit=True) as uow:
-        mes = await uow.temp.get_by_id(mes_id)
-        if mes:
-            await uow.temp.delete(mes)
+        await uow.temp.update_fields(filters={'id': mes_id}, update_values={'status': UploadState.DELETED})
+    kb.invalidate_catalog()
     await update_user_state(callback.from_user.id, UserState.DEFAULT)
-    await callback.message.answer(txts.ENTRY_DELETED[0], txts.ENTRY_DELETED[1])
-    await callback.answer()
+    await edit_menu(callback, None, text=txts.ENTRY_DELETED[0], parse_mode=txts.ENTRY_DELETED[1])
 
 
-@router.message(Command('addtemp'), MessageFilter(role=UserRole.ADMIN))
+@router.message(MessageRoute(commands=('addtemp',), role=UserRole.ADMIN))
 @handle_errors
 async def cmd_add_temp(message: Message, user_data: UserData) -> None:
     """Send a list of categories for adding temporary messages."""
@@ -94,27 +108,26 @@ async def cmd_add_temp(message: Message, user_data: UserData) -> None:
                         reply_markup=kb.add_temp_categories)
 
 
-@router.callback_query(F.data.startswith('add_temp_'), CallbackFilter(role=UserRole.ADMIN))
+@router.callback_query(CallbackRoute(CallbackAction.ADD_TEMP, role=UserRole.ADMIN))
 @handle_errors
-async def add_temp_cat(callback: CallbackQuery, user_data: UserData) -> None:
+async def add_temp_cat(callback: CallbackQuery, callback_data: CallbackData, user_data: UserData) -> None:
     """Ask user to send description(name) of a new temporary message."""
-    if not callback.data or not callback.message:
+    if not callback.message:
         logger.warning('Callback missing required attributes in add_temp_cat')
         return
-    sure_name = callback.data.split('_')[2]
+    sure_name = callback_data.value
     async with UnitOfWork(auto_commit=True) as uow:
         temp = await uow.temp.add(TemporaryMessage(
             admin_id=callback.from_user.id,
             chat_id=cnst.MSG_VAULT,
-            category=category_map.get(sure_name),
+            category=txts.TEMP_CATEGORIES.get(sure_name),
             status=UploadState.UNFINISHED,
         ))
     await update_user_state(callback.from_user.id, f'{UserState.TEMP_SEND_DATE}:{temp.id}')
     await callback.message.answer(txts.ADD_TEMP_DATE[0], txts.ADD_TEMP_DATE[1], reply_markup=kb.cancel)
-    await callback.answer()
 
 
-@router.message(MessageFilter(role=UserRole.ADMIN, state=UserState.TEMP_SEND_DATE))
+@router.message(MessageRoute(role=UserRole.ADMIN, state=UserState.TEMP_SEND_DATE))
 @handle_errors
 async def add_temp_date(message: Message, user_data: UserData) -> None:
     """Ask user to send name for speaker/session saving and save date."""
@@ -130,7 +143,7 @@ async def add_temp_date(message: Message, user_data: UserData) -> None:
     await message.answer(txts.ADD_TEMP_NAME[0], txts.ADD_TEMP_NAME[1], reply_markup=kb.cancel)
 
 
-@router.message(MessageFilter(role=UserRole.ADMIN, state=UserState.TEMP_SEND_NAME))
+@router.message(MessageRoute(role=UserRole.ADMIN, state=UserState.TEMP_SEND_NAME))
 @handle_errors
 async def add_temp_name(message: Message, user_data: UserData) -> None:
     """Ask user to send info message for speaker/session saving and save name."""
@@ -146,7 +159,7 @@ async def add_temp_name(message: Message, user_data: UserData) -> None:
     await message.answer(txts.ADD_TEMP_MESSAGE[0], txts.ADD_TEMP_MESSAGE[1], reply_markup=kb.cancel)
 
 
-@router.message(MessageFilter(role=UserRole.ADMIN, state=UserState.TEMP_SEND_MESSAGE))
+@router.message(MessageRoute(role=UserRole.ADMIN, state=UserState.TEMP_SEND_MESSAGE))
 @handle_errors
 async def add_temp_message(message: Message, user_data: UserData) -> None:
     """Save the entire data for temporary message in db."""
@@ -159,13 +172,16 @@ async def add_temp_message(message: Message, user_data: UserData) -> None:
     msg = await message.bot.copy_message(int(cnst.MSG_VAULT), message.chat.id, message.message_id)
 
     async with UnitOfWork(auto_commit=True) as uow:
-        await uow.temp.update_fields(
+        temp = await uow.temp.update_fields(
             filters={'id': temp_id},
             update_values={
                 'message_id': msg.message_id,
                 'status': UploadState.UPLOADED,
             },
         )
+    kb.invalidate_catalog()
 
     await update_user_state(message.from_user.id, UserState.DEFAULT)
     await message.answer(txts.TEMP_ADDED[0], txts.TEMP_ADDED[1])
+    await answer_entry_link(message, CallbackAction.TEMP, temp_id)
+    notifier.publish(temp.category, CallbackAction.TEMP, temp_id, temp.name)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import secrets
 import string
@@ -5,13 +6,21 @@ from collections.abc import Awaitable
 from functools import wraps
 from typing import Callable, ParamSpec, TypeVar
 
-from aiogram.exceptions import TelegramAPIError
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramBadRequest
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
+from aiogram.utils.deep_linking import create_start_link
 from sqlalchemy.exc import SQLAlchemyError
 
 import app.const_texts as txts
 import app.constants as cnst
+import app.keyboards as kb
+from app.cache.catalog_index import deep_link_token
+from app.callback_data import CallbackAction
+from app.database.models.enums import UploadState
 from app.database.models.user_states import UserState
 from app.database.uow import UnitOfWork
+from app.services.text_manager import text_manager
 
 
 logger = logging.getLogger(__name__)
@@ -36,6 +45,40 @@ async def setup_initial_admins() -> None:
             )
 
 
+async def backfill_file_unique_ids(bot: Bot) -> None:
+    """Fill file_unique_id of files uploaded before deduplication and retire duplicates, one short commit per batch."""
+    filters: dict[str, int | str | None] = {'file_unique_id': None, 'status': UploadState.UPLOADED}
+    after_id = 0
+    while True:
+        async with UnitOfWork(auto_commit=False) as uow:
+            files = await uow.files.find_page(filters, after_id=after_id, limit=cnst.BACKFILL_BATCH_SIZE)
+        if not files:
+            return
+        after_id = files[-1].id
+        resolved: list[tuple[int, str]] = []
+        for file in files:
+            try:
+                tg_file = await bot.get_file(file.tg_id)
+            except TelegramAPIError:
+                logger.warning('Failed to resolve file_unique_id for file %s', file.id)
+                continue
+            resolved.append((file.id, tg_file.file_unique_id))
+            await asyncio.sleep(cnst.BACKFILL_DELAY)
+        retired = False
+        async with UnitOfWork(auto_commit=True) as uow:
+            for file_id, file_unique_id in resolved:
+                if await uow.files.get_by_filter(filters={'file_unique_id': file_unique_id}):
+                    await uow.files.update_fields(filters={'id': file_id},
+                                                  update_values={'status': UploadState.DELETED})
+                    logger.info('File %s is a duplicate and was marked as deleted', file_id)
+                    retired = True
+                else:
+                    await uow.files.update_fields(filters={'id': file_id},
+                                                  update_values={'file_unique_id': file_unique_id})
+        if retired:
+            kb.invalidate_catalog()
+
+
 def weekday_by_number(day_number: int) -> str:
     """Convert day number (0-6) to localized weekday name."""
     weekdays = [
@@ -65,6 +108,38 @@ def handle_errors(func: Callable[P, Awaitable[None]]) -> Callable[P, Awaitable[N
     return wrapped
 
 
+async def edit_menu(callback: CallbackQuery, reply_markup: InlineKeyboardMarkup | None, *,
+                    text: str | None = None, parse_mode: str | None = None) -> None:
+    """Show next menu step in the message of the callback, keep only the keyboard if no text is given.
+
+    A repeated tap on the same button is ignored, a message which can no longer be edited is replaced by a new one.
+    """
+    message = callback.message
+    if message is None:
+        return
+    try:
+        if text is None:
+            await message.edit_reply_markup(reply_markup=reply_markup)
+        else:
+            await message.edit_text(text, parse_mode=parse_mode, reply_markup=reply_markup)
+    except TelegramBadRequest as error:
+        if 'message is not modified' in error.message:
+            return
+        logger.debug('Menu message %s can not be edited: %s', message.message_id, error.message)
+        if text is None:
+            text, parse_mode = message.html_text, 'HTML'
+        await message.answer(text, parse_mode=parse_mode, reply_markup=reply_markup)
+
+
+async def answer_entry_link(message: Message, action: CallbackAction, entity_id: int) -> None:
+    """Send /start deep link which opens the new entry in one step, e.g. from a channel post."""
+    if not message.bot:
+        return
+    link = await create_start_link(message.bot, deep_link_token(action, entity_id))
+    text, parse_mode = text_manager.get('ADD_DEL_ENTRY', 'ENTRY_LINK', link=link)
+    await message.answer(text, parse_mode=parse_mode)
+
+
 def create_random_code(length: int = 8) -> str:
     """Generate secure random alphanumeric code."""
     alphabet = string.ascii_uppercase + string.digits
@@ -1,27 +1,45 @@
 import logging
-from typing import cast
+from collections.abc import Sequence
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, KeyboardButton, ReplyKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
+from cachetools import TTLCache
 
 import app.const_texts as txts
+import app.constants as cnst
+from app.cache.catalog_index import catalog_index
+from app.cache.greeting_pictures import greeting_pictures
+from app.callback_data import CallbackAction, pack
+from app.database.models import TemporaryMessage
 from app.database.models.enums import UploadState, UserRole
+from app.database.repositories.base import CatalogModelType, GenericSqlRepository
 from app.database.uow import UnitOfWork
+from app.services.search import SearchHit, catalog_search
 from app.services.text_manager import text_manager
 
 
 logger = logging.getLogger(__name__)
 
+# public catalog pages by page action, category key and cursor
+_catalog_markups: TTLCache[tuple[CallbackAction, str, int], InlineKeyboardMarkup]
+_catalog_markups = TTLCache(maxsize=cnst.MARKUP_CACHE_SIZE, ttl=cnst.MARKUP_CACHE_TTL)
+
+
+def _button(text: str, action: CallbackAction, *, entity_id: int = 0, value: str = '') -> InlineKeyboardButton:
+    """Create inline button with packed callback data."""
+    return InlineKeyboardButton(text=text, callback_data=pack(action, entity_id=entity_id, value=value))
+
+
 # main and adding admin menus
 choose_role_owner = InlineKeyboardMarkup(inline_keyboard=[[
-    InlineKeyboardButton(text=txts.KB_ROLE_ADMIN, callback_data='choose_role_admin')],
-    [InlineKeyboardButton(text=txts.KB_ROLE_SUPERADMIN, callback_data='choose_role_superadmin')],
-    [InlineKeyboardButton(text=txts.KB_CANCEL, callback_data='cancel')],
+    _button(txts.KB_ROLE_ADMIN, CallbackAction.CHOOSE_ROLE, value='admin')],
+    [_button(txts.KB_ROLE_SUPERADMIN, CallbackAction.CHOOSE_ROLE, value='superadmin')],
+    [_button(txts.KB_CANCEL, CallbackAction.CANCEL)],
 ])
 
 choose_role_superadmin = InlineKeyboardMarkup(inline_keyboard=[[
-    InlineKeyboardButton(text=txts.KB_ROLE_ADMIN, callback_data='choose_role_admin')],
-    [InlineKeyboardButton(text=txts.KB_CANCEL, callback_data='cancel')],
+    _button(txts.KB_ROLE_ADMIN, CallbackAction.CHOOSE_ROLE, value='admin')],
+    [_button(txts.KB_CANCEL, CallbackAction.CANCEL)],
 ])
 
 main = ReplyKeyboardMarkup(
@@ -39,161 +57,238 @@ main = ReplyKeyboardMarkup(
 
 # public categories of entries
 public_file_categories = InlineKeyboardMarkup(inline_keyboard=[
-    [InlineKeyboardButton(text=txts.FILE_BOOKLETS, callback_data='public_file_booklets')],
-    [InlineKeyboardButton(text=txts.FILE_BOOKS, callback_data='public_file_books')],
-    [InlineKeyboardButton(text=txts.FILE_FORMATS, callback_data='public_file_formats')],
-    [InlineKeyboardButton(text=txts.FILE_EXTRAS, callback_data='public_file_extras')],
-    [InlineKeyboardButton(text=txts.FILE_SCHEDULE, callback_data='public_file_schedule')],
+    [_button(txts.FILE_BOOKLETS, CallbackAction.FILE_CATEGORY, value='booklets')],
+    [_button(txts.FILE_BOOKS, CallbackAction.FILE_CATEGORY, value='books')],
+    [_button(txts.FILE_FORMATS, CallbackAction.FILE_CATEGORY, value='formats')],
+    [_button(txts.FILE_EXTRAS, CallbackAction.FILE_CATEGORY, value='extras')],
+    [_button(txts.FILE_SCHEDULE, CallbackAction.FILE_CATEGORY, value='schedule')],
 ])
 
 # add categories
 add_file_categories = InlineKeyboardMarkup(inline_keyboard=[
-    [InlineKeyboardButton(text=txts.FILE_BOOKLETS, callback_data='add_file_booklets')],
-    [InlineKeyboardButton(text=txts.FILE_BOOKS, callback_data='add_file_books')],
-    [InlineKeyboardButton(text=txts.FILE_BOT_PICS, callback_data='add_file_pics')],
-    [InlineKeyboardButton(text=txts.FILE_FORMATS, callback_data='add_file_formats')],
-    [InlineKeyboardButton(text=txts.FILE_EXTRAS, callback_data='add_file_extras')],
-    [InlineKeyboardButton(text=txts.FILE_SCHEDULE, callback_data='add_file_schedule')],
-    [InlineKeyboardButton(text=txts.KB_CANCEL, callback_data='cancel')],
+    [_button(txts.FILE_BOOKLETS, CallbackAction.ADD_FILE, value='booklets')],
+    [_button(txts.FILE_BOOKS, CallbackAction.ADD_FILE, value='books')],
+    [_button(txts.FILE_BOT_PICS, CallbackAction.ADD_FILE, value='pics')],
+    [_button(txts.FILE_FORMATS, CallbackAction.ADD_FILE, value='formats')],
+    [_button(txts.FILE_EXTRAS, CallbackAction.ADD_FILE, value='extras')],
+    [_button(txts.FILE_SCHEDULE, CallbackAction.ADD_FILE, value='schedule')],
+    [_button(txts.KB_CANCEL, CallbackAction.CANCEL)],
 ])
 
 add_const_categories = InlineKeyboardMarkup(inline_keyboard=[
-    [InlineKeyboardButton(text=txts.CONST_LINKS, callback_data='add_const_links')],
-    [InlineKeyboardButton(text=txts.CONST_NEWCOMER, callback_data='add_const_newcomer')],
-    [InlineKeyboardButton(text=txts.CONST_CONTACTS, callback_data='add_const_contacts')],
-    [InlineKeyboardButton(text=txts.KB_CANCEL, callback_data='cancel')],
+    [_button(txts.CONST_LINKS, CallbackAction.ADD_CONST, value='links')],
+    [_button(txts.CONST_NEWCOMER, CallbackAction.ADD_CONST, value='newcomer')],
+    [_button(txts.CONST_CONTACTS, CallbackAction.ADD_CONST, value='contacts')],
+    [_button(txts.KB_CANCEL, CallbackAction.CANCEL)],
 ])
 
 add_temp_categories = InlineKeyboardMarkup(inline_keyboard=[
-    [InlineKeyboardButton(text=txts.TEMP_SPEAKERS, callback_data='add_temp_speakers')],
-    [InlineKeyboardButton(text=txts.TEMP_SESSIONS, callback_data='add_temp_sessions')],
-    [InlineKeyboardButton(text=txts.KB_CANCEL, callback_data='cancel')],
+    [_button(txts.TEMP_SPEAKERS, CallbackAction.ADD_TEMP, value='speakers')],
+    [_button(txts.TEMP_SESSIONS, CallbackAction.ADD_TEMP, value='sessions')],
+    [_button(txts.KB_CANCEL, CallbackAction.CANCEL)],
 ])
 
 
 # del
 
 del_file_categories_value = InlineKeyboardMarkup(inline_keyboard=[
-    [InlineKeyboardButton(text=txts.FILE_BOOKLETS, callback_data='del_file_cat_booklets')],
-    [InlineKeyboardButton(text=txts.FILE_BOOKS, callback_data='del_file_cat_books')],
-    [InlineKeyboardButton(text=txts.FILE_BOT_PICS, callback_data='del_file_cat_pics')],
-    [InlineKeyboardButton(text=txts.FILE_FORMATS, callback_data='del_file_cat_formats')],
-    [InlineKeyboardButton(text=txts.FILE_EXTRAS, callback_data='del_file_cat_extras')],
-    [InlineKeyboardButton(text=txts.FILE_SCHEDULE, callback_data='del_file_cat_schedule')],
-    [InlineKeyboardButton(text=txts.KB_CANCEL, callback_data='cancel')],
+    [_button(txts.FILE_BOOKLETS, CallbackAction.DELETE_FILE_CATEGORY, value='booklets')],
+    [_button(txts.FILE_BOOKS, CallbackAction.DELETE_FILE_CATEGORY, value='books')],
+    [_button(txts.FILE_BOT_PICS, CallbackAction.DELETE_FILE_CATEGORY, value='pics')],
+    [_button(txts.FILE_FORMATS, CallbackAction.DELETE_FILE_CATEGORY, value='formats')],
+    [_button(txts.FILE_EXTRAS, CallbackAction.DELETE_FILE_CATEGORY, value='extras')],
+    [_button(txts.FILE_SCHEDULE, CallbackAction.DELETE_FILE_CATEGORY, value='schedule')],
+    [_button(txts.KB_CANCEL, CallbackAction.CANCEL)],
 ])
 
 
 del_const_categories_value = InlineKeyboardMarkup(inline_keyboard=[
-    [InlineKeyboardButton(text=txts.CONST_LINKS, callback_data='del_const_cat_links')],
-    [InlineKeyboardButton(text=txts.CONST_NEWCOMER, callback_data='del_const_cat_newcomer')],
-    [InlineKeyboardButton(text=txts.CONST_CONTACTS, callback_data='del_const_cat_contacts')],
-    [InlineKeyboardButton(text=txts.KB_CANCEL, callback_data='cancel')],
+    [_button(txts.CONST_LINKS, CallbackAction.DELETE_CONST_CATEGORY, value='links')],
+    [_button(txts.CONST_NEWCOMER, CallbackAction.DELETE_CONST_CATEGORY, value='newcomer')],
+    [_button(txts.CONST_CONTACTS, CallbackAction.DELETE_CONST_CATEGORY, value='contacts')],
+    [_button(txts.KB_CANCEL, CallbackAction.CANCEL)],
 ])
 
 del_temp_categories_value = InlineKeyboardMarkup(inline_keyboard=[
-    [InlineKeyboardButton(text=txts.TEMP_SPEAKERS, callback_data='del_temp_cat_speakers')],
-    [InlineKeyboardButton(text=txts.TEMP_SESSIONS, callback_data='del_temp_cat_sessions')],
-    [InlineKeyboardButton(text=txts.KB_CANCEL, callback_data='cancel')],
+    [_button(txts.TEMP_SPEAKERS, CallbackAction.DELETE_TEMP_CATEGORY, value='speakers')],
+    [_button(txts.TEMP_SESSIONS, CallbackAction.DELETE_TEMP_CATEGORY, value='sessions')],
+    [_button(txts.KB_CANCEL, CallbackAction.CANCEL)],
 ])
 
 # cancel
-cancel = InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text=txts.KB_CANCEL, callback_data='cancel')]])
+cancel = InlineKeyboardMarkup(inline_keyboard=[[_button(txts.KB_CANCEL, CallbackAction.CANCEL)]])
+
+
+_SEARCH_ICONS = {CallbackAction.FILE: '📄', CallbackAction.CONST: '📌', CallbackAction.TEMP: '🗓'}
+
+
+def invalidate_catalog() -> None:
+    """Drop every in-memory view of the catalog after entries were added or deleted."""
+    _catalog_markups.clear()
+    catalog_search.invalidate()
+    catalog_index.invalidate()
+    greeting_pictures.invalidate()
 
 
 # entry categories before delte
-async def files_by_cat(category: str) -> InlineKeyboardMarkup:
-    """Send a list of files of chosen category."""
+def _temp_entry_text(category_key: str, temp_mes: TemporaryMessage) -> str:
+    """Format temp message button text for its category."""
+    key = 'TEMP_SPEAKER_ENTRY' if category_key == 'speakers' else 'TEMP_SESSION_ENTRY'
+    text, _parse = text_manager.get('KEYBOARD', key, date=temp_mes.date, name=temp_mes.name)
+    return text
+
+
+async def _fetch_page(repository: GenericSqlRepository[CatalogModelType], filters: dict[str, int | str | None],
+                      after_id: int) -> tuple[Sequence[CatalogModelType], int | None, int | None]:
+    """Fetch one catalog page with cursors of the next and previous pages, a lookahead row detects the next one."""
+    rows = await repository.find_page(filters, after_id=after_id, limit=cnst.CATALOG_PAGE_SIZE + 1)
+    next_cursor = None
+    if len(rows) > cnst.CATALOG_PAGE_SIZE:
+        rows = rows[:cnst.CATALOG_PAGE_SIZE]
+        next_cursor = rows[-1].id
+    prev_cursor = None
+    if after_id:
+        before_id = rows[0].id if rows else after_id + 1
+        prev_cursor = await repository.previous_page_cursor(filters, before_id=before_id,
+                                                            limit=cnst.CATALOG_PAGE_SIZE)
+    return rows, next_cursor, prev_cursor
+
+
+def _page_row(keyboard: InlineKeyboardBuilder, action: CallbackAction, category_key: str,
+              next_cursor: int | None, prev_cursor: int | None) -> None:
+    """Add previous and next page buttons if there are more entries."""
+    buttons = []
+    if prev_cursor is not None:
+        buttons.append(_button(txts.KB_PAGE_PREV, action, entity_id=prev_cursor, value=category_key))
+    if next_cursor is not None:
+        buttons.append(_button(txts.KB_PAGE_NEXT, action, entity_id=next_cursor, value=category_key))
+    if buttons:
+        keyboard.row(*buttons)
+
+
+async def files_by_cat(category_key: str, after_id: int = 0) -> InlineKeyboardMarkup:
+    """Send a page of files of chosen category."""
+    cache_key = (CallbackAction.PAGE_FILES, category_key, after_id)
+    if markup := _catalog_markups.get(cache_key):
+        return markup
+    filters: dict[str, int | str | None] = {
+        'category': txts.FILE_CATEGORIES.get(category_key, ''),
+        'status': UploadState.UPLOADED,
+    }
     async with UnitOfWork(auto_commit=False) as uow:
-        files = await uow.files.find(filters={'category': category, 'status': UploadState.UPLOADED})
+        files, next_cursor, prev_cursor = await _fetch_page(uow.files, filters, after_id)
     keyboard = InlineKeyboardBuilder()
     for file in files:
-        keyboard.row(InlineKeyboardButton(text=file.name, callback_data=f'file_mes_{file.id}'))
-    return cast(InlineKeyboardMarkup, keyboard.adjust(1).as_markup())
+        keyboard.row(_button(file.name, CallbackAction.FILE, entity_id=file.id))
+    _page_row(keyboard, CallbackAction.PAGE_FILES, category_key, next_cursor, prev_cursor)
+    keyboard.row(_button(txts.KB_BACK_TO_CATEGORIES, CallbackAction.FILE_MENU))
+    markup = _catalog_markups[cache_key] = keyboard.as_markup()
+    return markup
 
 
-async def temp_by_cat(category: str) -> InlineKeyboardMarkup:
-    """Send a list of temp messages of chosen category."""
+async def temp_by_cat(category_key: str, after_id: int = 0) -> InlineKeyboardMarkup:
+    """Send a page of temp messages of chosen category."""
+    cache_key = (CallbackAction.PAGE_TEMP, category_key, after_id)
+    if markup := _catalog_markups.get(cache_key):
+        return markup
+    filters: dict[str, int | str | None] = {
+        'category': txts.TEMP_CATEGORIES.get(category_key, ''),
+        'status': UploadState.UPLOADED,
+    }
     async with UnitOfWork(auto_commit=False) as uow:
-        array = await uow.temp.find(filters={'category': category, 'status': UploadState.UPLOADED})
+        array, next_cursor, prev_cursor = await _fetch_page(uow.temp, filters, after_id)
     keyboard = InlineKeyboardBuilder()
     if not array:
-        keyboard.row(InlineKeyboardButton(text=txts.KB_NO_INFO,
-                                        callback_data='no_info'))
-    else:
-        match category:
-            case txts.TEMP_SPEAKERS:
-                for temp_mes in array:
-                    text, _parse = text_manager.get('KEYBOARD', 'TEMP_SPEAKER_ENTRY',
-                                date=temp_mes.date, name=temp_mes.name)
-                    keyboard.row(InlineKeyboardButton(text=text, callback_data=f'temp_mes_{temp_mes.id}'))
-
-            case txts.TEMP_SESSIONS:
-                for temp_mes in array:
-                    text, _parse = text_manager.get('KEYBOARD', 'TEMP_SESSION_ENTRY',
-                                date=temp_mes.date, name=temp_mes.name)
-                    keyboard.row(InlineKeyboardButton(text=text, callback_data=f'temp_mes_{temp_mes.id}'))
-
-    return cast(InlineKeyboardMarkup, keyboard.adjust(1).as_markup())
+        keyboard.row(_button(txts.KB_NO_INFO, CallbackAction.NO_ACTION))
+    for temp_mes in array:
+        keyboard.row(_button(_temp_entry_text(category_key, temp_mes), CallbackAction.TEMP, entity_id=temp_mes.id))
+    _page_row(keyboard, CallbackAction.PAGE_TEMP, category_key, next_cursor, prev_cursor)
+    markup = _catalog_markups[cache_key] = keyboard.as_markup()
+    return markup
 
 
 # delete entry
-async def delete_file_entry_value(category: str) -> InlineKeyboardMarkup:
-    """Send a list of files of chosen category for deletion."""
+async def delete_file_entry_value(category_key: str, after_id: int = 0) -> InlineKeyboardMarkup:
+    """Send a page of files of chosen category for deletion."""
+    filters: dict[str, int | str | None] = {
+        'category': txts.FILE_CATEGORIES.get(category_key, ''),
+        'status': UploadState.UPLOADED,
+    }
     async with UnitOfWork(auto_commit=False) as uow:
-        array = await uow.files.find(filters={'category': category, 'status': UploadState.UPLOADED})
+        array, next_cursor, prev_cursor = await _fetch_page(uow.files, filters, after_id)
     keyboard = InlineKeyboardBuilder()
     if not array:
-        keyboard.row(InlineKeyboardButton(text=txts.KB_NO_FILES, callback_data='no_action'))
+        keyboard.row(_button(txts.KB_NO_FILES, CallbackAction.NO_ACTION))
     else:
         for file in array:
-            keyboard.row(InlineKeyboardButton(text=file.name, callback_data=f'del_file_entry_{file.id}'))
-        keyboard.row(InlineKeyboardButton(text=txts.KB_CANCEL, callback_data='cancel'))
-    return cast(InlineKeyboardMarkup, keyboard.adjust(1).as_markup())
+            keyboard.row(_button(file.name, CallbackAction.DELETE_FILE, entity_id=file.id))
+        _page_row(keyboard, CallbackAction.PAGE_DELETE_FILES, category_key, next_cursor, prev_cursor)
+        keyboard.row(_button(txts.KB_CANCEL, CallbackAction.CANCEL))
+    return keyboard.as_markup()
 
 
-async def delete_temp_entry_value(user_id: int, category: str) -> InlineKeyboardMarkup | None:
-    """Send a list of temp messages of chosen category for deletion."""
+async def delete_temp_entry_value(user_id: int, category_key: str, after_id: int = 0) -> InlineKeyboardMarkup | None:
+    """Send a page of temp messages of chosen category for deletion."""
+    filters: dict[str, int | str | None] = {
+        'category': txts.TEMP_CATEGORIES.get(category_key, ''),
+        'status': UploadState.UPLOADED,
+    }
     async with UnitOfWork(auto_commit=False) as uow:
         user = await uow.users.get_by_filter(filters={'user_id': user_id})
         if not user:
             logger.warning('User missing in delete_temp_entry_value')
             return None
-        if user.role in (UserRole.OWNER, UserRole.SUPERADMIN):
-            all_temp = await uow.temp.find(filters={'category': category, 'status': UploadState.UPLOADED})
-        else:
-            all_temp = await uow.temp.find(filters={'category': category, 'admin_id': user_id,
-                                                'status': UploadState.UPLOADED})
+        if user.role not in (UserRole.OWNER, UserRole.SUPERADMIN):
+            filters['admin_id'] = user_id
+        array, next_cursor, prev_cursor = await _fetch_page(uow.temp, filters, after_id)
     keyboard = InlineKeyboardBuilder()
-    array = list(all_temp)
     if not array:
-        keyboard.row(InlineKeyboardButton(text=txts.KB_NO_TEMP, callback_data='no_action'))
+        keyboard.row(_button(txts.KB_NO_TEMP, CallbackAction.NO_ACTION))
     else:
-        match category:
-            case txts.TEMP_SPEAKERS:
-                for temp_mes in array:
-                    text, _parse = text_manager.get('KEYBOARD', 'TEMP_SPEAKER_ENTRY',
-                                                    date=temp_mes.date, name=temp_mes.name)
-                    keyboard.row(InlineKeyboardButton(text=text, callback_data=f'del_temp_entry_{temp_mes.id}'))
-
-            case txts.TEMP_SESSIONS:
-                for temp_mes in array:
-                    text, _parse = text_manager.get('KEYBOARD', 'TEMP_SESSION_ENTRY', date=temp_mes.date,
-                                                    name=temp_mes.name)
-                    keyboard.row(InlineKeyboardButton(text=text, callback_data=f'del_temp_entry_{temp_mes.id}'))
-        keyboard.row(InlineKeyboardButton(text=txts.KB_CANCEL, callback_data='cancel'))
-    return cast(InlineKeyboardMarkup, keyboard.adjust(1).as_markup())
-
-
-async def delete_const_entry_value(category: str) -> InlineKeyboardMarkup:
-    """Send a list of const messages of chosen category for deletion."""
+        for temp_mes in array:
+            keyboard.row(_button(_temp_entry_text(category_key, temp_mes), CallbackAction.DELETE_TEMP,
+                                 entity_id=temp_mes.id))
+        _page_row(keyboard, CallbackAction.PAGE_DELETE_TEMP, category_key, next_cursor, prev_cursor)
+        keyboard.row(_button(txts.KB_CANCEL, CallbackAction.CANCEL))
+    return keyboard.as_markup()
+
+
+async def delete_const_entry_value(category_key: str, after_id: int = 0) -> InlineKeyboardMarkup:
+    """Send a page of const messages of chosen category for deletion."""
+    filters: dict[str, int | str | None] = {
+        'category': txts.CONST_CATEGORIES.get(category_key, ''),
+        'status': UploadState.UPLOADED,
+    }
     async with UnitOfWork(auto_commit=False) as uow:
-        array = await uow.const.find(filters={'category': category, 'status': UploadState.UPLOADED})
+        array, next_cursor, prev_cursor = await _fetch_page(uow.const, filters, after_id)
     keyboard = InlineKeyboardBuilder()
     if not array:
-        keyboard.row(InlineKeyboardButton(text=txts.KB_NO_CONST, callback_data='no_action'))
+        keyboard.row(_button(txts.KB_NO_CONST, CallbackAction.NO_ACTION))
     else:
         for mes in array:
-            keyboard.row(InlineKeyboardButton(text=mes.name, callback_data=f'del_const_entry_{mes.id}'))
-        keyboard.row(InlineKeyboardButton(text=txts.KB_CANCEL, callback_data='cancel'))
-    return cast(InlineKeyboardMarkup, keyboard.adjust(1).as_markup())
+            keyboard.row(_button(mes.name, CallbackAction.DELETE_CONST, entity_id=mes.id))
+        _page_row(keyboard, CallbackAction.PAGE_DELETE_CONST, category_key, next_cursor, prev_cursor)
+        keyboard.row(_button(txts.KB_CANCEL, CallbackAction.CANCEL))
+    return keyboard.as_markup()
+
+
+# search
+def search_results(token: str, hits: tuple[SearchHit, ...], offset: int = 0) -> InlineKeyboardMarkup:
+    """Send a page of search results, entries open with the same actions as in category lists."""
+    keyboard = InlineKeyboardBuilder()
+    for hit in hits[offset:offset + cnst.CATALOG_PAGE_SIZE]:
+        keyboard.row(_button(f'{_SEARCH_ICONS[hit.action]} {hit.name}', hit.action, entity_id=hit.entity_id))
+    prev_cursor = max(offset - cnst.CATALOG_PAGE_SIZE, 0) if offset else None
+    next_cursor = offset + cnst.CATALOG_PAGE_SIZE if len(hits) > offset + cnst.CATALOG_PAGE_SIZE else None
+    _page_row(keyboard, CallbackAction.SEARCH_PAGE, token, next_cursor, prev_cursor)
+    return keyboard.as_markup()
+
+
+# subscriptions
+def subscriptions(subscribed: set[str]) -> InlineKeyboardMarkup:
+    """Send subscription toggles of file and temp categories, subscribed ones are checked."""
+    keyboard = InlineKeyboardBuilder()
+    for key, category in txts.SUBSCRIPTION_CATEGORIES.items():
+        mark = txts.KB_SUBSCRIBED if category in subscribed else txts.KB_NOT_SUBSCRIBED
+        keyboard.row(_button(f'{mark} {category}', CallbackAction.SUBSCRIBE, value=key))
+    return keyboard.as_markup()
@@ -1,13 +1,31 @@
+import asyncio
+import gc
 import logging
+import time
+from array import array
+from collections import defaultdict
 
 import psutil
-from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, start_http_server
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    ProcessCollector,
+    generate_latest,
+    start_http_server,
+)
+
+import app.constants as cnst
 
 
 logger = logging.getLogger(__name__)
 
 metrics_registry = CollectorRegistry()
 
+# Bot updates take from a few milliseconds (cache hits) to tens of seconds (file uploads)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
 COMMAND_COUNT = Counter(
     'bot_commands_total',
     'Total number of commands',
@@ -40,6 +58,114 @@ REQUEST_LATENCY = Histogram(
     'bot_request_latency_seconds',
     'Request latency in seconds',
     ['handler'],
+    buckets=LATENCY_BUCKETS,
+    registry=metrics_registry,
+)
+
+HANDLER_COUNT = Counter(
+    'bot_handler_calls_total',
+    'Total number of handler calls',
+    ['handler', 'status'],
+    registry=metrics_registry,
+)
+
+HANDLER_LATENCY = Histogram(
+    'bot_handler_latency_seconds',
+    'Handler latency in seconds',
+    ['handler'],
+    buckets=LATENCY_BUCKETS,
+    registry=metrics_registry,
+)
+
+BOT_API_LATENCY = Histogram(
+    'bot_api_request_latency_seconds',
+    'Telegram Bot API request latency in seconds',
+    ['method'],
+    buckets=LATENCY_BUCKETS,
+    registry=metrics_registry,
+)
+
+BOT_API_ERRORS = Counter(
+    'bot_api_errors_total',
+    'Total failed Telegram Bot API requests',
+    ['method', 'error_type'],
+    registry=metrics_registry,
+)
+
+BOT_API_RETRIES = Counter(
+    'bot_api_retries_total',
+    'Total Telegram Bot API requests retried after flood control',
+    ['method'],
+    registry=metrics_registry,
+)
+
+BOT_API_IN_FLIGHT = Gauge(
+    'bot_api_requests_in_flight',
+    'Telegram Bot API requests currently in flight',
+    ['method'],
+    registry=metrics_registry,
+)
+
+BOT_API_BYTES_SENT = Counter(
+    'bot_api_sent_bytes_total',
+    'Approximate size of Telegram Bot API request payloads in bytes',
+    ['method'],
+    registry=metrics_registry,
+)
+
+BOT_API_BYTES_RECEIVED = Counter(
+    'bot_api_received_bytes_total',
+    'Size of Telegram Bot API responses in bytes',
+    ['method'],
+    registry=metrics_registry,
+)
+
+STATEMENT_LATENCY = Histogram(
+    'bot_db_statement_latency_seconds',
+    'SQL statement latency in seconds',
+    ['statement'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+    registry=metrics_registry,
+)
+
+QUERIES_PER_UPDATE = Histogram(
+    'bot_db_queries_per_update',
+    'Number of SQL statements issued while processing one update',
+    buckets=(0, 1, 2, 3, 4, 5, 8, 12, 20, 50),
+    registry=metrics_registry,
+)
+
+THROTTLED_UPDATES = Counter(
+    'bot_throttled_updates_total',
+    'Total updates dropped by the anti-flood limiter',
+    ['event_type'],
+    registry=metrics_registry,
+)
+
+SUPPRESSED_CALLBACKS = Counter(
+    'bot_suppressed_callbacks_total',
+    'Total duplicate callback queries acknowledged without running a handler',
+    registry=metrics_registry,
+)
+
+GC_RECLAIMED = Counter(
+    'bot_gc_reclaimed_total',
+    'Total rows and vault messages reclaimed by garbage collection',
+    ['kind'],
+    registry=metrics_registry,
+)
+
+ACTIVE_USERS = Gauge(
+    'bot_active_users',
+    'Estimated distinct active users in the window',
+    ['window'],
+    registry=metrics_registry,
+)
+
+NOTIFICATIONS_SENT = Counter(
+    'bot_notifications_total',
+    'Total subscription notifications by delivery status',
+    ['status'],
     registry=metrics_registry,
 )
 
@@ -49,6 +175,81 @@ MEMORY_USAGE = Gauge(
     registry=metrics_registry,
 )
 
+GC_COLLECTIONS = Counter(
+    'bot_gc_collections_total',
+    'Total garbage collector runs',
+    ['generation'],
+    registry=metrics_registry,
+)
+
+GC_PAUSE = Histogram(
+    'bot_gc_pause_seconds',
+    'Garbage collector pause time in seconds',
+    ['generation'],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5),
+    registry=metrics_registry,
+)
+
+ASYNCIO_TASKS = Gauge(
+    'bot_asyncio_tasks',
+    'Number of pending asyncio tasks',
+    registry=metrics_registry,
+)
+
+EVENT_LOOP_LAG = Histogram(
+    'bot_event_loop_lag_seconds',
+    'Delay of event loop wake-ups over the scheduled time',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    registry=metrics_registry,
+)
+
+
+class _GCTimer:
+    """gc.callbacks hook measuring collector pauses."""
+
+    def __init__(self) -> None:
+        """Initialize timer."""
+        self.started = 0.0
+
+    def __call__(self, phase: str, info: dict[str, int]) -> None:
+        """Start timing on 'start' phase and record the pause on 'stop'."""
+        if phase == 'start':
+            self.started = time.perf_counter()
+            return
+        generation = str(info['generation'])
+        GC_COLLECTIONS.labels(generation=generation).inc()
+        GC_PAUSE.labels(generation=generation).observe(time.perf_counter() - self.started)
+
+
+class LatencyWindow:
+    """Ring buffer of the latest latencies and error flags of one handler."""
+
+    def __init__(self, size: int) -> None:
+        """Preallocate buffers for size samples."""
+        self._latencies = array('d', [0.0]) * size
+        self._errors = array('B', [0]) * size
+        self._position = 0
+        self._count = 0
+
+    def add(self, latency: float, *, failed: bool) -> None:
+        """Store sample overwriting the oldest one."""
+        self._latencies[self._position] = latency
+        self._errors[self._position] = failed
+        self._position = (self._position + 1) % len(self._latencies)
+        self._count = min(self._count + 1, len(self._latencies))
+
+    def summary(self) -> tuple[int, float, float, float, float]:
+        """Return sample count, p50, p95, p99 and error rate over the window."""
+        if not self._count:
+            return 0, 0.0, 0.0, 0.0, 0.0
+        samples = sorted(self._latencies[:self._count])
+        count = len(samples)
+        p50, p95, p99 = (samples[min(count - 1, int(q * count))] for q in (0.5, 0.95, 0.99))
+        return count, p50, p95, p99, sum(self._errors[:self._count]) / count
+
+
+HANDLER_WINDOWS: defaultdict[str, LatencyWindow] = defaultdict(lambda: LatencyWindow(cnst.PERF_WINDOW_SIZE))
+
 
 def get_metrics() -> str:
     """Export all metrics in Prometheus text format."""
@@ -70,3 +271,19 @@ def update_memory_metric() -> None:
 def start_metrics_exporter(port: int = 8000) -> None:
     """Start HTTP server for Prometheus metrics scraping."""
     start_http_server(port, registry=metrics_registry)
+
+
+def start_runtime_collectors() -> None:
+    """Register CPU, file descriptor and GC collectors."""
+    ProcessCollector(registry=metrics_registry)
+    gc.callbacks.append(_GCTimer())
+
+
+async def monitor_event_loop(interval: float) -> None:
+    """Periodically measure event loop lag, task count and memory usage."""
+    while True:
+        start_time = time.perf_counter()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, time.perf_counter() - start_time - interval))
+        ASYNCIO_TASKS.set(len(asyncio.all_tasks()))
+        update_memory_metric()
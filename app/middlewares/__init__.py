@@ -1,13 +1,34 @@
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
-from .metrics_collector import MetricsCollector
+from .bot_api_metrics import BotApiMetrics, InstrumentedSession
+from .callback_answer import EarlyCallbackAnswer
+from .callback_dedup import CallbackDedupMiddleware
+from .flood_control import FloodControlRetry
+from .metrics_collector import HandlerMetrics, MetricsCollector
+from .routing import RoutingMiddleware
 from .scheduler_injector import SchedulerInjector
+from .throttling import ThrottlingMiddleware
 from .user_data_middleware import UserDataMiddleware
 
 
 user_data = UserDataMiddleware()
 metrics_collector = MetricsCollector()
+handler_metrics = HandlerMetrics()
+throttling = ThrottlingMiddleware()
+callback_dedup = CallbackDedupMiddleware()
+early_callback_answer = EarlyCallbackAnswer()
+bot_api_metrics = BotApiMetrics()
+flood_control = FloodControlRetry()
+routing = RoutingMiddleware()
+
+
+def init_bot_session() -> InstrumentedSession:
+    """Return a Bot API session with flood control retries and request metrics attached, retries outermost."""
+    session = InstrumentedSession()
+    session.middleware(flood_control)
+    session.middleware(bot_api_metrics)
+    return session
 
 
 def init_scheduler_injector(scheduler: AsyncIOScheduler) -> SchedulerInjector:
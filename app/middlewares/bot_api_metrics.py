@@ -0,0 +1,73 @@
+import time
+from typing import TypeVar
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramAPIError
+from aiogram.methods import Response, TelegramMethod
+from aiogram.types import InputFile
+from pydantic_core import PydanticSerializationError
+
+from app.metrics import (
+    BOT_API_BYTES_RECEIVED,
+    BOT_API_BYTES_SENT,
+    BOT_API_ERRORS,
+    BOT_API_IN_FLIGHT,
+    BOT_API_LATENCY,
+)
+from app.tracing import record_span
+
+
+ResultType = TypeVar('ResultType')
+
+
+def payload_size(method: TelegramMethod[ResultType]) -> int:
+    """Return size of the JSON fields of a request, uploaded files are not counted."""
+    files = {name for name, value in method if isinstance(value, InputFile)}
+    try:
+        return len(method.model_dump_json(exclude_none=True, exclude=files))
+    except PydanticSerializationError:
+        # files nested in media groups
+        return 0
+
+
+class InstrumentedSession(AiohttpSession):
+    """Aiohttp session which counts bytes of Bot API responses."""
+
+    def check_response(
+        self,
+        bot: Bot,
+        method: TelegramMethod[ResultType],
+        status_code: int,
+        content: str,
+    ) -> Response[ResultType]:
+        """Record response size and validate it as usual."""
+        BOT_API_BYTES_RECEIVED.labels(method=method.__api_method__).inc(len(content.encode()))
+        return super().check_response(bot, method, status_code, content)
+
+
+class BotApiMetrics(BaseRequestMiddleware):
+    """Record latency, errors and payload size of each Bot API call attempt per method."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[ResultType],
+        bot: Bot,
+        method: TelegramMethod[ResultType],
+    ) -> Response[ResultType]:
+        """Make request and record metrics, flood waits of the retry middleware are not part of the latency."""
+        api_method = method.__api_method__
+        BOT_API_BYTES_SENT.labels(method=api_method).inc(payload_size(method))
+
+        start_time = time.perf_counter()
+        try:
+            with BOT_API_IN_FLIGHT.labels(method=api_method).track_inprogress():
+                return await make_request(bot, method)
+        except TelegramAPIError as e:
+            BOT_API_ERRORS.labels(method=api_method, error_type=type(e).__name__).inc()
+            raise
+        finally:
+            latency = time.perf_counter() - start_time
+            BOT_API_LATENCY.labels(method=api_method).observe(latency)
+            record_span(f'api.{api_method}', latency)
@@ -0,0 +1,52 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable
+from typing import Callable
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import CallbackQuery, TelegramObject
+
+from app.metrics import REQUEST_LATENCY
+
+
+logger = logging.getLogger(__name__)
+
+
+class EarlyCallbackAnswer(BaseMiddleware):
+    """Answer callback queries concurrently with the handler so the button spinner stops at once."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, object]], Awaitable[object]],
+        event: TelegramObject,
+        data: dict[str, object],
+    ) -> object:
+        """Start answering the callback and run the handler meanwhile."""
+        if not isinstance(event, CallbackQuery):
+            return await handler(event, data)
+
+        start_time = time.perf_counter()
+        # handlers that answer themselves, e.g. with show_alert, opt out with @flags.late_answer
+        if get_flag(data, 'late_answer'):
+            try:
+                return await handler(event, data)
+            finally:
+                REQUEST_LATENCY.labels(handler='callback_answer_late').observe(time.perf_counter() - start_time)
+
+        answer_task = asyncio.create_task(self._answer(event, start_time))
+        try:
+            return await handler(event, data)
+        finally:
+            await answer_task
+
+    @staticmethod
+    async def _answer(callback: CallbackQuery, start_time: float) -> None:
+        """Acknowledge callback and record perceived latency."""
+        try:
+            await callback.answer()
+        except TelegramAPIError:
+            logger.debug('Failed to answer callback %s early', callback.data)
+        REQUEST_LATENCY.labels(handler='callback_answer_early').observe(time.perf_counter() - start_time)
@@ -0,0 +1,53 @@
+import logging
+import time
+from collections.abc import Awaitable
+from typing import Callable
+
+from aiogram import BaseMiddleware
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import TelegramObject, Update
+from cachetools import TTLCache
+
+import app.constants as cnst
+from app.metrics import SUPPRESSED_CALLBACKS
+
+
+logger = logging.getLogger(__name__)
+
+
+class CallbackDedupMiddleware(BaseMiddleware):
+    """Acknowledge repeated taps on the same button without running the handler again."""
+
+    def __init__(self) -> None:
+        """Initilizer for CallbackDedupMiddleware."""
+        super().__init__()
+        self._in_flight: set[tuple[int, str]] = set()
+        self._recent: TTLCache[tuple[int, str], bool] = TTLCache(
+            maxsize=cnst.THROTTLE_CACHE_SIZE, ttl=cnst.CALLBACK_DEDUP_WINDOW, timer=time.monotonic,
+        )
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, object]], Awaitable[object]],
+        event: TelegramObject,
+        data: dict[str, object],
+    ) -> object:
+        """Suppress a callback if the same one is in flight or was just processed."""
+        if not isinstance(event, Update) or not (callback := event.callback_query) or not callback.data:
+            return await handler(event, data)
+
+        key = (callback.from_user.id, callback.data)
+        if key in self._in_flight or key in self._recent:
+            SUPPRESSED_CALLBACKS.inc()
+            try:
+                await callback.answer()
+            except TelegramAPIError:
+                logger.debug('Failed to answer suppressed callback %s', callback.data)
+            return None
+
+        self._in_flight.add(key)
+        try:
+            return await handler(event, data)
+        finally:
+            self._in_flight.discard(key)
+            self._recent[key] = True
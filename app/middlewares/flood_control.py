@@ -0,0 +1,51 @@
+import asyncio
+import logging
+from typing import TypeVar
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+
+import app.constants as cnst
+from app.metrics import BOT_API_RETRIES
+
+
+logger = logging.getLogger(__name__)
+
+ResultType = TypeVar('ResultType')
+
+
+class FloodControlRetry(BaseRequestMiddleware):
+    """Repeat Bot API calls rejected by flood control after the wait Telegram asks for.
+
+    Registered before BotApiMetrics, so every attempt is measured on its own and the wait is not counted as latency.
+    A call is repeated at most BOT_API_MAX_RETRIES times, then TelegramRetryAfter reaches the caller.
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[ResultType],
+        bot: Bot,
+        method: TelegramMethod[ResultType],
+    ) -> Response[ResultType]:
+        """Make request, waiting and repeating it on flood control."""
+        return await self._request(make_request, bot, method, retries_left=cnst.BOT_API_MAX_RETRIES)
+
+    async def _request(
+        self,
+        make_request: NextRequestMiddlewareType[ResultType],
+        bot: Bot,
+        method: TelegramMethod[ResultType],
+        *,
+        retries_left: int,
+    ) -> Response[ResultType]:
+        try:
+            return await make_request(bot, method)
+        except TelegramRetryAfter as e:
+            if not retries_left:
+                raise
+            BOT_API_RETRIES.labels(method=method.__api_method__).inc()
+            logger.info('Flood control on %s, retrying in %s s', method.__api_method__, e.retry_after)
+            await asyncio.sleep(e.retry_after)
+        return await self._request(make_request, bot, method, retries_left=retries_left - 1)
@@ -4,10 +4,24 @@ from ssl import SSLError
 from typing import Callable
 
 from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.handler import HandlerObject
 from aiogram.exceptions import TelegramNetworkError
 from aiogram.types import TelegramObject, Update
 
-from app.metrics import COMMAND_COUNT, NETWORK_ERRORS, REQUEST_COUNT, REQUEST_LATENCY, SSL_ERRORS
+import app.constants as cnst
+from app.database.instrumentation import count_queries
+from app.metrics import (
+    COMMAND_COUNT,
+    HANDLER_COUNT,
+    HANDLER_LATENCY,
+    HANDLER_WINDOWS,
+    NETWORK_ERRORS,
+    QUERIES_PER_UPDATE,
+    REQUEST_COUNT,
+    REQUEST_LATENCY,
+    SSL_ERRORS,
+)
+from app.tracing import record_span, trace_update
 
 
 class MetricsCollector(BaseMiddleware):
@@ -20,41 +34,41 @@ class MetricsCollector(BaseMiddleware):
         data: dict[str, object],
     ) -> object:
         """Process incoming events with metrics tracking."""
-        start_time = time.time()
+        start_time = time.perf_counter()
         status = 'success'
+        update_id = event.update_id if isinstance(event, Update) else None
 
-        try:
-            result = await handler(event, data)
-            return result
+        with count_queries() as query_stats, trace_update(update_id, self._get_event_type(event)):
+            try:
+                result = await handler(event, data)
+                return result
 
-        except SSLError:
-            SSL_ERRORS.inc()
-            raise
+            except SSLError as e:
+                SSL_ERRORS.labels(error_code=str(e.errno)).inc()
+                raise
 
-        except TelegramNetworkError:
-            NETWORK_ERRORS.labels(error_type='TelegramNetworkError').inc()
-            raise
+            except TelegramNetworkError:
+                NETWORK_ERRORS.labels(error_type='TelegramNetworkError').inc()
+                raise
 
-        except Exception:
-            status = 'error'
-            raise
+            except Exception:
+                status = 'error'
+                raise
 
-        finally:
-            self._record_metrics(event, start_time, status)
+            finally:
+                self._record_metrics(event, start_time, status, query_stats.count)
 
-    def _record_metrics(self, event: TelegramObject, start_time: float, status: str) -> None:
+    def _record_metrics(self, event: TelegramObject, start_time: float, status: str, query_count: int) -> None:
         """Record all metrics for the processed event."""
-        latency = time.time() - start_time
+        latency = time.perf_counter() - start_time
         event_type = self._get_event_type(event)
-        command = self._get_command(event)
 
         REQUEST_LATENCY.labels(handler=event_type).observe(latency)
         REQUEST_COUNT.labels(handler=event_type, status=status).inc()
+        QUERIES_PER_UPDATE.observe(query_count)
 
-        if command:
+        if command := self._get_command(event):
             COMMAND_COUNT.labels(command=command).inc()
-            if command == 'dr_':
-                REQUEST_LATENCY.labels(handler='dr_participate').observe(latency)
 
     @staticmethod
     def _get_event_type(event: TelegramObject) -> str:
@@ -64,6 +78,8 @@ class MetricsCollector(BaseMiddleware):
                 return 'message'
             if event.callback_query:
                 return 'callback_query'
+            if event.inline_query:
+                return 'inline_query'
             if event.edited_message:
                 return 'edited_message'
             if event.channel_post:
@@ -72,7 +88,43 @@ class MetricsCollector(BaseMiddleware):
 
     @staticmethod
     def _get_command(event: TelegramObject) -> str | None:
-        """Extract command from event data."""
+        """Extract command from event data, unknown commands share one label."""
         if isinstance(event, Update) and (msg := event.message) and msg.text and msg.text.startswith('/'):
-            return msg.text.split()[0][1:]
+            command = msg.text.split()[0][1:].split('@')[0].lower()
+            return command if command in cnst.KNOWN_COMMANDS else 'other'
         return None
+
+
+class HandlerMetrics(BaseMiddleware):
+    """Record latency of the handler which actually processed the event."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, object]], Awaitable[object]],
+        event: TelegramObject,
+        data: dict[str, object],
+    ) -> object:
+        """Time the resolved handler and label it with router and function name."""
+        name = handler_name(data)
+        start_time = time.perf_counter()
+        status = 'success'
+        try:
+            return await handler(event, data)
+        except Exception:
+            status = 'error'
+            raise
+        finally:
+            latency = time.perf_counter() - start_time
+            HANDLER_LATENCY.labels(handler=name).observe(latency)
+            HANDLER_WINDOWS[name].add(latency, failed=status == 'error')
+            record_span(f'handler.{name}', latency)
+            HANDLER_COUNT.labels(handler=name, status=status).inc()
+
+
+def handler_name(data: dict[str, object]) -> str:
+    """Return 'router.function' label of the handler resolved by aiogram."""
+    handler_object = data.get('handler')
+    if not isinstance(handler_object, HandlerObject):
+        return 'unknown'
+    callback = handler_object.callback
+    return f"{callback.__module__.rsplit('.', 1)[-1]}.{callback.__name__}"
@@ -0,0 +1,41 @@
+from collections.abc import Awaitable
+from typing import Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, Message, TelegramObject
+
+from app.cache.user_cache import UserData
+from app.callback_data import unpack
+from app.routing import DispatchIndex, dispatch_index
+from app.tracing import span
+
+
+class RoutingMiddleware(BaseMiddleware):
+    """Decode and resolve the handler route of a message or callback query once per update."""
+
+    def __init__(self, index: DispatchIndex = dispatch_index) -> None:
+        """Initilizer for RoutingMiddleware."""
+        super().__init__()
+        self.index = index
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, object]], Awaitable[object]],
+        event: TelegramObject,
+        data: dict[str, object],
+    ) -> object:
+        """Put resolved route, parsed command or decoded callback data into handler context."""
+        user_data = data.get('user_data')
+        if not isinstance(user_data, UserData):
+            user_data = None
+        with span('routing'):
+            if isinstance(event, Message):
+                bot_username = (await event.bot.me()).username if event.bot else None
+                data['route'], command = self.index.resolve_message(event, user_data, bot_username=bot_username)
+                if command:
+                    data['command'] = command
+            elif isinstance(event, CallbackQuery):
+                callback_data = unpack(event.data) if event.data else None
+                data['callback_data'] = callback_data
+                data['route'] = self.index.resolve_callback(callback_data, user_data)
+        return await handler(event, data)
@@ -0,0 +1,49 @@
+import logging
+from collections.abc import Awaitable
+from typing import Callable
+
+from aiogram import BaseMiddleware
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import TelegramObject, Update
+
+from app.cache.rate_limiter import RateLimiter, rate_limiter
+from app.metrics import THROTTLED_UPDATES
+
+
+logger = logging.getLogger(__name__)
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """Drop updates from users who exceed the rate limit before they reach the database."""
+
+    def __init__(self, limiter: RateLimiter = rate_limiter) -> None:
+        """Initilizer for ThrottlingMiddleware."""
+        super().__init__()
+        self.limiter = limiter
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, object]], Awaitable[object]],
+        event: TelegramObject,
+        data: dict[str, object],
+    ) -> object:
+        """Pass the update further only if the user has tokens left."""
+        if isinstance(event, Update):
+            if event.message and event.message.from_user:
+                user_id, event_type = event.message.from_user.id, 'message'
+            elif event.callback_query:
+                user_id, event_type = event.callback_query.from_user.id, 'callback_query'
+            else:
+                return await handler(event, data)
+
+            if not self.limiter.consume(user_id):
+                THROTTLED_UPDATES.labels(event_type=event_type).inc()
+                logger.debug('Update from user %s dropped by throttling', user_id)
+                if event.callback_query:
+                    try:
+                        await event.callback_query.answer()
+                    except TelegramAPIError:
+                        logger.debug('Failed to answer throttled callback of user %s', user_id)
+                return None
+
+        return await handler(event, data)
@@ -5,7 +5,9 @@ from typing import Callable
 from aiogram import BaseMiddleware
 from aiogram.types import CallbackQuery, Message, TelegramObject, Update
 
+from app.cache.activity_tracker import activity_tracker
 from app.services.user_manager import create_user_if_not_exists, get_user_with_cache
+from app.tracing import span
 
 
 logger = logging.getLogger(__name__)
@@ -37,16 +39,18 @@ class UserDataMiddleware(BaseMiddleware):
                 return await handler(event, data)
 
             user_id = from_user.id
+            activity_tracker.seen(user_id)
 
-            user_data = await get_user_with_cache(user_id)
+            with span('user_data'):
+                user_data = await get_user_with_cache(user_id)
 
-            if not user_data:
-                user_data = await create_user_if_not_exists(
-                    user_id=user_id,
-                    first_name=from_user.first_name,
-                    last_name=from_user.last_name,
-                    username=from_user.username,
-                )
+                if not user_data:
+                    user_data = await create_user_if_not_exists(
+                        user_id=user_id,
+                        first_name=from_user.first_name,
+                        last_name=from_user.last_name,
+                        username=from_user.username,
+                    )
 
             data['user_data'] = user_data
             data['user_role'] = user_data.role
@@ -0,0 +1,173 @@
+import asyncio
+import cProfile
+import html
+import io
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from operator import itemgetter
+from pathlib import Path
+from types import FrameType
+
+import psutil
+
+import app.constants as cnst
+from app.cache.code_entry_cache import code_entry_cache
+from app.cache.rate_limiter import rate_limiter
+from app.cache.user_cache import user_cache
+from app.database.session import session_factory
+from app.metrics import HANDLER_WINDOWS
+
+
+_profiling_lock = asyncio.Lock()
+
+
+class StackSampler(threading.Thread):
+    """Background thread which periodically samples stack of another thread."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        """Sampler initialization, nothing is sampled until the thread is started."""
+        super().__init__(name='stack-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        """Sample target thread until stopped."""
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # noqa: SLF001
+            if frame is not None:
+                self.stacks[self._collapse(frame)] += 1
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the thread to exit."""
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        """Return samples in collapsed stack format accepted by flamegraph.pl and speedscope."""
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+    @staticmethod
+    def _collapse(frame: FrameType) -> str:
+        names = []
+        current: FrameType | None = frame
+        while current is not None:
+            code = current.f_code
+            names.append(f'{Path(code.co_filename).stem}.{code.co_qualname}')
+            current = current.f_back
+        return ';'.join(reversed(names))
+
+
+def is_profiling() -> bool:
+    """Check if a profiling session is already running."""
+    return _profiling_lock.locked()
+
+
+async def profile_event_loop(seconds: float) -> tuple[str, str]:
+    """Profile event loop thread for given time, return collapsed stacks and pstats summary."""
+    async with _profiling_lock:
+        sampler = StackSampler(threading.get_ident(), cnst.PROFILE_SAMPLE_INTERVAL)
+        profiler = cProfile.Profile()
+        sampler.start()
+        profiler.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+            sampler.stop()
+
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(cnst.PROFILE_TOP_FUNCTIONS)
+    return sampler.collapsed(), summary.getvalue()
+
+
+class HeapTracker:
+    """Compare tracemalloc snapshots taken at two points in time."""
+
+    def __init__(self) -> None:
+        """Tracker initialization, tracing starts only on demand."""
+        self._initial: tracemalloc.Snapshot | None = None
+        self._baselines: dict[str, tracemalloc.Snapshot] = {}
+
+    @property
+    def active(self) -> bool:
+        """Check if allocations are being traced."""
+        return tracemalloc.is_tracing() and self._initial is not None
+
+    def start(self) -> None:
+        """Start tracing allocations and take initial snapshot."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(cnst.HEAP_TRACE_FRAMES)
+        self._initial = self._snapshot()
+        self._baselines.clear()
+
+    def stop(self) -> None:
+        """Stop tracing and drop all snapshots."""
+        tracemalloc.stop()
+        self._initial = None
+        self._baselines.clear()
+
+    async def report(self, consumer: str) -> str:
+        """Return top growing allocation sites since previous report for the same consumer.
+
+        Live caches and sessions are counted on the event loop, only snapshots are compared in a worker thread.
+        """
+        identity_maps = session_factory.identity_map_sizes()
+        live = [
+            f'UserCache entries: {len(user_cache)}',
+            f'CodeEntryCache entries: {len(code_entry_cache)}',
+            f'RateLimiter buckets: {len(rate_limiter)}',
+            f'Identity maps: {len(identity_maps)} sessions, {sum(identity_maps)} objects',
+        ]
+        return await asyncio.to_thread(self._report, consumer, live)
+
+    def _report(self, consumer: str, live: list[str]) -> str:
+        baseline = self._baselines.get(consumer, self._initial)
+        if baseline is None:
+            raise RuntimeError('Heap tracking is not started')
+        snapshot = self._snapshot()
+        growth = [stat for stat in snapshot.compare_to(baseline, 'lineno') if stat.size_diff > 0]
+        self._baselines[consumer] = snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [
+            f'RSS: {psutil.Process().memory_info().rss / 2**20:.1f} MiB',
+            f'Traced: {current / 2**20:.1f} MiB, peak {peak / 2**20:.1f} MiB',
+            *live,
+            '',
+            f'Top {cnst.HEAP_TOP_SITES} growing allocation sites:',
+        ]
+        for stat in growth[:cnst.HEAP_TOP_SITES]:
+            frame = stat.traceback[0]
+            lines.append(f'{stat.size_diff / 1024:+.1f} KiB {stat.count_diff:+d} blocks  '
+                         f'{frame.filename}:{frame.lineno}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),
+            tracemalloc.Filter(inclusive=False, filename_pattern='<frozen importlib._bootstrap*>'),
+        ))
+
+
+heap_tracker = HeapTracker()
+
+
+def perf_report() -> str:
+    """Return compact latency, cache and DB pool summary for the /perf command."""
+    rows = sorted(((name, *window.summary()) for name, window in HANDLER_WINDOWS.items()),
+                  key=itemgetter(3), reverse=True)
+    lines = ['handler  n  p50/p95/p99 ms  errors']
+    for name, count, p50, p95, p99, error_rate in rows[:cnst.PERF_TOP_HANDLERS]:
+        lines.append(f'{name}  {count}  {p50 * 1000:.0f}/{p95 * 1000:.0f}/{p99 * 1000:.0f}  {error_rate:.1%}')
+    lookups = user_cache.hits + user_cache.misses
+    lines += [
+        '',
+        f'UserCache hit ratio: {user_cache.hits / lookups if lookups else 0:.1%} of {lookups}',
+        f'DB pool: {session_factory.engine.pool.status()}',
+    ]
+    return html.escape('\n'.join(lines))
@@ -0,0 +1,140 @@
+import itertools
+from collections.abc import Iterator
+from operator import attrgetter
+
+from aiogram import Router
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.filters import CommandObject
+from aiogram.types import Message
+
+from app.cache.user_cache import UserData
+from app.callback_data import CallbackAction, CallbackData
+from app.filters import CallbackRoute, MessageRoute, Route
+
+
+_by_order = attrgetter('order')
+
+
+class _TrieNode:
+    __slots__ = ('children', 'routes')
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.routes: list[Route] = []
+
+
+class PrefixTrie:
+    """Character trie returning routes of all registered prefixes of a string."""
+
+    def __init__(self) -> None:
+        """Create empty trie."""
+        self._root = _TrieNode()
+
+    def insert(self, prefix: str, route: Route) -> None:
+        """Register route under prefix."""
+        node = self._root
+        for char in prefix:
+            node = node.children.setdefault(char, _TrieNode())
+        node.routes.append(route)
+
+    def match(self, text: str) -> list[Route]:
+        """Return routes whose prefix text starts with, walk is bounded by the longest prefix."""
+        node = self._root
+        found = list(node.routes)
+        for char in text:
+            next_node = node.children.get(char)
+            if next_node is None:
+                break
+            node = next_node
+            found.extend(node.routes)
+        return found
+
+
+class DispatchIndex:
+    """Lookup tables built from registered routes, resolve an update without evaluating every handler filter."""
+
+    def __init__(self) -> None:
+        """Create empty index, it is filled by build."""
+        self.commands: dict[str, list[Route]] = {}
+        self.texts: dict[str, list[Route]] = {}
+        self.states: dict[str, list[Route]] = {}
+        self.text_prefixes = PrefixTrie()
+        self.callbacks: dict[CallbackAction, list[Route]] = {}
+
+    def build(self, router: Router) -> None:
+        """Index routes of router and its sub-routers in the same order aiogram propagates events."""
+        order = itertools.count()
+        for current in self._walk(router):
+            for route in self._routes(current.message.handlers):
+                if isinstance(route, MessageRoute):
+                    route.order = next(order)
+                    self._add_message_route(route)
+            for route in self._routes(current.callback_query.handlers):
+                if isinstance(route, CallbackRoute):
+                    route.order = next(order)
+                    self.callbacks.setdefault(route.action, []).append(route)
+
+    def resolve_message(self, message: Message, user_data: UserData | None, *,
+                        bot_username: str | None) -> tuple[MessageRoute | None, CommandObject | None]:
+        """Return the first route accepting the message and the parsed command if there is one.
+
+        Commands addressed to another bot, e.g. /start@other_bot in a group, do not match command routes.
+        """
+        candidates: list[Route] = []
+        command = None
+        if (text := message.text or message.caption) and text.startswith('/'):
+            command = self._parse_command(text)
+            if command.mention is None or command.mention.lower() == (bot_username or '').lower():
+                candidates += self.commands.get(command.command, ())
+        if message.text:
+            candidates += self.texts.get(message.text.lower(), ())
+            candidates += self.text_prefixes.match(message.text)
+        if user_data:
+            candidates += self.states.get(user_data.state.partition(':')[0], ())
+        for route in sorted(candidates, key=_by_order):
+            if isinstance(route, MessageRoute) and route.accepts(message, user_data):
+                return route, command
+        return None, command
+
+    def resolve_callback(self, callback_data: CallbackData | None, user_data: UserData | None) -> CallbackRoute | None:
+        """Return the first route of decoded callback action allowed for the user."""
+        if callback_data is None:
+            return None
+        for route in self.callbacks.get(callback_data.action, ()):
+            if isinstance(route, CallbackRoute) and route.allows(user_data):
+                return route
+        return None
+
+    def _add_message_route(self, route: MessageRoute) -> None:
+        for command in route.commands:
+            self.commands.setdefault(command, []).append(route)
+        for text in route.texts:
+            self.texts.setdefault(text, []).append(route)
+        if route.text_prefix:
+            self.text_prefixes.insert(route.text_prefix, route)
+        if route.state:
+            self.states.setdefault(route.state, []).append(route)
+
+    @classmethod
+    def _walk(cls, router: Router) -> Iterator[Router]:
+        yield router
+        for sub_router in router.sub_routers:
+            yield from cls._walk(sub_router)
+
+    @staticmethod
+    def _routes(handlers: list[HandlerObject]) -> Iterator[Route]:
+        for handler in handlers:
+            for filter_object in handler.filters or ():
+                # aiogram keeps Filter instances as the callback itself, its Callable annotation hides that from mypy
+                callback: object = filter_object.callback
+                if isinstance(callback, Route):
+                    yield callback
+
+    @staticmethod
+    def _parse_command(text: str) -> CommandObject:
+        full_command, *args = text.split(maxsplit=1)
+        command, _, mention = full_command[1:].partition('@')
+        return CommandObject(prefix='/', command=command, mention=mention or None, args=args[0] if args else None)
+
+
+dispatch_index = DispatchIndex()
@@ -1,16 +1,35 @@
-from datetime import datetime
+import asyncio
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
 
 import pytz
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramBadRequest
+from sqlalchemy.exc import SQLAlchemyError
 
+import app.constants as cnst
+import app.keyboards as kb
+from app.cache.activity_tracker import activity_tracker
+from app.database.models.enums import UploadState
+from app.database.repositories.base import GenericSqlRepository, ModelType
+from app.database.repositories.const_repo import ConstantMessageRepository
+from app.database.repositories.temp_repo import TemporaryMessageRepository
 from app.database.uow import UnitOfWork
+from app.metrics import ACTIVE_USERS, GC_RECLAIMED
+from app.profiling import heap_tracker
+from app.tracing import trace_store
+
+
+logger = logging.getLogger(__name__)
 
 
 async def check_outdated() -> None:
-    """Remove all temporary entries which have expired."""
+    """Mark all temporary entries which have expired as deleted."""
     moscow_tz = pytz.timezone('Europe/Moscow')
     today = datetime.now(moscow_tz)
     async with UnitOfWork(auto_commit=True) as uow:
-        all_temp = await uow.temp.find(filters={})
+        all_temp = await uow.temp.find(filters={'status': UploadState.UPLOADED})
         for temp_message in all_temp:
             day = int(temp_message.date.split('.')[0])
             month = int(temp_message.date.split('.')[1])
@@ -18,4 +37,98 @@ async def check_outdated() -> None:
             date = datetime(year, month, day, 22, 30, tzinfo=moscow_tz)
 
             if today > date:
-                await uow.temp.delete(temp_message)
+                await uow.temp.update_fields(filters={'id': temp_message.id},
+                                            update_values={'status': UploadState.DELETED})
+    kb.invalidate_catalog()
+
+
+async def collect_garbage(bot: Bot) -> None:
+    """Remove abandoned drafts and deleted entries together with their vault copies."""
+    now = datetime.now(pytz.utc)
+    drafts_before = now - timedelta(seconds=cnst.DRAFT_TTL)
+    await _sweep_stale(lambda uow: uow.files, UploadState.UNFINISHED, drafts_before, kind='draft')
+    await _sweep_stale(lambda uow: uow.const, UploadState.UNFINISHED, drafts_before, kind='draft')
+    await _sweep_stale(lambda uow: uow.temp, UploadState.UNFINISHED, drafts_before, kind='draft')
+    await _sweep_stale(lambda uow: uow.files, UploadState.DELETED, now, kind='deleted')
+
+    while True:
+        removed = (await _purge_deleted_messages(bot, lambda uow: uow.const)
+                   + await _purge_deleted_messages(bot, lambda uow: uow.temp))
+        if not removed:
+            return
+
+
+async def purge_expired_invites() -> None:
+    """Remove unused invites which have expired."""
+    async with UnitOfWork(auto_commit=True) as uow:
+        removed = await uow.invites.purge_expired()
+    GC_RECLAIMED.labels(kind='invite').inc(removed)
+
+
+async def _sweep_stale(repo_of: Callable[[UnitOfWork], GenericSqlRepository[ModelType]], status: UploadState,
+                       before: datetime, *, kind: str) -> None:
+    """Delete entries with given status in batches until nothing stale is left, one short commit per batch."""
+    while True:
+        async with UnitOfWork(auto_commit=True) as uow:
+            removed = await repo_of(uow).delete_stale(filters={'status': status}, before=before,
+                                                      limit=cnst.GC_BATCH_SIZE)
+        GC_RECLAIMED.labels(kind=kind).inc(removed)
+        if removed < cnst.GC_BATCH_SIZE:
+            return
+
+
+async def _purge_deleted_messages(
+    bot: Bot,
+    repo_of: Callable[[UnitOfWork], ConstantMessageRepository | TemporaryMessageRepository],
+) -> int:
+    """Delete vault copies of one batch of deleted entries outside of any transaction, then the entries themselves."""
+    async with UnitOfWork(auto_commit=False) as uow:
+        entries = await repo_of(uow).find(filters={'status': UploadState.DELETED}, limit=cnst.GC_BATCH_SIZE)
+    reclaimed_ids = []
+    for entry in entries:
+        if entry.message_id:
+            try:
+                await bot.delete_message(entry.chat_id, entry.message_id)
+                GC_RECLAIMED.labels(kind='vault_message').inc()
+            except TelegramBadRequest:
+                logger.debug('Vault message %s is already gone or too old to delete', entry.message_id)
+            except TelegramAPIError:
+                logger.warning('Failed to delete vault message %s, will retry later', entry.message_id)
+                continue
+            await asyncio.sleep(cnst.GC_VAULT_DELAY)
+        reclaimed_ids.append(entry.id)
+
+    if not reclaimed_ids:
+        return 0
+    async with UnitOfWork(auto_commit=True) as uow:
+        removed = await repo_of(uow).delete_by_ids(reclaimed_ids)
+    GC_RECLAIMED.labels(kind='deleted').inc(removed)
+    return removed
+
+
+async def flush_activity() -> None:
+    """Export active user estimates and write last seen times collected since the previous run."""
+    daily, monthly = activity_tracker.estimates()
+    ACTIVE_USERS.labels(window='day').set(daily)
+    ACTIVE_USERS.labels(window='month').set(monthly)
+    seen = activity_tracker.drain()
+    for start in range(0, len(seen), cnst.ACTIVITY_FLUSH_BATCH):
+        batch = seen[start:start + cnst.ACTIVITY_FLUSH_BATCH]
+        try:
+            async with UnitOfWork(auto_commit=True) as uow:
+                await uow.users.touch_last_seen(batch)
+        except SQLAlchemyError:
+            activity_tracker.restore(seen[start:])
+            raise
+
+
+async def report_heap_growth() -> None:
+    """Log top growing allocation sites while heap tracking is on."""
+    if heap_tracker.active:
+        report = await heap_tracker.report('job')
+        logger.info('Heap growth in the last %d minutes:\n%s', cnst.HEAP_REPORT_INTERVAL_MINUTES, report)
+
+
+async def flush_traces() -> None:
+    """Write traces exported since the previous run."""
+    await trace_store.flush()
@@ -1,5 +1,6 @@
 import logging
 from datetime import datetime, timedelta
+from typing import NoReturn
 
 import app.constants as cnst
 import pytz
@@ -7,7 +8,6 @@ from app.cache.code_entry_cache import code_entry_cache
 from app.cache.user_cache import user_cache
 from app.database.models import AdminInvite, User
 from app.database.models.enums import UserRole
-from app.database.models.user_states import UserState
 from app.database.uow import UnitOfWork
 from app.exceptions import NotFoundError, NotUsableCodeError
 from app.helpers import create_random_code
@@ -35,35 +35,59 @@ class InviteManager:
                 role=role,
                 made_by_id=creator['user_id'],
                 made_by_name=creator_name,
+                expires_at=self._expiry_time(),
             )
             await self.uow.invites.add(invite)
             await self.uow.commit()
 
         return code
 
+    async def generate_invites(self, *, creator: dict[str, int | str | None], role: UserRole, count: int) -> list[str]:
+        """Generate a batch of invitation codes with one bulk insert."""
+        codes = [f'AD_{create_random_code(cnst.CODE_LENGTH)}' for _ in range(count)]
+        creator_name = self._format_user_name(creator)
+        expires_at = self._expiry_time()
+
+        async with self.uow:
+            await self.uow.invites.add_many([
+                {
+                    'code': code,
+                    'was_used': False,
+                    'role': role,
+                    'made_by_id': creator['user_id'],
+                    'made_by_name': creator_name,
+                    'expires_at': expires_at,
+                }
+                for code in codes
+            ])
+            await self.uow.commit()
+
+        return codes
+
     async def use_invite(self, code: str, user_id: int, *, user: dict[str, int | str | None]) -> UserRole:
         """Redeem an invitation code and grant an admin role."""
         self._check_attempts(user_id)
 
         async with self.uow:
             try:
-                invite = await self._get_valid_invite(code, user_id)
-                user_name = self._format_user_name(user)
-                current_user = await self.uow.users.get_by_filter(filters={'user_id': user_id})
-
-                self._validate_invite_usage(invite, current_user)
-
-                await self._update_user_role(user_id, user, invite.role)
-                await self._mark_invite_used(code, user_id, user_name)
+                role = await self.uow.invites.redeem(code, user_id, user_name=self._format_user_name(user), user=user)
+                if role is None:
+                    await self._raise_redeem_error(code, user_id)
+                await self.uow.commit()
 
                 user_cache.clear(user_id)
-                return invite.role
+                return role
 
             except Exception as e:
                 if not isinstance(e, NotFoundError):
                     code_entry_cache.record_attempt(user_id)
                 raise
 
+    @staticmethod
+    def _expiry_time() -> datetime:
+        """Return expiry moment for invites created now."""
+        return datetime.now(pytz.utc) + timedelta(seconds=cnst.INVITE_TTL)
+
     @staticmethod
     def _format_user_name(user_data: dict[str, int | str | None]) -> str:
         """Format user name from available data."""
@@ -79,11 +103,15 @@ class InviteManager:
     @staticmethod
     def _check_attempts(user_id: int) -> None:
         """Validate user attempt to use codes."""
-        attempts, last_attempt = code_entry_cache.get_attempts(user_id)
-        if attempts >= cnst.MAX_ATTEMPTS:
-            if datetime.now(pytz.timezone('Europe/Moscow')) - last_attempt < timedelta(seconds=cnst.BLOCK_TIME):
-                raise NotUsableCodeError('too_many_attempts')
-            code_entry_cache.reset_attempts(user_id)
+        if code_entry_cache.is_blocked(user_id):
+            raise NotUsableCodeError('too_many_attempts')
+
+    async def _raise_redeem_error(self, code: str, user_id: int) -> NoReturn:
+        """Explain why an invitation could not be redeemed."""
+        invite = await self._get_valid_invite(code, user_id)
+        current_user = await self.uow.users.get_by_filter(filters={'user_id': user_id})
+        self._validate_invite_usage(invite, current_user)
+        raise NotUsableCodeError('already_used')
 
     async def _get_valid_invite(self, code: str, user_id: int) -> AdminInvite:
         """Retrieve and validate invitation."""
@@ -99,34 +127,9 @@ class InviteManager:
         """Check if the invite can be used."""
         if invite.was_used:
             raise NotUsableCodeError('already_used')
+        if invite.expires_at <= datetime.now(pytz.utc):
+            raise NotUsableCodeError('expired')
         if user and user.role in (UserRole.SUPERADMIN, UserRole.OWNER):
             raise NotUsableCodeError('already_superadmin')
         if user and user.role == UserRole.ADMIN and invite.role == UserRole.ADMIN:
             raise NotUsableCodeError('already_admin')
-
-    async def _update_user_role(self, user_id: int, user_data: dict[str, int | str | None], role: UserRole) -> None:
-        """Update or create a user entry with new role."""
-        await self.uow.users.upsert(
-            conflict_columns=['user_id'],
-            insert_values={
-                'user_id': user_id,
-                'first_name': user_data['first_name'],
-                'last_name': user_data.get('last_name'),
-                'username': user_data.get('username'),
-                'state': UserState.DEFAULT,
-                'role': role,
-            },
-            update_values={'role': role},
-        )
-
-    async def _mark_invite_used(self, code: str, user_id: int, user_name: str) -> None:
-        """Mark invitation as used."""
-        await self.uow.invites.update_fields(
-            filters={'code': code},
-            update_values={
-                'was_used': True,
-                'used_by_id': user_id,
-                'used_by_name': user_name,
-            },
-        )
-        await self.uow.commit()
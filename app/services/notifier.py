@@ -0,0 +1,107 @@
+import asyncio
+import logging
+from typing import Optional
+
+import app.constants as cnst
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramForbiddenError
+from aiogram.utils.deep_linking import create_start_link
+from app.cache.catalog_index import deep_link_token
+from app.callback_data import CallbackAction
+from app.database.uow import UnitOfWork
+from app.metrics import NOTIFICATIONS_SENT
+from app.services.text_manager import text_manager
+from sqlalchemy.exc import SQLAlchemyError
+
+
+logger = logging.getLogger(__name__)
+
+
+class Notifier:
+    """Fan out new catalog entries to category subscribers through a bounded, rate-limited send queue."""
+
+    _instance: Optional['Notifier'] = None
+
+    def __init__(self) -> None:
+        """Notifier initialization, nothing is sent until the worker is started."""
+        self._queue: asyncio.Queue[tuple[int, str]] = asyncio.Queue(maxsize=cnst.NOTIFY_QUEUE_SIZE)
+        self._fan_outs: set[asyncio.Task[None]] = set()
+        self._bot: Bot | None = None
+
+    @classmethod
+    def get(cls) -> 'Notifier':
+        """Get singleton notifier instance."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def start(self, bot: Bot) -> asyncio.Task[None]:
+        """Start the send worker, the caller cancels the returned task on shutdown."""
+        self._bot = bot
+        return asyncio.create_task(self._send_loop(bot))
+
+    def publish(self, category: str, action: CallbackAction, entity_id: int, name: str) -> None:
+        """Notify subscribers of category about a new entry in the background, returns immediately."""
+        if self._bot is None:
+            return
+        token = deep_link_token(action, entity_id)
+        task = asyncio.create_task(self._fan_out(self._bot, category, token, name))
+        self._fan_outs.add(task)
+        task.add_done_callback(self._fan_outs.discard)
+
+    async def _fan_out(self, bot: Bot, category: str, token: str, name: str) -> None:
+        """Stream subscribers in keyset batches into the queue, a full queue holds the stream back."""
+        try:
+            link = await create_start_link(bot, token)
+            text, _ = text_manager.get('PUBLIC_COMMANDS', 'NEW_ENTRY', category_name=category, name=name, link=link)
+            after_user_id = 0
+            while True:
+                async with UnitOfWork(auto_commit=False) as uow:
+                    user_ids = await uow.subscriptions.subscriber_batch(
+                        category, after_user_id=after_user_id, limit=cnst.NOTIFY_BATCH_SIZE)
+                for user_id in user_ids:
+                    await self._queue.put((user_id, text))
+                if len(user_ids) < cnst.NOTIFY_BATCH_SIZE:
+                    return
+                after_user_id = user_ids[-1]
+        except (SQLAlchemyError, TelegramAPIError):
+            logger.exception('Fan-out of %s to %s subscribers failed', token, category)
+        except Exception:
+            logger.exception('Unexpected error in fan-out of %s to %s subscribers', token, category)
+
+    async def _send_loop(self, bot: Bot) -> None:
+        """Send queued notifications no faster than the configured rate."""
+        interval = 1 / cnst.NOTIFY_RATE
+        while True:
+            user_id, text = await self._queue.get()
+            try:
+                await self._send(bot, user_id, text)
+            except Exception:
+                logger.exception('Unexpected error while notifying %s', user_id)
+            finally:
+                self._queue.task_done()
+            await asyncio.sleep(interval)
+
+    async def _send(self, bot: Bot, user_id: int, text: str) -> None:
+        """Send one notification, drop subscriptions of a user who blocked the bot."""
+        try:
+            await bot.send_message(user_id, text)
+            NOTIFICATIONS_SENT.labels(status='sent').inc()
+        except TelegramForbiddenError:
+            NOTIFICATIONS_SENT.labels(status='blocked').inc()
+            await self._unsubscribe(user_id)
+        except TelegramAPIError as e:
+            NOTIFICATIONS_SENT.labels(status='failed').inc()
+            logger.warning('Notification to %s failed: %s', user_id, e)
+
+    @staticmethod
+    async def _unsubscribe(user_id: int) -> None:
+        """Drop subscriptions of a user who blocked the bot."""
+        try:
+            async with UnitOfWork(auto_commit=True) as uow:
+                await uow.subscriptions.unsubscribe_all(user_id)
+        except SQLAlchemyError:
+            logger.exception('Failed to drop subscriptions of %s', user_id)
+
+
+notifier = Notifier.get()
@@ -0,0 +1,88 @@
+import hashlib
+import heapq
+from typing import NamedTuple, Optional
+
+import app.const_texts as txts
+import app.constants as cnst
+from app.callback_data import CallbackAction
+from app.database.models.enums import UploadState
+from app.database.repositories.const_repo import ConstantMessageRepository
+from app.database.repositories.file_repo import FileRepository
+from app.database.repositories.temp_repo import TemporaryMessageRepository
+from app.database.uow import UnitOfWork
+from cachetools import LRUCache
+
+
+CatalogRepository = FileRepository | ConstantMessageRepository | TemporaryMessageRepository
+
+
+class SearchHit(NamedTuple):
+    """One ranked search result and the button action which opens it."""
+
+    rank: float
+    action: CallbackAction
+    entity_id: int
+    name: str
+
+
+class CatalogSearch:
+    """Ranked name search over files, constant and temporary messages with LRU cache of popular queries."""
+
+    _instance: Optional['CatalogSearch'] = None
+    _results: LRUCache[str, tuple[SearchHit, ...]]
+    _queries: LRUCache[str, str]
+
+    def __init__(self) -> None:
+        """Search initialization."""
+        self._results = LRUCache(maxsize=cnst.SEARCH_CACHE_SIZE)
+        self._queries = LRUCache(maxsize=cnst.SEARCH_TOKEN_CACHE_SIZE)
+
+    @classmethod
+    def get(cls) -> 'CatalogSearch':
+        """Get singleton search instance."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Lowercase query, collapse whitespace and cut to the maximal length."""
+        return ' '.join(query.lower().split())[:cnst.SEARCH_MAX_QUERY_LENGTH]
+
+    def token(self, query: str) -> str:
+        """Return short token of normalized query which fits into callback data."""
+        token = hashlib.blake2s(query.encode(), digest_size=6).hexdigest()
+        self._queries[token] = query
+        return token
+
+    def query_by_token(self, token: str) -> str | None:
+        """Return query of a token, None if it was evicted."""
+        return self._queries.get(token)
+
+    async def search(self, query: str) -> tuple[SearchHit, ...]:
+        """Return best matches of normalized query across the catalog, best first."""
+        if (hits := self._results.get(query)) is not None:
+            return hits
+        filters: dict[str, int | str | None] = {'status': UploadState.UPLOADED}
+        limit = cnst.SEARCH_MAX_RESULTS
+        async with UnitOfWork(auto_commit=False) as uow:
+            # bot pictures are stored as files but are not catalog entries, as in CatalogIndex
+            repositories: tuple[tuple[CatalogRepository, CallbackAction, tuple[str, ...]], ...] = (
+                (uow.files, CallbackAction.FILE, (txts.FILE_BOT_PICS,)),
+                (uow.const, CallbackAction.CONST, ()),
+                (uow.temp, CallbackAction.TEMP, ()),
+            )
+            found = [
+                SearchHit(row.rank, action, row.id, row.name)
+                for repo, action, excluded in repositories
+                for row in await repo.search_by_name(query, filters, limit=limit, exclude_categories=excluded)
+            ]
+        hits = self._results[query] = tuple(heapq.nlargest(limit, found, key=lambda hit: hit.rank))
+        return hits
+
+    def invalidate(self) -> None:
+        """Drop cached results after catalog changes, tokens stay valid."""
+        self._results.clear()
+
+
+catalog_search = CatalogSearch.get()
@@ -111,3 +111,38 @@ async def create_user_if_not_exists(
         )
         cache.set_user(user_data)
         return user_data
+
+
+async def refresh_profile(
+    user_data: UserData | None,
+    user_id: int,
+    first_name: Optional[str],
+    last_name: Optional[str] = None,
+    username: Optional[str] = None,
+) -> None:
+    """Store profile and reset state, skip the write if cached data is already up to date."""
+    profile = (first_name or None, last_name or None, username or None)
+    if (user_data and user_data.state == UserState.DEFAULT
+            and (user_data.first_name, user_data.last_name, user_data.username) == profile):
+        return
+
+    profile_values: dict[str, int | str | None] = {
+        'user_id': user_id,
+        'first_name': first_name,
+        'last_name': last_name or None,
+        'username': username or None,
+        'state': UserState.DEFAULT,
+    }
+    async with UnitOfWork(auto_commit=True) as uow:
+        await uow.users.upsert(
+            conflict_columns=['user_id'],
+            insert_values={**profile_values, 'role': UserRole.DEFAULT},
+            update_values=profile_values,
+        )
+
+    cache = UserCache.instance()
+    if user_data:
+        cache.set_user(user_data._replace(first_name=profile[0], last_name=profile[1], username=profile[2],
+                                          state=UserState.DEFAULT))
+    else:
+        cache.clear(user_id)
@@ -0,0 +1,143 @@
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import app.constants as cnst
+
+
+logger = logging.getLogger(__name__)
+
+
+class Trace:
+    """Timing breakdown of one update, spans with the same name are aggregated."""
+
+    __slots__ = ('duration', 'event_type', 'sampled', 'spans', 'start', 'started_at', 'update_id')
+
+    def __init__(self, update_id: int | None, event_type: str, *, sampled: bool) -> None:
+        """Start trace clock."""
+        self.update_id = update_id
+        self.event_type = event_type
+        self.sampled = sampled
+        self.started_at = datetime.now(timezone.utc)
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.spans: dict[str, list[float]] = {}
+
+    def add(self, name: str, duration: float) -> None:
+        """Add one span occurrence to its name total."""
+        totals = self.spans.setdefault(name, [0, 0.0])
+        totals[0] += 1
+        totals[1] += duration
+
+    def as_dict(self) -> dict[str, object]:
+        """Return JSON-serializable representation."""
+        return {
+            'update_id': self.update_id,
+            'event_type': self.event_type,
+            'started_at': self.started_at.isoformat(),
+            'duration_ms': round(self.duration * 1000, 3),
+            'spans': {name: {'count': int(count), 'ms': round(total * 1000, 3)}
+                      for name, (count, total) in self.spans.items()},
+        }
+
+
+_current_trace: ContextVar[Trace | None] = ContextVar('trace', default=None)
+
+
+class TraceStore:
+    """Keep N slowest traces in memory and export sampled or slow ones to a JSONL file in batches."""
+
+    _instance: Optional['TraceStore'] = None
+
+    def __init__(self, size: int = cnst.TRACE_SLOWEST_SIZE, sample_rate: float = cnst.TRACE_SAMPLE_RATE,
+                 slow_threshold: float = cnst.TRACE_SLOW_THRESHOLD, path: str = cnst.TRACE_EXPORT_PATH) -> None:
+        """Store initialization."""
+        self.size = size
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.path = Path(path)
+        self._slowest: list[tuple[float, int, Trace]] = []
+        self._counter = itertools.count()
+        self._pending: deque[str] = deque(maxlen=cnst.TRACE_BUFFER_SIZE)
+
+    @classmethod
+    def get(cls) -> 'TraceStore':
+        """Get singleton store instance."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def submit(self, trace: Trace) -> None:
+        """Offer finished trace to the slowest-N heap and the export sink."""
+        entry = (trace.duration, next(self._counter), trace)
+        if len(self._slowest) < self.size:
+            heapq.heappush(self._slowest, entry)
+        elif trace.duration > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+        if trace.sampled or trace.duration >= self.slow_threshold:
+            self._pending.append(json.dumps(trace.as_dict()))
+
+    def slowest(self) -> list[Trace]:
+        """Return kept traces, slowest first."""
+        return [trace for _, _, trace in sorted(self._slowest, reverse=True)]
+
+    async def flush(self) -> None:
+        """Append buffered traces to the export file in a worker thread, the oldest are dropped if it falls behind."""
+        lines = list(self._pending)
+        self._pending.clear()
+        if lines:
+            await asyncio.to_thread(self._write, lines)
+
+    def _write(self, lines: list[str]) -> None:
+        try:
+            with self.path.open('a', encoding='utf-8') as sink:
+                sink.writelines(f'{line}\n' for line in lines)
+        except OSError:
+            logger.exception('Error while exporting traces')
+
+
+trace_store = TraceStore.get()
+
+
+@contextmanager
+def trace_update(update_id: int | None, event_type: str) -> Iterator[Trace]:
+    """Trace the block as one update and submit it to the store on exit."""
+    trace = Trace(update_id, event_type, sampled=random.random() < trace_store.sample_rate)  # noqa: S311
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        trace.duration = time.perf_counter() - trace.start
+        trace_store.submit(trace)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the block as a span of the current trace, no-op outside of updates."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, time.perf_counter() - start_time)
+
+
+def record_span(name: str, duration: float) -> None:
+    """Add already measured span to the current trace."""
+    if trace := _current_trace.get():
+        trace.add(name, duration)
@@ -32,12 +32,19 @@ class ProxyConfig(TypedDict):
     port: str | None
 
 
+class MetricsConfig(TypedDict):
+    """Prometheus exporter configuration."""
+
+    port: int
+
+
 class AppConfig(TypedDict):
     """Application configuration."""
 
     bot: BotConfig
     database: DBConfig
     proxy: ProxyConfig
+    metrics: MetricsConfig
 
 
 def init_config() -> AppConfig:
@@ -68,6 +75,9 @@ def init_config() -> AppConfig:
         proxy_port = os.getenv('PROXY_PORT') or config.get('file_bot', 'PROXY_PORT', fallback='') or ''
         logger.debug('Successfully read proxy variables')
 
+        metrics_port = os.getenv('METRICS_PORT') or config.get('file_bot', 'METRICS_PORT', fallback='') or '8000'
+        logger.debug('Successfully read metrics variables')
+
         return {
             'bot': {'token': token},
             'database': {
@@ -82,6 +92,7 @@ def init_config() -> AppConfig:
                 'host': proxy_host,
                 'port': proxy_port,
             },
+            'metrics': {'port': int(metrics_port)},
         }
     except Exception:
         logger.exception('Error while extracting config in init_config')
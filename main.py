@@ -11,12 +11,33 @@ from app.handlers import (
     callback_router,
     const_router,
     file_router,
+    inline_router,
     public_commands_router,
     temp_router,
 )
-from app.helpers import setup_initial_admins
-from app.middlewares import init_scheduler_injector, metrics_collector, user_data
-from app.scheduler import check_outdated
+from app.helpers import backfill_file_unique_ids, setup_initial_admins
+from app.metrics import monitor_event_loop, start_metrics_exporter, start_runtime_collectors
+from app.middlewares import (
+    callback_dedup,
+    early_callback_answer,
+    handler_metrics,
+    init_bot_session,
+    init_scheduler_injector,
+    metrics_collector,
+    routing,
+    throttling,
+    user_data,
+)
+from app.routing import dispatch_index
+from app.scheduler import (
+    check_outdated,
+    collect_garbage,
+    flush_activity,
+    flush_traces,
+    purge_expired_invites,
+    report_heap_growth,
+)
+from app.services.notifier import notifier
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from config import config
 from pytz import utc
@@ -35,18 +56,37 @@ logger = logging.getLogger(__name__)
 async def main() -> None:
     """Bot launcher."""
     await setup_initial_admins()
-    bot = Bot(token=config['bot']['token'])
+    bot = Bot(token=config['bot']['token'], session=init_bot_session())
     dp = Dispatcher()
     scheduler = AsyncIOScheduler(timezone=utc, job_defaults={'misfire_grace_time': cnst.MISFIRE_GRACE_TIME})
     dp.update.middleware(metrics_collector)
+    dp.update.middleware(throttling)
+    dp.update.middleware(callback_dedup)
     dp.update.middleware(user_data)
     dp.update.middleware(init_scheduler_injector(scheduler))
+    dp.message.outer_middleware(routing)
+    dp.callback_query.outer_middleware(routing)
+    dp.message.middleware(handler_metrics)
+    dp.callback_query.middleware(handler_metrics)
+    dp.inline_query.middleware(handler_metrics)
+    dp.callback_query.middleware(early_callback_answer)
     logger.info('Starting bot...')
     dp.include_routers(public_commands_router, temp_router, file_router, const_router,
-                    admin_router, callback_router)
+                    admin_router, callback_router, inline_router)
+    dispatch_index.build(dp)
     scheduler.add_job(check_outdated, trigger='cron', hour=cnst.DELETE_HOUR, minute=cnst.DELETE_MINUTE,
                     start_date=datetime.now(pytz.timezone('Europe/Moscow')))
+    scheduler.add_job(collect_garbage, trigger='interval', minutes=cnst.GC_INTERVAL_MINUTES, args=[bot])
+    scheduler.add_job(purge_expired_invites, trigger='interval', minutes=cnst.GC_INTERVAL_MINUTES)
+    scheduler.add_job(report_heap_growth, trigger='interval', minutes=cnst.HEAP_REPORT_INTERVAL_MINUTES)
+    scheduler.add_job(flush_activity, trigger='interval', seconds=cnst.ACTIVITY_FLUSH_SECONDS)
+    scheduler.add_job(flush_traces, trigger='interval', seconds=cnst.TRACE_FLUSH_SECONDS)
+    scheduler.add_job(backfill_file_unique_ids, args=[bot])
     scheduler.start()
+    start_runtime_collectors()
+    start_metrics_exporter(config['metrics']['port'])
+    monitor_task = asyncio.create_task(monitor_event_loop(cnst.RUNTIME_METRICS_INTERVAL))
+    notify_task = notifier.start(bot)
     try:
         await dp.start_polling(bot, timeout=cnst.POLLING_TIMEOUT, relax=cnst.POLLING_RELAX)
     except TelegramAPIError:
@@ -57,6 +97,11 @@ async def main() -> None:
         logger.exception('Timeout while waiting for a response from Telegram API')
     except Exception:
         logger.exception('Unexpected error')
+    finally:
+        monitor_task.cancel()
+        notify_task.cancel()
+        await flush_activity()
+        await flush_traces()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,49 @@
+import os
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+
+# config.py reads the connection settings on import, resources.ini and the real environment take precedence
+if not (Path(__file__).parents[1] / 'resources.ini').exists():
+    for key, value in (
+        ('TG_TOKEN', '0:test'),
+        ('POSTGRES_HOST', 'localhost'),
+        ('POSTGRES_PORT', '5432'),
+        ('POSTGRES_DB', 'bot_db'),
+        ('POSTGRES_USER', 'bot_user'),
+        ('POSTGRES_PASSWORD', 'bot_password'),
+    ):
+        os.environ.setdefault(key, value)
+
+
+@pytest_asyncio.fixture
+async def database():
+    """Skip unless TEST_DATABASE is set, the tests then run against the configured and migrated database."""
+    if not os.getenv('TEST_DATABASE'):
+        pytest.skip('set TEST_DATABASE=1 to run tests against the configured PostgreSQL database')
+    from app.database.session import session_factory
+    yield
+    # pooled asyncpg connections are bound to the event loop of the test which opened them
+    await session_factory.engine.dispose()
+
+
+@pytest.fixture(scope='session')
+def dispatcher():
+    """Dispatcher with the bot routers included in the order main.py uses, routers can join only one parent."""
+    from aiogram import Dispatcher
+    from app.handlers import (
+        admin_router,
+        callback_router,
+        const_router,
+        file_router,
+        inline_router,
+        public_commands_router,
+        temp_router,
+    )
+
+    dp = Dispatcher()
+    dp.include_routers(public_commands_router, temp_router, file_router, const_router,
+                       admin_router, callback_router, inline_router)
+    return dp
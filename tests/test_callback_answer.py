@@ -0,0 +1,21 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from aiogram.types import CallbackQuery, User
+from app.middlewares.callback_answer import EarlyCallbackAnswer
+
+
+def _callback():
+    return CallbackQuery(id='1', from_user=User(id=1, is_bot=False, first_name='user'), chat_instance='1', data='x')
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize(('flags', 'answered'), [({}, 1), ({'late_answer': True}, 0)])
+async def test_callback_is_answered_unless_handler_answers_late(monkeypatch, flags, answered):
+    answer = AsyncMock()
+    monkeypatch.setattr(CallbackQuery, 'answer', answer)
+    handler = AsyncMock(return_value='handled')
+    data = {'handler': SimpleNamespace(flags=flags)}
+    assert await EarlyCallbackAnswer()(handler, _callback(), data) == 'handled'
+    assert answer.await_count == answered
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from app.database.instrumentation import assert_max_queries, fingerprint, instrument_engine
+from app.database.models.enums import UserRole
+from app.handlers.admin_router import admin_list
+from sqlalchemy import create_engine, text
+
+
+IN_LIST = 'DELETE FROM temporary_messages WHERE temporary_messages.id IN ({rows}) RETURNING temporary_messages.id'
+VALUES_ROWS = (
+    'UPDATE users SET last_seen_at=seen.last_seen_at FROM (VALUES {rows}) AS seen (user_id, last_seen_at) '
+    'WHERE users.user_id = seen.user_id'
+)
+
+
+def _in_list(size: int) -> str:
+    return IN_LIST.replace('{rows}', ', '.join(f'${index}::INTEGER' for index in range(1, size + 1)))
+
+
+def _values(size: int) -> str:
+    rows = ', '.join(f'(${2 * row + 1}::BIGINT, ${2 * row + 2}::TIMESTAMP WITH TIME ZONE)' for row in range(size))
+    return VALUES_ROWS.replace('{rows}', rows)
+
+
+@pytest.mark.parametrize('build', [_in_list, _values])
+def test_fingerprint_ignores_list_length(build):
+    assert fingerprint(build(1)) == fingerprint(build(10))
+
+
+def test_fingerprint_labels_verb_and_table():
+    label = fingerprint('SELECT files.id FROM files WHERE files.category = $1::VARCHAR LIMIT $2::INTEGER')
+    assert label.startswith('SELECT files ')
+
+
+def test_fingerprint_keeps_different_shapes_apart():
+    assert fingerprint(_in_list(3)) != fingerprint(_values(3))
+
+
+def _select(engine, times, *, limit):
+    with engine.connect() as conn, assert_max_queries(limit) as stats:
+        for _ in range(times):
+            conn.execute(text('SELECT 1'))
+    return stats.count
+
+
+def test_assert_max_queries_fails_above_the_limit():
+    engine = create_engine('sqlite://')
+    instrument_engine(engine)
+    assert _select(engine, 2, limit=2) == 2
+    with pytest.raises(AssertionError, match='at most 2 queries, got 3'):
+        _select(engine, 3, limit=2)
+
+
+@pytest.mark.asyncio()
+@pytest.mark.usefixtures('database')
+async def test_admin_list_query_count():
+    message = SimpleNamespace(answer=AsyncMock())
+    # unwrapped so that a failing query is not swallowed by handle_errors
+    with assert_max_queries(3):
+        await admin_list.__wrapped__(message, SimpleNamespace(role=UserRole.OWNER))
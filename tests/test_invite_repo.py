@@ -0,0 +1,48 @@
+import asyncio
+import secrets
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from app.database.models import AdminInvite, User
+from app.database.models.enums import UserRole
+from app.database.uow import UnitOfWork
+from sqlalchemy import delete
+
+
+RACERS = 100
+FIRST_USER_ID = 9_100_000_000
+
+
+async def _redeem(code: str, user_id: int) -> UserRole | None:
+    async with UnitOfWork(auto_commit=True) as uow:
+        return await uow.invites.redeem(code, user_id, user_name='racer', user={'first_name': 'racer'})
+
+
+@pytest.mark.asyncio()
+@pytest.mark.usefixtures('database')
+async def test_invite_is_redeemed_once_by_concurrent_users():
+    code = f'AD_{secrets.token_hex(8)}'
+    user_ids = list(range(FIRST_USER_ID, FIRST_USER_ID + RACERS))
+    async with UnitOfWork(auto_commit=True) as uow:
+        await uow.invites.add(AdminInvite(
+            code=code,
+            was_used=False,
+            role=UserRole.ADMIN,
+            made_by_id=0,
+            made_by_name='test',
+            expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+        ))
+    try:
+        roles = await asyncio.gather(*(_redeem(code, user_id) for user_id in user_ids))
+        async with UnitOfWork(auto_commit=False) as uow:
+            invite = await uow.invites.get_by_filter(filters={'code': code})
+            admins = await uow.users.find(filters={'role': UserRole.ADMIN})
+    finally:
+        async with UnitOfWork(auto_commit=True) as uow:
+            await uow.session.execute(delete(AdminInvite).where(AdminInvite.code == code))
+            await uow.session.execute(delete(User).where(User.user_id.in_(user_ids)))
+
+    winners = [user_id for user_id, role in zip(user_ids, roles) if role is not None]
+    assert winners == [invite.used_by_id]
+    assert roles.count(UserRole.ADMIN) == 1
+    assert [admin.user_id for admin in admins if admin.user_id in user_ids] == winners
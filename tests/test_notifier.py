@@ -0,0 +1,19 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from app.services.notifier import Notifier
+
+
+@pytest.mark.asyncio()
+async def test_send_loop_survives_unexpected_errors():
+    notifier = Notifier()
+    bot = AsyncMock()
+    bot.send_message.side_effect = [RuntimeError('boom'), None]
+    queue = notifier._queue  # noqa: SLF001
+    worker = notifier.start(bot)
+    await queue.put((1, 'first'))
+    await queue.put((2, 'second'))
+    await asyncio.wait_for(queue.join(), timeout=1)
+    worker.cancel()
+    assert [call.args for call in bot.send_message.await_args_list] == [(1, 'first'), (2, 'second')]
@@ -0,0 +1,58 @@
+import time
+
+import pytest
+from app.cache.code_entry_cache import CodeEntryCache
+from app.cache.rate_limiter import RateLimiter
+
+
+USERS = 100_000
+MAX_MICROSECONDS_PER_CALL = 50
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(time, 'monotonic', fake)
+    return fake
+
+
+def test_bucket_allows_burst_then_refills(clock):
+    limiter = RateLimiter(rate=2.0, capacity=3, maxsize=10)
+    assert [limiter.consume(1) for _ in range(4)] == [True, True, True, False]
+    clock.now += 0.5
+    assert limiter.consume(1)
+    assert not limiter.consume(1)
+    assert limiter.remaining(2) == 3
+
+
+def test_code_entry_attempts_come_back_within_block_time(clock, monkeypatch):
+    monkeypatch.setattr('app.constants.MAX_ATTEMPTS', 5)
+    monkeypatch.setattr('app.constants.BLOCK_TIME', 3600)
+    attempts = CodeEntryCache()
+    for _ in range(5):
+        attempts.record_attempt(1)
+    assert attempts.is_blocked(1)
+    clock.now += 3600 / 5
+    assert attempts.attempts_left(1) == 1
+    attempts.reset_attempts(1)
+    assert attempts.attempts_left(1) == 5
+
+
+def test_rate_limiter_sustains_100k_users():
+    limiter = RateLimiter(maxsize=USERS)
+    started = time.perf_counter()
+    for _ in range(2):
+        for user_id in range(USERS):
+            limiter.consume(user_id)
+    per_call = (time.perf_counter() - started) / (2 * USERS) * 1e6
+    print(f'RateLimiter: {per_call:.2f} us per consume over {USERS} users')
+    assert len(limiter) == USERS
+    assert per_call < MAX_MICROSECONDS_PER_CALL
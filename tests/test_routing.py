@@ -0,0 +1,110 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+from aiogram.types import Chat, Message, User
+from app.cache.user_cache import UserData
+from app.callback_data import CallbackAction, CallbackData
+from app.database.models.enums import UserRole
+from app.database.models.user_states import UserState
+from app.filters import CallbackRoute, MessageRoute
+from app.routing import DispatchIndex
+
+
+REPEATS = 2_000
+USER = UserData(1, 'user', None, None, UserState.DEFAULT, UserRole.OWNER)
+
+
+def _message(text):
+    return Message(message_id=1, date=datetime.now(timezone.utc), chat=Chat(id=1, type='private'),
+                   from_user=User(id=1, is_bot=False, first_name='user'), text=text)
+
+
+def _routes(dispatcher):
+    """Routes in the order aiogram evaluates handler filters."""
+    for router in dispatcher.chain_tail:
+        for observer in (router.message, router.callback_query):
+            for handler in observer.handlers:
+                for filter_object in handler.filters or ():
+                    if isinstance(filter_object.callback, (MessageRoute, CallbackRoute)):
+                        yield filter_object.callback
+
+
+def _linear_message(routes, message, user_data):
+    """Evaluate every message route one by one like per-handler filters would."""
+    text = message.text or ''
+    command = text[1:].split(maxsplit=1)[0] if text.startswith('/') else None
+    state = user_data.state.partition(':')[0]
+    for route in routes:
+        if not isinstance(route, MessageRoute):
+            continue
+        matches = (
+            command in route.commands
+            or text.lower() in route.texts
+            or (route.text_prefix is not None and text.startswith(route.text_prefix))
+            or route.state == state
+        )
+        if matches and route.accepts(message, user_data):
+            return route
+    return None
+
+
+def _linear_callback(routes, callback_data, user_data):
+    for route in routes:
+        if isinstance(route, CallbackRoute) and route.action == callback_data.action and route.allows(user_data):
+            return route
+    return None
+
+
+@pytest.fixture(scope='module')
+def routes(dispatcher):
+    return list(_routes(dispatcher))
+
+
+@pytest.fixture(scope='module')
+def index(dispatcher):
+    dispatch_index = DispatchIndex()
+    dispatch_index.build(dispatcher)
+    return dispatch_index
+
+
+@pytest.fixture(scope='module')
+def messages(index):
+    texts = [f'/{command}' for command in index.commands] + list(index.texts) + ['AD_code', 'hello']
+    users = [USER, USER._replace(state=UserState.CONST_SEND_NAME)]
+    return [(_message(text), user) for text in texts for user in users]
+
+
+@pytest.fixture(scope='module')
+def callbacks():
+    return [CallbackData(action, 1, 'c') for action in CallbackAction]
+
+
+def _per_update(resolve, updates):
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        for update, user_data in updates:
+            resolve(update, user_data)
+    return (time.perf_counter() - started) / (REPEATS * len(updates)) * 1e6
+
+
+def test_index_resolves_like_linear_matching(routes, index, messages, callbacks):
+    for message, user_data in messages:
+        assert index.resolve_message(message, user_data, bot_username=None)[0] is _linear_message(
+            routes, message, user_data)
+    for callback_data in callbacks:
+        assert index.resolve_callback(callback_data, USER) is _linear_callback(routes, callback_data, USER)
+
+
+def test_dispatch_overhead_benchmark(routes, index, messages, callbacks):
+    callback_updates = [(callback_data, USER) for callback_data in callbacks]
+    linear_message = _per_update(lambda message, user: _linear_message(routes, message, user), messages)
+    indexed_message = _per_update(
+        lambda message, user: index.resolve_message(message, user, bot_username=None), messages)
+    linear_callback = _per_update(lambda data, user: _linear_callback(routes, data, user), callback_updates)
+    indexed_callback = _per_update(index.resolve_callback, callback_updates)
+    print(f'\nmessages: linear {linear_message:.2f} us, index {indexed_message:.2f} us per update'
+          f'\ncallbacks: linear {linear_callback:.2f} us, index {indexed_callback:.2f} us per update'
+          f' over {len(routes)} routes')
+    assert indexed_message < linear_message
+    assert indexed_callback < linear_callback
@@ -0,0 +1,77 @@
+import gc
+import os
+import tracemalloc
+
+import pytest
+from app.cache.activity_tracker import ActivityTracker
+from app.cache.code_entry_cache import CodeEntryCache
+from app.cache.rate_limiter import RateLimiter
+from app.cache.user_cache import UserCache, UserData
+from app.callback_data import CallbackAction, pack, unpack
+from app.database.instrumentation import fingerprint
+from app.database.models.enums import UserRole
+from app.database.models.user_states import UserState
+from app.routing import DispatchIndex
+
+
+# SOAK_ROUNDS=1000 turns this into a long run, the default keeps the suite fast
+ROUNDS = int(os.getenv('SOAK_ROUNDS', '10'))
+WARMUP_ROUNDS = 3
+ROUND_USERS = 2_000
+CACHE_SIZE = 1_000
+MAX_GROWTH = 64 * 1024
+IN_QUERY = 'SELECT users.role FROM users WHERE users.user_id IN ({binds})'
+ACTIONS = (CallbackAction.FILE, CallbackAction.TEMP, CallbackAction.CONST, CallbackAction.PAGE_FILES)
+
+
+class Workload:
+    """Synthetic traffic of distinct users through bounded caches, routing and statement fingerprints."""
+
+    def __init__(self, index):
+        self.index = index
+        self.limiter = RateLimiter(maxsize=CACHE_SIZE)
+        self.attempts = CodeEntryCache()
+        self.users = UserCache()
+        self.activity = ActivityTracker()
+        self.next_user_id = 1
+
+    def run_round(self):
+        for user_id in range(self.next_user_id, self.next_user_id + ROUND_USERS):
+            user = UserData(user_id, 'soak', None, None, UserState.DEFAULT, UserRole.DEFAULT)
+            self.limiter.consume(user_id)
+            self.attempts.record_attempt(user_id)
+            self.users.set_user(user)
+            self.users.get_user(user_id)
+            self.activity.seen(user_id)
+            action = ACTIONS[user_id % len(ACTIONS)]
+            self.index.resolve_callback(unpack(pack(action, entity_id=user_id, value='c')), user)
+            fingerprint(IN_QUERY.replace('{binds}', ', '.join(['$1'] * (user_id % 50 + 1))))
+        self.activity.drain()
+        self.next_user_id += ROUND_USERS
+
+
+@pytest.fixture()
+def workload(dispatcher, monkeypatch):
+    monkeypatch.setattr('app.constants.THROTTLE_CACHE_SIZE', CACHE_SIZE)
+    monkeypatch.setattr('app.constants.MAX_CACHE_SIZE', CACHE_SIZE)
+    index = DispatchIndex()
+    index.build(dispatcher)
+    return Workload(index)
+
+
+def test_memory_stays_bounded_under_synthetic_traffic(workload):
+    tracemalloc.start()
+    try:
+        for _ in range(WARMUP_ROUNDS):
+            workload.run_round()
+        gc.collect()
+        baseline = tracemalloc.take_snapshot()
+        for _ in range(ROUNDS):
+            workload.run_round()
+        gc.collect()
+        growth = tracemalloc.take_snapshot().compare_to(baseline, 'lineno')
+    finally:
+        tracemalloc.stop()
+    total = sum(stat.size_diff for stat in growth)
+    top = '\n'.join(str(stat) for stat in growth[:10])
+    assert total < MAX_GROWTH, f'Heap grew by {total / 1024:.1f} KiB over {ROUNDS} rounds:\n{top}'